@@ -1,2 +1,13 @@
+from .cache import *
+from .columnar import *
+from .diskcache import *
 from .errors import *
 from .http import *
+from .instrumentation import *
+from .pool import *
+from .ratelimit import *
+from .retry import *
+from .streaming import *
+from .sync import *
+from .transport import *
+from .updates import *
@@ -0,0 +1,138 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+
+__all__ = [
+    'BulkResult',
+    'fetch_many',
+    'fetch_windows',
+]
+
+
+class BulkResult(NamedTuple):
+    """The outcome of fetching one ID of a batch
+
+    Exactly one of ``value`` and ``error`` is set.
+    """
+    id: int
+    value: Any
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def fetch_windows(fetch: Callable[[int, int], Awaitable[Dict[str, Any]]], total: int, page_size: int, offset: int = 0, concurrency: int = 4) -> List[Dict[str, Any]]:
+    """Fetches ``total`` items of an offset paged endpoint with concurrent requests
+
+    The range is split into ``page_size`` windows which are requested at most
+    ``concurrency`` at a time. Items are merged back in offset order and, since a
+    ranking can shift while it is being crawled, an item that shows up in more than
+    one window is only kept at its first position.
+
+    Parameters
+    -----------
+    fetch: Callable[[:class:`int`, :class:`int`], Awaitable[Dict[:class:`str`, Any]]]
+        Fetches the page with the given limit and offset
+
+    total: :class:`int`
+        The amount of items to fetch
+
+    page_size: :class:`int`
+        The amount of items requested per window
+
+    offset: :class:`int`
+        The offset from 1 for where the fetch will start
+
+    concurrency: :class:`int`
+        The max amount of windows requested at the same time. Defaults to 4.
+
+    Returns
+    --------
+    List[Dict[:class:`str`, Any]]
+        The raw items of every window, in offset order
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+
+    semaphore = asyncio.Semaphore(concurrency)
+    end = offset + total
+
+    async def fetch_window(window_offset: int) -> List[Dict[str, Any]]:
+        async with semaphore:
+            page = await fetch(min(page_size, end - window_offset), window_offset)
+            return page.get('data', [])
+
+    tasks = [asyncio.ensure_future(fetch_window(o)) for o in range(offset, end, page_size)]
+    try:
+        windows = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+
+        raise
+
+    seen = set()
+    items = []
+    for window in windows:
+        for item in window:
+            item_id = item.get('node', item).get('id')
+            if item_id in seen:
+                continue
+
+            seen.add(item_id)
+            items.append(item)
+
+    return items
+
+
+async def fetch_many(fetch: Callable[[int], Awaitable[Any]], ids: Iterable[int], concurrency: int = 8, ordered: bool = True) -> AsyncIterator[BulkResult]:
+    """Fetches every ID with concurrent requests, yielding a result per ID
+
+    At most ``concurrency`` requests are in flight at a time. An exception raised for
+    one ID is returned in its result instead of failing the whole batch. Requests
+    still pending when the iteration is stopped early are cancelled.
+
+    Parameters
+    -----------
+    fetch: Callable[[:class:`int`], Awaitable[Any]]
+        Fetches the object with the given ID
+
+    ids: Iterable[:class:`int`]
+        The IDs to fetch
+
+    concurrency: :class:`int`
+        The max amount of requests in flight at the same time. Defaults to 8.
+
+    ordered: :class:`bool`
+        Whether results are yielded in the order of ``ids`` or as they complete. Defaults to True.
+
+    Yields
+    -------
+    :class:`BulkResult`
+        The value or the error of each ID
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(item_id: int) -> BulkResult:
+        async with semaphore:
+            try:
+                return BulkResult(item_id, await fetch(item_id), None)
+            except Exception as exc:
+                return BulkResult(item_id, None, exc)
+
+    tasks = [asyncio.ensure_future(fetch_one(i)) for i in ids]
+    try:
+        if ordered:
+            for task in tasks:
+                yield await task
+        else:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,193 @@
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Hashable, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from .http import Route
+
+
+__all__ = [
+    'CacheStats',
+    'ResponseCache',
+]
+
+
+class _CacheEntry:
+    __slots__ = ['data', 'path', 'scope', 'size', 'expires_at']
+
+    def __init__(self, data: Any, path: str, scope: str, size: int, expires_at: float) -> None:
+        self.data = data
+        self.path = path
+        self.scope = scope
+        self.size = size
+        self.expires_at = expires_at
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class ResponseCache:
+    """An in-memory cache of decoded GET responses
+
+    Entries are keyed on the route's method, path, sorted query parameters and the
+    token it was requested with, so users never see each other's ``my_list_status``.
+    The cache is bounded both by entry count and by the approximate size of the raw
+    responses, evicting the least recently used entries first. When a user's token is
+    refreshed its entries are moved to the new token, see :meth:`rescope`.
+
+    Payloads are shared between every caller that hits the same entry and must not
+    be mutated.
+
+    Parameters
+    -----------
+    ttl: :class:`float`
+        How long, in seconds, a response stays fresh. Defaults to 300.
+
+    route_ttls: Optional[Dict[:class:`str`, :class:`float`]]
+        TTLs overriding ``ttl`` per route template, e.g. ``{'/anime/{anime_id}': 3600}``.
+        A TTL of 0 disables caching for that route.
+
+    max_entries: :class:`int`
+        The max amount of responses kept. Defaults to 1024.
+
+    max_bytes: :class:`int`
+        The max total size of the kept responses, measured on the raw response bodies.
+        Defaults to 64 MiB.
+    """
+    def __init__(self, ttl: float = 300.0, route_ttls: Optional[Dict[str, float]] = None, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.ttl = ttl
+        self.route_ttls = route_ttls or {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries: 'OrderedDict[Hashable, _CacheEntry]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), self._bytes)
+
+    def ttl_for(self, route: 'Route') -> float:
+        return self.route_ttls.get(route.template, self.ttl)
+
+    def get(self, route: 'Route') -> Optional[Any]:
+        """Returns the cached payload of the route, or None if there is no fresh one"""
+        key = route.key
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.data
+
+    def set(self, route: 'Route', data: Any, size: int) -> None:
+        """Stores the payload of the route
+
+        Parameters
+        -----------
+        route: :class:`Route`
+            The route the payload was requested with
+
+        data: Any
+            The decoded payload
+
+        size: :class:`int`
+            The size of the raw response body in bytes
+        """
+        ttl = self.ttl_for(route)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        key = route.key
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = _CacheEntry(data, route.path, route.scope, size, time.monotonic() + ttl)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, route: 'Route') -> int:
+        """Drops the entries a write through the given route makes stale
+
+        A write to ``/anime/{anime_id}/my_list_status`` changes the ``my_list_status``
+        of every anime response and the anime lists fetched with the same token, so all
+        of those are dropped. The same goes for manga.
+
+        Returns
+        --------
+        :class:`int`
+            The amount of dropped entries
+        """
+        media = route.path.strip('/').split('/', 1)[0]
+        scope = route.scope
+        media_list = f'/{media}list'
+
+        stale = [
+            key for key, entry in self._entries.items()
+            if entry.scope == scope and (
+                entry.path == f'/{media}'
+                or entry.path.startswith(f'/{media}/')
+                or (entry.path.startswith('/users/') and entry.path.endswith(media_list))
+            )
+        ]
+
+        for key in stale:
+            self._remove(key)
+
+        return len(stale)
+
+    def rescope(self, old: str, new: str) -> int:
+        """Moves the entries of a token scope to another, keeping their order and expiry
+
+        Entries the new scope already has are kept over the moved ones.
+
+        Returns
+        --------
+        :class:`int`
+            The amount of moved entries
+        """
+        moved = 0
+        entries: 'OrderedDict[Hashable, _CacheEntry]' = OrderedDict()
+        for key, entry in self._entries.items():
+            if entry.scope == old:
+                # The scope is the last part of a route's key
+                key = (*key[:-1], new)
+                if key in self._entries:
+                    self._bytes -= entry.size
+                    continue
+
+                entry.scope = new
+                moved += 1
+
+            entries[key] = entry
+
+        self._entries = entries
+        return moved
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
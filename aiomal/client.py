@@ -1,22 +1,147 @@
-from typing import List, Optional, Tuple
-
-from .errors import NotFound
-from .http import HTTPClient
+import asyncio
+import inspect
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Tuple, Union
+
+from .bulk import BulkResult, fetch_many, fetch_windows
+from .cache import ResponseCache
+from .errors import NotFound, Unauthorized
+from .fields import FieldsType
+from .http import HTTPClient, PoolStats
+from .pagination import Paginator
+from .ratelimit import RateLimiter
+from .streaming import PageStream
+from .updates import UpdateQueue
 from .objects.maintypes import *
 from .objects.subtypes import MyListStatus
 
 
+TokenCallback = Callable[['ClientUser'], Union[Awaitable[None], None]]
+
+
 class ClientUser:
     """A class used to interact with the MAL API with a user's access token
+
+    The tokens are refreshed when a request fails with :class:`Unauthorized` or shortly
+    before ``expires_at``, after which the request is retried. Concurrent requests
+    share a single refresh.
     
     Do not make this directly, use the :class:`Client` method :method:`make_user`
     """
-    def __init__(self, access_token: str, refresh_token: str, http: HTTPClient) -> None:
+    #: How long, in seconds, before ``expires_at`` the tokens are refreshed
+    REFRESH_MARGIN = 60.0
+
+    def __init__(self, access_token: str, refresh_token: str, http: HTTPClient, lazy: bool = False, update_queue: Optional[UpdateQueue] = None, expires_at: Optional[float] = None, on_token_refresh: Optional[TokenCallback] = None) -> None:
         self._access_token = access_token
         self._refresh_token = refresh_token
         self._http = http
+        self._lazy = lazy
+        self._update_queue = update_queue
+        self.expires_at = expires_at
+        self._on_token_refresh = on_token_refresh
+        self._refreshing: Optional['asyncio.Future[None]'] = None
+
+    @property
+    def access_token(self) -> str:
+        return self._access_token
+
+    @property
+    def refresh_token(self) -> str:
+        return self._refresh_token
 
-    async def get_anime(self, query: str, limit: int = 100, offset: int = 0) -> List[AnimeForList]:
+    async def refresh_tokens(self) -> None:
+        """Trades the refresh token for a new token pair
+
+        The ``on_token_refresh`` callback of the :class:`Client` is called with this user
+        once the new tokens are set, to persist them.
+        """
+        await self._refresh(None)
+
+    async def _refresh(self, stale_token: Optional[str]) -> None:
+        if stale_token is not None and stale_token != self._access_token:
+            # Another request already refreshed it
+            return
+
+        # Concurrent requests wait on the same refresh, which is applied once
+        if self._refreshing is None:
+            self._refreshing = asyncio.ensure_future(self._apply_refresh())
+            self._refreshing.add_done_callback(self._refresh_done)
+
+        await asyncio.shield(self._refreshing)
+
+    def _refresh_done(self, task: 'asyncio.Future[None]') -> None:
+        self._refreshing = None
+        # Every waiter may have been cancelled, in which case nobody retrieves the exception
+        if not task.cancelled():
+            task.exception()
+
+    async def _apply_refresh(self) -> None:
+        refresh_token = self._refresh_token
+        data = await self._http.refresh_access_token(refresh_token)
+        old_token = self._access_token
+        self._access_token = data['access_token']
+        self._refresh_token = data.get('refresh_token', refresh_token)
+        expires_in = data.get('expires_in')
+        self.expires_at = time.time() + expires_in if expires_in is not None else None
+        # The cached responses of the old token stay reachable and invalidated by writes
+        await self._http.rescope(old_token, self._access_token)
+        if self._on_token_refresh is not None:
+            result = self._on_token_refresh(self)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _fresh_token(self) -> str:
+        # The current access token, refreshed first when it is about to expire
+        if self.expires_at is not None and time.time() >= self.expires_at - self.REFRESH_MARGIN:
+            await self._refresh(self._access_token)
+
+        return self._access_token
+
+    async def _call(self, method: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        # Sends a request with the current access token, refreshing it when needed
+        token = await self._fresh_token()
+        try:
+            return await method(token, *args, **kwargs)
+        except Unauthorized:
+            if not self._refresh_token:
+                raise
+
+            await self._refresh(token)
+            return await method(self._access_token, *args, **kwargs)
+
+    async def _stream(self, method: Callable[..., Awaitable[PageStream]], *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        # Yields the items of every streamed page. A page is only requested once it is
+        # iterated, so the tokens are checked as each page opens, not once for the list
+        open_page: Optional[Callable[[str], Awaitable[PageStream]]] = lambda token: method(token, *args, stream=True, **kwargs)
+        refreshed = False
+        while open_page is not None:
+            token = await self._fresh_token()
+            page = await open_page(token)
+            started = False
+            try:
+                async for item in page:
+                    started = True
+                    yield item
+            except Unauthorized:
+                # Raised while the page opens, before any of its items
+                if started or refreshed or not self._refresh_token:
+                    raise
+
+                await self._refresh(token)
+                refreshed = True
+                continue
+
+            next_url = page.paging.get('next')
+            open_page = (lambda token: self._http.get_page(token, next_url, stream=True)) if next_url else None
+            refreshed = False
+
+    def _queue_update(self, media_type: str, media_id: int, send: Any, fields: Any) -> 'asyncio.Future[MyListStatus]':
+        if self._update_queue is None:
+            raise RuntimeError('no update queue was passed to the Client')
+
+        return self._update_queue.submit((self, media_type, media_id), lambda merged: send(media_id, **merged), fields)
+
+    async def get_anime(self, query: str, limit: int = 100, offset: int = 0, fields: FieldsType = None) -> List[AnimeForList]:
         """Returns anime matching the query
 
         Parameters
@@ -30,16 +155,56 @@ class ClientUser:
         offset: :class:`int`
             The offset from 1 for where the list will start.
 
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
         Returns
         --------
         List[:class:`AnimeForList`]
             A list of anime that matched the given query
         """
-        data = await self._http.get_anime(self._access_token, query, limit, offset)
-        anime = [AnimeForList(a['node']) for a in data['data']]
+        data = await self._call(self._http.get_anime, query, limit, offset, fields=fields)
+        with self._http.building('AnimeForList', len(data['data'])):
+            anime = [AnimeForList(a['node'], self._lazy) for a in data['data']]
         return anime
 
-    async def get_anime_details(self, anime_id: int) -> AnimeDetails:
+    def iter_anime(self, query: str, limit: int = 100, offset: int = 0, fields: FieldsType = None, prefetch: bool = True) -> Paginator[AnimeForList]:
+        """Iterates over every anime matching the query
+
+        Pages are fetched by following ``paging.next`` while the current page is consumed
+
+        Parameters
+        -----------
+        query: :class:`str`
+            What to search in the MAL database
+
+        limit: :class:`int`
+            The amount of results per page. Cannot exceed 100. Defaults to 100.
+
+        offset: :class:`int`
+            The offset from 1 for where the iteration will start
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
+        prefetch: :class:`bool`
+            Whether to request the next page while the current one is consumed. Defaults to True.
+
+        Returns
+        --------
+        :class:`Paginator`[:class:`AnimeForList`]
+            An async iterator over every result
+        """
+        return Paginator(
+            lambda: self._call(self._http.get_anime, query, limit, offset, fields=fields),
+            lambda url: self._call(self._http.get_page, url),
+            lambda a: AnimeForList(a['node'], self._lazy),
+            prefetch
+        )
+
+    async def get_anime_details(self, anime_id: int, fields: FieldsType = None) -> AnimeDetails:
         """Returns the details of the anime with the given ID
         
         Parameters
@@ -47,16 +212,71 @@ class ClientUser:
         anime_id: :class:`id`
             The anime's ID in the MAL database
 
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to full.
+
         Returns
         --------
         :class:`AnimeDetails`
             An object containing the details of the anime
         """
-        data = await self._http.get_anime_details(self._access_token, anime_id)
-        anime = AnimeDetails(data)
+        data = await self._call(self._http.get_anime_details, anime_id, fields=fields)
+        with self._http.building('AnimeDetails'):
+            anime = AnimeDetails(data, self._lazy)
         return anime
 
-    async def get_anime_ranking(self, ranking_type: str = 'all', limit: int = 100, offset: int = 0) -> List[AnimeForList]:
+    async def get_anime_details_many(self, anime_ids: Iterable[int], fields: FieldsType = None, concurrency: int = 8) -> List[BulkResult]:
+        """Returns the details of many anime with concurrent requests
+
+        A failed ID, e.g. one raising :class:`NotFound`, does not fail the others. Its
+        error is returned in its result instead. Cached and in-flight requests are reused.
+
+        Parameters
+        -----------
+        anime_ids: Iterable[:class:`int`]
+            The anime's IDs in the MAL database
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to full.
+
+        concurrency: :class:`int`
+            The max amount of requests in flight at the same time. Defaults to 8.
+
+        Returns
+        --------
+        List[:class:`BulkResult`]
+            A result per ID in the given order, holding a :class:`AnimeDetails` or the error
+        """
+        return [r async for r in self.iter_anime_details_many(anime_ids, fields, concurrency, ordered=True)]
+
+    def iter_anime_details_many(self, anime_ids: Iterable[int], fields: FieldsType = None, concurrency: int = 8, ordered: bool = False) -> AsyncIterator[BulkResult]:
+        """Iterates over the details of many anime, fetched with concurrent requests
+
+        Parameters
+        -----------
+        anime_ids: Iterable[:class:`int`]
+            The anime's IDs in the MAL database
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to full.
+
+        concurrency: :class:`int`
+            The max amount of requests in flight at the same time. Defaults to 8.
+
+        ordered: :class:`bool`
+            Whether results are yielded in the given order or as they complete. Defaults to False.
+
+        Yields
+        -------
+        :class:`BulkResult`
+            A result per ID, holding a :class:`AnimeDetails` or the error
+        """
+        return fetch_many(lambda anime_id: self.get_anime_details(anime_id, fields), anime_ids, concurrency, ordered)
+
+    async def get_anime_ranking(self, ranking_type: str = 'all', limit: int = 100, offset: int = 0, fields: FieldsType = None) -> List[AnimeForList]:
         """Gets the ranking from [1 + offset, offset + limit]
         
         Parameters
@@ -71,16 +291,102 @@ class ClientUser:
         offset: :class:`int`
             The offset from 1 for where the list will start.
 
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
         Returns
         --------
         List[:class:`AnimeForList`]
             The ranking by the given ranking type
         """
-        data = await self._http.get_anime_ranking(self._access_token, ranking_type, limit, offset)
-        anime = [AnimeForList(a['node']) for a in data['data']]
+        data = await self._call(self._http.get_anime_ranking, ranking_type, limit, offset, fields=fields)
+        with self._http.building('AnimeForList', len(data['data'])):
+            anime = [AnimeForList(a['node'], self._lazy) for a in data['data']]
+        return anime
+
+    async def get_anime_ranking_bulk(self, total: int, ranking_type: str = 'all', offset: int = 0, page_size: int = 500, concurrency: int = 4, fields: FieldsType = None) -> List[AnimeForList]:
+        """Gets a large part of the ranking with concurrent requests
+
+        The range is split into windows of ``page_size`` which are requested concurrently.
+        Results are returned in rank order, without duplicates if the ranking shifted
+        during the fetch.
+
+        Parameters
+        -----------
+        total: :class:`int`
+            The amount of results to fetch
+
+        ranking_type: :class:`str`
+            The criteria ranking will be based on.
+            Options include: all, airing, upcoming, tv, ova, movie, special, bypopularity, favorite
+
+        offset: :class:`int`
+            The offset from 1 for where the fetch will start
+
+        page_size: :class:`int`
+            The amount of results requested per window. Cannot exceed 500. Defaults to 500.
+
+        concurrency: :class:`int`
+            The max amount of windows requested at the same time. Defaults to 4.
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
+        Returns
+        --------
+        List[:class:`AnimeForList`]
+            The anime from [1 + offset, offset + total]
+        """
+        data = await fetch_windows(
+            lambda limit, window_offset: self._call(self._http.get_anime_ranking, ranking_type, limit, window_offset, fields=fields),
+            total,
+            min(page_size, 500),
+            offset,
+            concurrency
+        )
+        with self._http.building('AnimeForList', len(data), ('GET', '/anime/ranking')):
+            anime = [AnimeForList(a['node'], self._lazy) for a in data]
         return anime
 
-    async def get_seasonal_anime(self, year: int, season: str, sort: str = 'anime_score', limit: int = 100, offset: int = 0) -> List[AnimeForList]:
+    def iter_anime_ranking(self, ranking_type: str = 'all', limit: int = 500, offset: int = 0, fields: FieldsType = None, prefetch: bool = True) -> Paginator[AnimeForList]:
+        """Iterates over the ranking starting from 1 + offset
+
+        Pages are fetched by following ``paging.next`` while the current page is consumed
+
+        Parameters
+        -----------
+        ranking_type: :class:`str`
+            The criteria ranking will be based on.
+            Options include: all, airing, upcoming, tv, ova, movie, special, bypopularity, favorite
+
+        limit: :class:`int`
+            The amount of results per page. Cannot exceed 500. Defaults to 500.
+
+        offset: :class:`int`
+            The offset from 1 for where the iteration will start
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
+        prefetch: :class:`bool`
+            Whether to request the next page while the current one is consumed. Defaults to True.
+
+        Returns
+        --------
+        :class:`Paginator`[:class:`AnimeForList`]
+            An async iterator over every result
+        """
+        return Paginator(
+            lambda: self._call(self._http.get_anime_ranking, ranking_type, limit, offset, fields=fields),
+            lambda url: self._call(self._http.get_page, url),
+            lambda a: AnimeForList(a['node'], self._lazy),
+            prefetch
+        )
+
+    async def get_seasonal_anime(self, year: int, season: str, sort: str = 'anime_score', limit: int = 100, offset: int = 0, fields: FieldsType = None) -> List[AnimeForList]:
         """Returns all the anime released in a season and year
         
         Parameters
@@ -102,16 +408,116 @@ class ClientUser:
         offset: :class:`int`
             The offset from 1 for where the list will start
 
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
         Returns
         --------
         List[:class:`AnimeForList`]
             A list of the anime in the given season and year
         """
-        data = await self._http.get_seasonal_anime(self._access_token, year, season, sort, limit, offset)
-        anime = [AnimeForList(a['node']) for a in data['data']]
+        data = await self._call(self._http.get_seasonal_anime, year, season, sort, limit, offset, fields=fields)
+        with self._http.building('AnimeForList', len(data['data'])):
+            anime = [AnimeForList(a['node'], self._lazy) for a in data['data']]
+        return anime
+
+    async def get_seasonal_anime_bulk(self, total: int, year: int, season: str, sort: str = 'anime_score', offset: int = 0, page_size: int = 500, concurrency: int = 4, fields: FieldsType = None) -> List[AnimeForList]:
+        """Gets a large part of the anime released in a season and year with concurrent requests
+
+        The range is split into windows of ``page_size`` which are requested concurrently.
+        Results are returned in rank order, without duplicates if the ranking shifted
+        during the fetch.
+
+        Parameters
+        -----------
+        total: :class:`int`
+            The amount of results to fetch
+
+        year: :class:`int`
+            The year to query
+
+        season: :class:`str`
+            The season to query
+            Options: winter, spring, summer, fall
+
+        sort: :class:`str`
+            The criteria for how the ranking will be based
+            Options: anime_score, anime_num_list_users
+
+        offset: :class:`int`
+            The offset from 1 for where the fetch will start
+
+        page_size: :class:`int`
+            The amount of results requested per window. Cannot exceed 500. Defaults to 500.
+
+        concurrency: :class:`int`
+            The max amount of windows requested at the same time. Defaults to 4.
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
+        Returns
+        --------
+        List[:class:`AnimeForList`]
+            The anime from [1 + offset, offset + total]
+        """
+        data = await fetch_windows(
+            lambda limit, window_offset: self._call(self._http.get_seasonal_anime, year, season, sort, limit, window_offset, fields=fields),
+            total,
+            min(page_size, 500),
+            offset,
+            concurrency
+        )
+        with self._http.building('AnimeForList', len(data), ('GET', '/anime/season/{year}/{season}')):
+            anime = [AnimeForList(a['node'], self._lazy) for a in data]
         return anime
 
-    async def get_suggested_anime(self, limit: int = 100, offset: int = 0) -> List[AnimeForList]:
+    def iter_seasonal_anime(self, year: int, season: str, sort: str = 'anime_score', limit: int = 500, offset: int = 0, fields: FieldsType = None, prefetch: bool = True) -> Paginator[AnimeForList]:
+        """Iterates over all the anime released in a season and year
+
+        Pages are fetched by following ``paging.next`` while the current page is consumed
+
+        Parameters
+        -----------
+        year: :class:`int`
+            The year to query
+
+        season: :class:`str`
+            The season to query
+            Options: winter, spring, summer, fall
+
+        sort: :class:`str`
+            The criteria for how the ranking will be based
+            Options: anime_score, anime_num_list_users
+
+        limit: :class:`int`
+            The amount of results per page. Cannot exceed 500. Defaults to 500.
+
+        offset: :class:`int`
+            The offset from 1 for where the iteration will start
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
+        prefetch: :class:`bool`
+            Whether to request the next page while the current one is consumed. Defaults to True.
+
+        Returns
+        --------
+        :class:`Paginator`[:class:`AnimeForList`]
+            An async iterator over every result
+        """
+        return Paginator(
+            lambda: self._call(self._http.get_seasonal_anime, year, season, sort, limit, offset, fields=fields),
+            lambda url: self._call(self._http.get_page, url),
+            lambda a: AnimeForList(a['node'], self._lazy),
+            prefetch
+        )
+
+    async def get_suggested_anime(self, limit: int = 100, offset: int = 0, fields: FieldsType = None) -> List[AnimeForList]:
         """Returns suggested anime for the user
 
         If the user is new comer, this method returns an empty list
@@ -124,15 +530,52 @@ class ClientUser:
         offset: :class:`int`
             The offset from 1 for where the list will start
         
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
         Returns
         --------
         List[:class:`AnimeForList`]
             A list of suggested anime for the user
         """
-        data = await self._http.get_suggested_anime(self._access_token, limit, offset)
-        anime = [AnimeForList(a['node']) for a in data['data']]
+        data = await self._call(self._http.get_suggested_anime, limit, offset, fields=fields)
+        with self._http.building('AnimeForList', len(data['data'])):
+            anime = [AnimeForList(a['node'], self._lazy) for a in data['data']]
         return anime
     
+    def iter_suggested_anime(self, limit: int = 100, offset: int = 0, fields: FieldsType = None, prefetch: bool = True) -> Paginator[AnimeForList]:
+        """Iterates over the suggested anime for the user
+
+        Pages are fetched by following ``paging.next`` while the current page is consumed
+
+        Parameters
+        -----------
+        limit: :class:`int`
+            The amount of results per page. Cannot exceed 100. Defaults to 100.
+
+        offset: :class:`int`
+            The offset from 1 for where the iteration will start
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
+        prefetch: :class:`bool`
+            Whether to request the next page while the current one is consumed. Defaults to True.
+
+        Returns
+        --------
+        :class:`Paginator`[:class:`AnimeForList`]
+            An async iterator over every result
+        """
+        return Paginator(
+            lambda: self._call(self._http.get_suggested_anime, limit, offset, fields=fields),
+            lambda url: self._call(self._http.get_page, url),
+            lambda a: AnimeForList(a['node'], self._lazy),
+            prefetch
+        )
+
     async def update_anime_list_status(self, anime_id: int, **kwargs) -> MyListStatus:
         """Add specified anime to my anime list
 
@@ -171,10 +614,38 @@ class ClientUser:
         :class:`MyListStatus`
             An object for the status of the given anime
         """
-        data = await self._http.update_anime_list_status(self._access_token, anime_id, **kwargs)
-        my_list_status = MyListStatus(data)
+        data = await self._call(self._http.update_anime_list_status, anime_id, **kwargs)
+        with self._http.building('MyListStatus'):
+            my_list_status = MyListStatus(data)
         return my_list_status
 
+    def queue_anime_list_status(self, anime_id: int, **kwargs) -> 'asyncio.Future[MyListStatus]':
+        """Queues an update of the specified anime in my anime list
+
+        The update is delayed by the client's :class:`UpdateQueue` and merged with the other
+        updates queued for the same anime in the meantime, so bursts of updates are sent as
+        one request. Takes the same fields as :meth:`update_anime_list_status`.
+
+        Parameters
+        -----------
+        anime_id: :class:`int`
+            The ID of the anime to update
+
+        kwargs:
+            The fields to update, e.g. status or num_watched_episodes
+
+        Raises
+        -------
+        RuntimeError
+            The client was made without an update queue
+
+        Returns
+        --------
+        :class:`asyncio.Future`[:class:`MyListStatus`]
+            Resolves with the status of the anime once the merged update is sent
+        """
+        return self._queue_update('anime', anime_id, self.update_anime_list_status, kwargs)
+
     async def delete_anime_list_item(self, anime_id: int) -> bool:
         """Deletes an anime from the user's anime list
         
@@ -189,13 +660,13 @@ class ClientUser:
             True if the anime was deleted successfully, False if the anime was not found
         """
         try:
-            await self._http.delete_anime_list_item(self._access_token, anime_id)
+            await self._call(self._http.delete_anime_list_item, anime_id)
         except NotFound:
             return False
         else:
             return True
 
-    async def get_user_anime_list(self, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 100, offset: int = 0) -> List[AnimeForList]:
+    async def get_user_anime_list(self, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 100, offset: int = 0, fields: FieldsType = None) -> List[AnimeForList]:
         """Returns the given user's anime list
         
         Parameters
@@ -217,17 +688,103 @@ class ClientUser:
         offset: :class:`int`
             The offset from 1 for where the list will start
         
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to MAL's own default fields.
+
         Returns
         --------
         List[:class:`AnimeForList`]
             A list of each anime in the user's list
         """
-        data = await self._http.get_user_anime_list(self._access_token, user_name, status, sort, limit, offset)
+        data = await self._call(self._http.get_user_anime_list, user_name, status, sort, limit, offset, fields=fields)
 
         # TODO: make a cleaner type for this
-        user_anime_list = [AnimeForList(anime['node']) for anime in data['data']]
+        with self._http.building('AnimeForList', len(data['data'])):
+            user_anime_list = [AnimeForList(anime['node'], self._lazy) for anime in data['data']]
         return user_anime_list
 
+    def iter_user_anime_list(self, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 1000, offset: int = 0, fields: FieldsType = None, prefetch: bool = True) -> Paginator[AnimeForList]:
+        """Iterates over the given user's whole anime list
+
+        Pages are fetched by following ``paging.next`` while the current page is consumed
+
+        Parameters
+        -----------
+        user_name: :class:`str`
+            The user name of the user to query, default @me
+
+        status: :class:`str`
+            Filter returned anime list by the given status
+            Options: watching, completed, on_hold, dropped, plan_to_watch
+
+        sort: :class:`str`
+            Sort the returned anime list by the given criteria
+            Options: list_score, list_updated_at, anime_title, anime_start_date, anime_id
+
+        limit: :class:`int`
+            The amount of results per page. Cannot exceed 1000. Defaults to 1000.
+
+        offset: :class:`int`
+            The offset from 1 for where the iteration will start
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to MAL's own default fields.
+
+        prefetch: :class:`bool`
+            Whether to request the next page while the current one is consumed. Defaults to True.
+
+        Returns
+        --------
+        :class:`Paginator`[:class:`AnimeForList`]
+            An async iterator over every result
+        """
+        return Paginator(
+            lambda: self._call(self._http.get_user_anime_list, user_name, status, sort, limit, offset, fields=fields),
+            lambda url: self._call(self._http.get_page, url),
+            lambda a: AnimeForList(a['node'], self._lazy),
+            prefetch
+        )
+
+    async def stream_user_anime_list(self, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 1000, offset: int = 0, fields: FieldsType = None) -> AsyncIterator[AnimeForList]:
+        """Iterates over the given user's whole anime list, parsing every page while it downloads
+
+        Unlike :meth:`iter_user_anime_list` a page isn't buffered and decoded at once. Entries
+        are yielded as soon as they arrive, so memory is bounded by an entry instead of a page
+        of up to 1000 entries. Streamed pages bypass the caches.
+
+        Parameters
+        -----------
+        user_name: :class:`str`
+            The user name of the user to query, default @me
+
+        status: :class:`str`
+            Filter returned anime list by the given status
+            Options: watching, completed, on_hold, dropped, plan_to_watch
+
+        sort: :class:`str`
+            Sort the returned anime list by the given criteria
+            Options: list_score, list_updated_at, anime_title, anime_start_date, anime_id
+
+        limit: :class:`int`
+            The amount of results per page. Cannot exceed 1000. Defaults to 1000.
+
+        offset: :class:`int`
+            The offset from 1 for where the iteration will start
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to MAL's own default fields.
+
+        Yields
+        -------
+        :class:`AnimeForList`
+            Each anime in the user's list
+        """
+        async for item in self._stream(self._http.get_user_anime_list, user_name, status, sort, limit, offset, fields=fields):
+            yield AnimeForList(item['node'], self._lazy)
+
     async def get_forum_boards(self) -> List[ForumCategory]:
         """Returns the main forum boards (MyAnimeList, Anime & Manga, General)
         
@@ -236,8 +793,9 @@ class ClientUser:
         List[:class:`ForumCategory`]
             A list of the forum boards
         """
-        data = await self._http.get_forum_boards(self._access_token)
-        forum_boards = [ForumCategory(fc) for fc in data['categories']]
+        data = await self._call(self._http.get_forum_boards)
+        with self._http.building('ForumCategory', len(data['categories'])):
+            forum_boards = [ForumCategory(fc, self._lazy) for fc in data['categories']]
         return forum_boards
 
     async def get_forum_topic_detail(self, topic_id: int) -> List[ForumTopicData]:
@@ -253,8 +811,9 @@ class ClientUser:
         List[:class:`ForumTopicData`]
             The forum topic data containing every post and poll in a forum topic
         """
-        data = await self._http.get_forum_topic_detail(self._access_token, topic_id)
-        forum_topics_detail = ForumTopicData(data['data'])
+        data = await self._call(self._http.get_forum_topic_detail, topic_id)
+        with self._http.building('ForumTopicData'):
+            forum_topics_detail = ForumTopicData(data['data'], self._lazy)
         return forum_topics_detail
 
     async def get_forum_topics(self, board_id: Optional[int] = None, subboard_id: Optional[int] = None, limit: int = 100, offset: int = 0, sort: str = 'recent', q: Optional[str] = None, topic_user_name: Optional[str] = None, user_name: Optional[str] = None) -> List[ForumTopicsData]:
@@ -292,11 +851,36 @@ class ClientUser:
         List[`ForumTopicsData`]
             A list of all forum topics matching the given query
         """
-        data = await self._http.get_forum_topics(self._access_token, board_id, subboard_id, limit, offset, sort, q, topic_user_name, user_name)
-        forum_topics = [ForumTopicsData(ftd) for ftd in data['data']]
+        data = await self._call(self._http.get_forum_topics, board_id, subboard_id, limit, offset, sort, q, topic_user_name, user_name)
+        with self._http.building('ForumTopicsData', len(data['data'])):
+            forum_topics = [ForumTopicsData(ftd) for ftd in data['data']]
         return forum_topics
 
-    async def get_manga(self, query: str, limit: int = 100, offset: int = 0) -> List[MangaForList]:
+    def iter_forum_topics(self, board_id: Optional[int] = None, subboard_id: Optional[int] = None, limit: int = 100, offset: int = 0, sort: str = 'recent', q: Optional[str] = None, topic_user_name: Optional[str] = None, user_name: Optional[str] = None, prefetch: bool = True) -> Paginator[ForumTopicsData]:
+        """Iterates over every forum topic under given queries
+
+        Pages are fetched by following ``paging.next`` while the current page is consumed.
+        The parameters are the same as :meth:`get_forum_topics`, with ``limit`` being the
+        amount of results per page.
+
+        Parameters
+        -----------
+        prefetch: :class:`bool`
+            Whether to request the next page while the current one is consumed. Defaults to True.
+
+        Returns
+        --------
+        :class:`Paginator`[:class:`ForumTopicsData`]
+            An async iterator over every forum topic
+        """
+        return Paginator(
+            lambda: self._call(self._http.get_forum_topics, board_id, subboard_id, limit, offset, sort, q, topic_user_name, user_name),
+            lambda url: self._call(self._http.get_page, url),
+            ForumTopicsData,
+            prefetch
+        )
+
+    async def get_manga(self, query: str, limit: int = 100, offset: int = 0, fields: FieldsType = None) -> List[MangaForList]:
         """Returns manga matching the query
 
         Parameters
@@ -310,16 +894,56 @@ class ClientUser:
         offset: :class:`int`
             The offset from 1 for where the list will start.
 
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
         Returns
         --------
         List[:class:`MangaForList`]
             A list of manga that matched the given query
         """
-        data = await self._http.get_manga(self._access_token, query, limit, offset)
-        manga = [MangaForList(m['node']) for m in data['data']]
+        data = await self._call(self._http.get_manga, query, limit, offset, fields=fields)
+        with self._http.building('MangaForList', len(data['data'])):
+            manga = [MangaForList(m['node'], self._lazy) for m in data['data']]
         return manga
 
-    async def get_manga_details(self, manga_id: int) -> MangaDetails:
+    def iter_manga(self, query: str, limit: int = 100, offset: int = 0, fields: FieldsType = None, prefetch: bool = True) -> Paginator[MangaForList]:
+        """Iterates over every manga matching the query
+
+        Pages are fetched by following ``paging.next`` while the current page is consumed
+
+        Parameters
+        -----------
+        query: :class:`str`
+            What to search in the MAL database
+
+        limit: :class:`int`
+            The amount of results per page. Cannot exceed 100. Defaults to 100.
+
+        offset: :class:`int`
+            The offset from 1 for where the iteration will start
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
+        prefetch: :class:`bool`
+            Whether to request the next page while the current one is consumed. Defaults to True.
+
+        Returns
+        --------
+        :class:`Paginator`[:class:`MangaForList`]
+            An async iterator over every result
+        """
+        return Paginator(
+            lambda: self._call(self._http.get_manga, query, limit, offset, fields=fields),
+            lambda url: self._call(self._http.get_page, url),
+            lambda m: MangaForList(m['node'], self._lazy),
+            prefetch
+        )
+
+    async def get_manga_details(self, manga_id: int, fields: FieldsType = None) -> MangaDetails:
         """Returns the details of the manga with the given ID
         
         Parameters
@@ -327,16 +951,71 @@ class ClientUser:
         manga_id: :class:`id`
             The manga's ID in the MAL database
 
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to full.
+
         Returns
         --------
         :class:`MangaDetails`
             An object containing the details of the manga
         """
-        data = await self._http.get_manga_details(self._access_token, manga_id)
-        manga = MangaDetails(data)
+        data = await self._call(self._http.get_manga_details, manga_id, fields=fields)
+        with self._http.building('MangaDetails'):
+            manga = MangaDetails(data, self._lazy)
         return manga
 
-    async def get_manga_ranking(self, ranking_type: str = 'all', limit: int = 100, offset: int = 0) -> List[MangaForList]:
+    async def get_manga_details_many(self, manga_ids: Iterable[int], fields: FieldsType = None, concurrency: int = 8) -> List[BulkResult]:
+        """Returns the details of many manga with concurrent requests
+
+        A failed ID, e.g. one raising :class:`NotFound`, does not fail the others. Its
+        error is returned in its result instead. Cached and in-flight requests are reused.
+
+        Parameters
+        -----------
+        manga_ids: Iterable[:class:`int`]
+            The manga's IDs in the MAL database
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to full.
+
+        concurrency: :class:`int`
+            The max amount of requests in flight at the same time. Defaults to 8.
+
+        Returns
+        --------
+        List[:class:`BulkResult`]
+            A result per ID in the given order, holding a :class:`MangaDetails` or the error
+        """
+        return [r async for r in self.iter_manga_details_many(manga_ids, fields, concurrency, ordered=True)]
+
+    def iter_manga_details_many(self, manga_ids: Iterable[int], fields: FieldsType = None, concurrency: int = 8, ordered: bool = False) -> AsyncIterator[BulkResult]:
+        """Iterates over the details of many manga, fetched with concurrent requests
+
+        Parameters
+        -----------
+        manga_ids: Iterable[:class:`int`]
+            The manga's IDs in the MAL database
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to full.
+
+        concurrency: :class:`int`
+            The max amount of requests in flight at the same time. Defaults to 8.
+
+        ordered: :class:`bool`
+            Whether results are yielded in the given order or as they complete. Defaults to False.
+
+        Yields
+        -------
+        :class:`BulkResult`
+            A result per ID, holding a :class:`MangaDetails` or the error
+        """
+        return fetch_many(lambda manga_id: self.get_manga_details(manga_id, fields), manga_ids, concurrency, ordered)
+
+    async def get_manga_ranking(self, ranking_type: str = 'all', limit: int = 100, offset: int = 0, fields: FieldsType = None) -> List[MangaForList]:
         """Gets the ranking from [1 + offset, offset + limit]
         
         Parameters
@@ -351,15 +1030,101 @@ class ClientUser:
         offset: :class:`int`
             The offset from 1 for where the list will start.
 
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
         Returns
         --------
         List[:class:`MangaForList`]
             The ranking by the given ranking type
         """
-        data = await self._http.get_manga_ranking(self._access_token, ranking_type, limit, offset)
-        manga = [MangaForList(m['node']) for m in data['data']]
+        data = await self._call(self._http.get_manga_ranking, ranking_type, limit, offset, fields=fields)
+        with self._http.building('MangaForList', len(data['data'])):
+            manga = [MangaForList(m['node'], self._lazy) for m in data['data']]
+        return manga
+
+    async def get_manga_ranking_bulk(self, total: int, ranking_type: str = 'all', offset: int = 0, page_size: int = 500, concurrency: int = 4, fields: FieldsType = None) -> List[MangaForList]:
+        """Gets a large part of the ranking with concurrent requests
+
+        The range is split into windows of ``page_size`` which are requested concurrently.
+        Results are returned in rank order, without duplicates if the ranking shifted
+        during the fetch.
+
+        Parameters
+        -----------
+        total: :class:`int`
+            The amount of results to fetch
+
+        ranking_type: :class:`str`
+            The criteria ranking will be based on.
+            Options include: all, manga, oneshots, doujin, lightnovels, novels, manhwa, manhua, bypopularity, favorite
+
+        offset: :class:`int`
+            The offset from 1 for where the fetch will start
+
+        page_size: :class:`int`
+            The amount of results requested per window. Cannot exceed 500. Defaults to 500.
+
+        concurrency: :class:`int`
+            The max amount of windows requested at the same time. Defaults to 4.
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
+        Returns
+        --------
+        List[:class:`MangaForList`]
+            The manga from [1 + offset, offset + total]
+        """
+        data = await fetch_windows(
+            lambda limit, window_offset: self._call(self._http.get_manga_ranking, ranking_type, limit, window_offset, fields=fields),
+            total,
+            min(page_size, 500),
+            offset,
+            concurrency
+        )
+        with self._http.building('MangaForList', len(data), ('GET', '/manga/ranking')):
+            manga = [MangaForList(m['node'], self._lazy) for m in data]
         return manga
 
+    def iter_manga_ranking(self, ranking_type: str = 'all', limit: int = 500, offset: int = 0, fields: FieldsType = None, prefetch: bool = True) -> Paginator[MangaForList]:
+        """Iterates over the ranking starting from 1 + offset
+
+        Pages are fetched by following ``paging.next`` while the current page is consumed
+
+        Parameters
+        -----------
+        ranking_type: :class:`str`
+            The criteria ranking will be based on.
+            Options include: all, manga, oneshots, doujin, lightnovels, novels, manhwa, manhua, bypopularity, favorite
+
+        limit: :class:`int`
+            The amount of results per page. Cannot exceed 500. Defaults to 500.
+
+        offset: :class:`int`
+            The offset from 1 for where the iteration will start
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to list.
+
+        prefetch: :class:`bool`
+            Whether to request the next page while the current one is consumed. Defaults to True.
+
+        Returns
+        --------
+        :class:`Paginator`[:class:`MangaForList`]
+            An async iterator over every result
+        """
+        return Paginator(
+            lambda: self._call(self._http.get_manga_ranking, ranking_type, limit, offset, fields=fields),
+            lambda url: self._call(self._http.get_page, url),
+            lambda m: MangaForList(m['node'], self._lazy),
+            prefetch
+        )
+
     async def update_manga_list_status(self, manga_id: int, **kwargs) -> MyListStatus:
         """Add specified manga to my manga list
 
@@ -400,10 +1165,38 @@ class ClientUser:
         :class:`MyListStatus`
             An object for the status of the given manga
         """
-        data = await self._http.update_manga_list_status(self._access_token, manga_id, **kwargs)
-        my_list_status = MyListStatus(data)
+        data = await self._call(self._http.update_manga_list_status, manga_id, **kwargs)
+        with self._http.building('MyListStatus'):
+            my_list_status = MyListStatus(data)
         return my_list_status
 
+    def queue_manga_list_status(self, manga_id: int, **kwargs) -> 'asyncio.Future[MyListStatus]':
+        """Queues an update of the specified manga in my manga list
+
+        The update is delayed by the client's :class:`UpdateQueue` and merged with the other
+        updates queued for the same manga in the meantime, so bursts of updates are sent as
+        one request. Takes the same fields as :meth:`update_manga_list_status`.
+
+        Parameters
+        -----------
+        manga_id: :class:`int`
+            The ID of the manga to update
+
+        kwargs:
+            The fields to update, e.g. status or num_chapters_read
+
+        Raises
+        -------
+        RuntimeError
+            The client was made without an update queue
+
+        Returns
+        --------
+        :class:`asyncio.Future`[:class:`MyListStatus`]
+            Resolves with the status of the manga once the merged update is sent
+        """
+        return self._queue_update('manga', manga_id, self.update_manga_list_status, kwargs)
+
     async def delete_manga_list_item(self, manga_id: int) -> bool:
         """Deletes an manga from the user's manga list
         
@@ -418,13 +1211,13 @@ class ClientUser:
             True if the manga was deleted successfully, False if the manga was not found
         """
         try:
-            await self._http.delete_manga_list_item(self._access_token, manga_id)
+            await self._call(self._http.delete_manga_list_item, manga_id)
         except NotFound:
             return False
         else:
             return True
 
-    async def get_user_manga_list(self, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 100, offset: int = 0) -> Tuple[MangaForList, MyListStatus]:
+    async def get_user_manga_list(self, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 100, offset: int = 0, fields: FieldsType = None) -> Tuple[MangaForList, MyListStatus]:
         """Returns the given user's manga list
         
         Parameters
@@ -446,16 +1239,102 @@ class ClientUser:
         offset: :class:`int`
             The offset from 1 for where the list will start
         
-        Returnshmm
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to MAL's own default fields.
+
+        Returns
         --------
         List[:class:`MangaForList`]
             A list of each manga in the user's list
         """
-        data = await self._http.get_user_manga_list(self._access_token, user_name, status, sort, limit, offset)
-        user_manga_list = [MangaForList(manga['node']) for manga in data['data']]
+        data = await self._call(self._http.get_user_manga_list, user_name, status, sort, limit, offset, fields=fields)
+        with self._http.building('MangaForList', len(data['data'])):
+            user_manga_list = [MangaForList(manga['node'], self._lazy) for manga in data['data']]
         return user_manga_list
 
-    async def get_user_information(self) -> User:
+    def iter_user_manga_list(self, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 1000, offset: int = 0, fields: FieldsType = None, prefetch: bool = True) -> Paginator[MangaForList]:
+        """Iterates over the given user's whole manga list
+
+        Pages are fetched by following ``paging.next`` while the current page is consumed
+
+        Parameters
+        -----------
+        user_name: :class:`str`
+            The user name of the user to query, default @me
+
+        status: :class:`str`
+            Filter returned manga list by the given status
+            Options: reading, completed, on_hold, dropped, plan_to_read
+
+        sort: :class:`str`
+            Sort the returned manga list by the given criteria
+            Options: list_score, list_updated_at, manga_title, manga_start_date, manga_id
+
+        limit: :class:`int`
+            The amount of results per page. Cannot exceed 1000. Defaults to 1000.
+
+        offset: :class:`int`
+            The offset from 1 for where the iteration will start
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to MAL's own default fields.
+
+        prefetch: :class:`bool`
+            Whether to request the next page while the current one is consumed. Defaults to True.
+
+        Returns
+        --------
+        :class:`Paginator`[:class:`MangaForList`]
+            An async iterator over every result
+        """
+        return Paginator(
+            lambda: self._call(self._http.get_user_manga_list, user_name, status, sort, limit, offset, fields=fields),
+            lambda url: self._call(self._http.get_page, url),
+            lambda m: MangaForList(m['node'], self._lazy),
+            prefetch
+        )
+
+    async def stream_user_manga_list(self, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 1000, offset: int = 0, fields: FieldsType = None) -> AsyncIterator[MangaForList]:
+        """Iterates over the given user's whole manga list, parsing every page while it downloads
+
+        Unlike :meth:`iter_user_manga_list` a page isn't buffered and decoded at once. Entries
+        are yielded as soon as they arrive, so memory is bounded by an entry instead of a page
+        of up to 1000 entries. Streamed pages bypass the caches.
+
+        Parameters
+        -----------
+        user_name: :class:`str`
+            The user name of the user to query, default @me
+
+        status: :class:`str`
+            Filter returned manga list by the given status
+            Options: reading, completed, on_hold, dropped, plan_to_read
+
+        sort: :class:`str`
+            Sort the returned manga list by the given criteria
+            Options: list_score, list_updated_at, manga_title, manga_start_date, manga_id
+
+        limit: :class:`int`
+            The amount of results per page. Cannot exceed 1000. Defaults to 1000.
+
+        offset: :class:`int`
+            The offset from 1 for where the iteration will start
+
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to MAL's own default fields.
+
+        Yields
+        -------
+        :class:`MangaForList`
+            Each manga in the user's list
+        """
+        async for item in self._stream(self._http.get_user_manga_list, user_name, status, sort, limit, offset, fields=fields):
+            yield MangaForList(item['node'], self._lazy)
+
+    async def get_user_information(self, fields: FieldsType = None) -> User:
         """Gets the user's information
         
         Parameters
@@ -463,13 +1342,18 @@ class ClientUser:
         user_name: :class:`str`
             The user to search, defaults to @me
         
+        fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+            The fields to request. Either a preset (minimal, list, full), a comma separated
+            string or an iterable of field names. Defaults to full.
+
         Returns
         --------
         :class:`User`
             The user's information
         """
-        data = await self._http.get_user_information(self._access_token)
-        user = User(data)
+        data = await self._call(self._http.get_user_information, fields=fields)
+        with self._http.building('User'):
+            user = User(data, self._lazy)
         return user
 
 
@@ -484,9 +1368,131 @@ class Client:
     
     client_secret: :class:`str`
         The client secret of the developer application obtained from the MAL API config
+
+    cache: Optional[:class:`ResponseCache`]
+        A cache for GET responses shared by every user made by this client. Disabled by default.
+
+    rate_limiter: Optional[:class:`RateLimiter`]
+        Limits the requests sent with this client ID. Disabled by default.
+
+    global_rate_limiter: Optional[:class:`RateLimiter`]
+        A limiter shared with other clients to limit their requests together. Disabled by default.
+
+    lazy: :class:`bool`
+        Whether returned objects build their nested objects (pictures, related media,
+        recommendations, genres...) only when they are first accessed. Defaults to False.
+
+    update_queue: Optional[:class:`UpdateQueue`]
+        Merges the list status updates queued by users made by this client. It is flushed
+        when the client is closed. Disabled by default.
+
+    on_token_refresh: Optional[Callable[[:class:`ClientUser`], Optional[Awaitable[None]]]]
+        Called, and awaited if it is a coroutine function, with a user whose tokens were
+        just refreshed, to persist the new :attr:`ClientUser.access_token` and
+        :attr:`ClientUser.refresh_token`.
+
+    options:
+        connection_limit: :class:`int`
+            The max amount of open connections. Defaults to 100.
+
+        connection_limit_per_host: :class:`int`
+            The max amount of open connections per host, 0 for no limit. Defaults to 0.
+
+        keepalive_timeout: :class:`float`
+            How long, in seconds, an idle connection is kept open. Defaults to 15.
+
+        dns_cache_ttl: Optional[:class:`int`]
+            How long, in seconds, DNS lookups are cached, None to disable the cache. Defaults to 10.
+
+        prewarm_connections: :class:`int`
+            The amount of connections :meth:`prewarm` opens. Defaults to 0.
+
+        json_loads: Callable[[:class:`bytes`], Any]
+            Decodes response bodies. Defaults to ``orjson.loads`` when orjson is installed
+            and ``json.loads`` otherwise.
+
+        disk_cache: Optional[:class:`DiskCache`]
+            A persistent cache for GET responses, consulted after ``cache``. It is closed
+            together with the client. Disabled by default.
+
+        client_id_pool: Optional[:class:`ClientIdPool`]
+            Spreads the requests of :meth:`make_public_user` over several client IDs instead
+            of sending them all with ``client_id``. Disabled by default.
+
+        retry_policy: Optional[:class:`RetryPolicy`]
+            Which failed requests are retried, how often and for how long. Defaults to
+            ``RetryPolicy()``, up to 5 attempts on server and connection errors.
+
+        instruments: Iterable[:class:`Instrument`]
+            Told about every request and how long each of its phases took, e.g. a
+            :class:`HistogramCollector`. None by default.
+
+        transport: Optional[:class:`Transport`]
+            Sends the requests instead of the client's own session, e.g. a
+            :class:`RecordingTransport` or a :class:`ReplayTransport`. It is closed
+            together with the client. Disabled by default.
     """
-    def __init__(self, client_id: str, client_secret: str) -> None:
-        self._http = HTTPClient(client_id, client_secret)
+    def __init__(self, client_id: str, client_secret: str, cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None, global_rate_limiter: Optional[RateLimiter] = None, lazy: bool = False, update_queue: Optional[UpdateQueue] = None, on_token_refresh: Optional[TokenCallback] = None, **options: Any) -> None:
+        self._http = HTTPClient(client_id, client_secret, cache=cache, rate_limiter=rate_limiter, global_rate_limiter=global_rate_limiter, **options)
+        self._lazy = lazy
+        self._update_queue = update_queue
+        self._on_token_refresh = on_token_refresh
+
+    async def __aenter__(self) -> 'Client':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._http.closed
+
+    async def start(self) -> None:
+        """Opens the HTTP session on the running loop and pre-warms connections if configured
+
+        Calling this is optional, the session is otherwise opened by the first request.
+        """
+        await self._http.start()
+
+    async def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Sends the queued list updates, waits for the in-flight requests and closes the HTTP session
+
+        Parameters
+        -----------
+        timeout: Optional[:class:`float`]
+            How long, in seconds, to wait for queued updates and in-flight requests
+            before closing the session under them. None waits for as long as they take.
+            Defaults to 10.
+        """
+        if self._update_queue is not None and not self._http.closed:
+            try:
+                await asyncio.wait_for(self._update_queue.flush(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        await self._http.close(timeout)
+
+    @property
+    def pool_stats(self) -> PoolStats:
+        """The usage of the connection pool shared by every user made by this client"""
+        return self._http.pool_stats
+
+    async def prewarm(self, connections: Optional[int] = None) -> int:
+        """Opens connections to the API ahead of time so the first requests skip the TCP and TLS handshakes
+
+        Parameters
+        -----------
+        connections: Optional[:class:`int`]
+            The amount of connections to open. Defaults to the ``prewarm_connections`` option.
+
+        Returns
+        --------
+        :class:`int`
+            The amount of connections that were opened
+        """
+        return await self._http.prewarm(connections)
 
     def generate_auth_url(self) -> str:
         """Returns an auth URL for end users to obtain their auth code
@@ -516,7 +1522,31 @@ class Client:
         """
         return await self._http.generate_access_token(auth_code, code_verifier)
 
-    def make_user(self, access_token: str, refresh_token: str) -> ClientUser:
+    async def make_user_from_code(self, auth_code: str, code_verifier: str) -> ClientUser:
+        """Trades the user's auth code for their tokens and returns a :class:`ClientUser` with them
+
+        Unlike :meth:`generate_access_token` the expiry MAL sends with the tokens is kept,
+        so the user's tokens are refreshed shortly before they expire.
+
+        Parameters
+        -----------
+        auth_code: :class:`str`
+            The user's auth code obtained from their given auth URL
+
+        code_verifier: :class:`str`
+            The user's unique code challenge
+
+        Returns
+        --------
+        :class:`ClientUser`
+            An object used to interact with the MAL API
+        """
+        data = await self._http.exchange_code(auth_code, code_verifier)
+        expires_in = data.get('expires_in')
+        expires_at = time.time() + expires_in if expires_in is not None else None
+        return self.make_user(data['access_token'], data['refresh_token'], expires_at)
+
+    def make_user(self, access_token: str, refresh_token: str, expires_at: Optional[float] = None) -> ClientUser:
         """Returns a :class:`ClientUser` that can interact with the MAL API
 
         Parameters
@@ -526,10 +1556,28 @@ class Client:
 
         refresh_token: :class:`str`
             The user's refresh token obtained from their given auth URL
+
+        expires_at: Optional[:class:`float`]
+            When the access token expires, as a UNIX timestamp. If given, the tokens are
+            refreshed shortly before that instead of on the first failed request.
         
         Returns
         --------
         :class:`ClientUser`
             An object used to interact with the MAL API
         """
-        return ClientUser(access_token, refresh_token, self._http)
+        return ClientUser(access_token, refresh_token, self._http, self._lazy, self._update_queue, expires_at, self._on_token_refresh)
+
+    def make_public_user(self) -> ClientUser:
+        """Returns a :class:`ClientUser` without a user's token, for public reads
+
+        Its requests are authenticated with the client ID, or spread over the client IDs
+        of the ``client_id_pool``. Only endpoints that don't need a user, such as
+        searches, rankings, seasons and details, can be used.
+
+        Returns
+        --------
+        :class:`ClientUser`
+            An object used to read public data from the MAL API
+        """
+        return ClientUser(None, None, self._http, self._lazy)
@@ -0,0 +1,139 @@
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+__all__ = [
+    'LIST_STATUS_CODES',
+    'MediaColumns',
+]
+
+
+#: MAL's own codes for list statuses, 0 is used for media that isn't in the list
+LIST_STATUS_CODES: Dict[str, int] = {
+    'watching': 1,
+    'reading': 1,
+    'completed': 2,
+    'on_hold': 3,
+    'dropped': 4,
+    'plan_to_watch': 6,
+    'plan_to_read': 6,
+}
+
+Column = Union[array, List[Optional[str]]]
+
+
+class MediaColumns:
+    """Anime or manga list results stored column by column
+
+    Built straight from the decoded items of list, ranking and seasonal pages, without
+    making a model object per row. Numeric columns are contiguous :class:`array.array`
+    buffers, string columns are plain lists.
+
+    Missing numbers are 0, except ``mean`` where they are NaN. ``list_status`` holds
+    the codes of :data:`LIST_STATUS_CODES`, read from the item's ``list_status`` or the
+    node's ``my_list_status``.
+
+    Attributes
+    -----------
+    id, rank, popularity, num_list_users, num_episodes, num_chapters, num_volumes, score, list_status: :class:`array.array`
+        The integer columns
+
+    mean: :class:`array.array`
+        The float column
+
+    title, media_type, status, start_date: List[Optional[:class:`str`]]
+        The string columns
+    """
+    NUMERIC_COLUMNS = ('id', 'mean', 'rank', 'popularity', 'num_list_users', 'num_episodes', 'num_chapters', 'num_volumes', 'score', 'list_status')
+    STRING_COLUMNS = ('title', 'media_type', 'status', 'start_date')
+
+    __slots__ = NUMERIC_COLUMNS + STRING_COLUMNS
+
+    def __init__(self) -> None:
+        self.id = array('q')
+        self.mean = array('d')
+        self.rank = array('l')
+        self.popularity = array('l')
+        self.num_list_users = array('l')
+        self.num_episodes = array('l')
+        self.num_chapters = array('l')
+        self.num_volumes = array('l')
+        self.score = array('b')
+        self.list_status = array('b')
+        self.title: List[Optional[str]] = []
+        self.media_type: List[Optional[str]] = []
+        self.status: List[Optional[str]] = []
+        self.start_date: List[Optional[str]] = []
+
+    @classmethod
+    def from_items(cls, items: Iterable[Dict[str, Any]]) -> 'MediaColumns':
+        """Builds the columns from the raw items of a page's ``data``"""
+        columns = cls()
+        columns.extend(items)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def extend(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Appends the raw items of a page's ``data``"""
+        # Bound once, this runs for every row of every page
+        id_, mean, rank, popularity = self.id.append, self.mean.append, self.rank.append, self.popularity.append
+        num_list_users, num_episodes = self.num_list_users.append, self.num_episodes.append
+        num_chapters, num_volumes = self.num_chapters.append, self.num_volumes.append
+        score, list_status = self.score.append, self.list_status.append
+        title, media_type, status, start_date = self.title.append, self.media_type.append, self.status.append, self.start_date.append
+        codes = LIST_STATUS_CODES
+        nan = math.nan
+
+        for item in items:
+            node = item.get('node', item)
+            entry = item.get('list_status') or node.get('my_list_status') or {}
+            node_mean = node.get('mean')
+
+            id_(node['id'])
+            mean(nan if node_mean is None else node_mean)
+            rank(node.get('rank') or (item.get('ranking') or {}).get('rank') or 0)
+            popularity(node.get('popularity') or 0)
+            num_list_users(node.get('num_list_users') or 0)
+            num_episodes(node.get('num_episodes') or 0)
+            num_chapters(node.get('num_chapters') or 0)
+            num_volumes(node.get('num_volumes') or 0)
+            score(entry.get('score') or 0)
+            list_status(codes.get(entry.get('status'), 0))
+            title(node.get('title'))
+            media_type(node.get('media_type'))
+            status(node.get('status'))
+            start_date(node.get('start_date'))
+
+    def to_dict(self) -> Dict[str, Column]:
+        """Returns every column by name, e.g. to build a ``pandas.DataFrame``"""
+        return {name: getattr(self, name) for name in self.NUMERIC_COLUMNS + self.STRING_COLUMNS}
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Returns every column as a NumPy array, string columns as object arrays
+
+        Raises
+        -------
+        RuntimeError
+            NumPy is not installed
+        """
+        if numpy is None:
+            raise RuntimeError('numpy is required for to_numpy')
+
+        result = {}
+        for name in self.NUMERIC_COLUMNS:
+            column = getattr(self, name)
+            # A copy, a view on the buffer would stop the array from growing on the next extend
+            result[name] = numpy.array(column, dtype=column.typecode)
+
+        for name in self.STRING_COLUMNS:
+            result[name] = numpy.array(getattr(self, name), dtype=object)
+
+        return result
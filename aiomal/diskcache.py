@@ -0,0 +1,387 @@
+import asyncio
+import json
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, NamedTuple, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from .http import Route
+
+
+__all__ = [
+    'CachedResponse',
+    'DiskCache',
+    'DiskCacheStats',
+]
+
+
+T = TypeVar('T')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+'''
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """The headers that make a request conditional on the response having changed"""
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+
+class DiskCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    revalidations: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class DiskCache:
+    """A persistent cache of raw GET responses kept in a SQLite database
+
+    Unlike :class:`ResponseCache` it survives restarts. Bodies are stored compressed
+    together with their ``ETag`` and ``Last-Modified`` validators. Once an entry
+    expires it is kept for another ``stale_ttl`` seconds, during which it is
+    revalidated with a conditional request and served again if MAL answers
+    ``304 Not Modified``.
+
+    The database is only touched from a worker thread, so lookups don't block the
+    event loop. Entries are keyed and scoped to tokens like in :class:`ResponseCache`.
+    Expired entries are evicted in the background every ``eviction_interval`` seconds,
+    and the least recently used ones as soon as the size limit is exceeded. Hits don't
+    write to the database, their access times are buffered and written in batches of
+    ``ACCESS_BATCH``, by the background eviction or when the cache is closed.
+
+    Parameters
+    -----------
+    path: :class:`str`
+        The path of the database file, created if it doesn't exist
+
+    ttl: :class:`float`
+        How long, in seconds, a response stays fresh. Defaults to 3600.
+
+    route_ttls: Optional[Dict[:class:`str`, :class:`float`]]
+        TTLs overriding ``ttl`` per route template, e.g. ``{'/anime/{anime_id}': 86400}``.
+        A TTL of 0 disables caching for that route.
+
+    stale_ttl: :class:`float`
+        How long, in seconds, an expired response is kept for revalidation. Defaults to a week.
+
+    max_bytes: :class:`int`
+        The max total size of the compressed bodies. Defaults to 256 MiB.
+
+    eviction_interval: Optional[:class:`float`]
+        How often, in seconds, expired entries are evicted, None to disable. Defaults to 60.
+
+    compression_level: :class:`int`
+        The zlib compression level of the stored bodies. Defaults to 6.
+    """
+    #: The amount of buffered access times written at once
+    ACCESS_BATCH = 256
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 3600.0,
+        route_ttls: Optional[Dict[str, float]] = None,
+        stale_ttl: float = 7 * 24 * 3600.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        eviction_interval: Optional[float] = 60.0,
+        compression_level: int = 6
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.route_ttls = route_ttls or {}
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.eviction_interval = eviction_interval
+        self.compression_level = compression_level
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._entries = 0
+        self._bytes = 0
+        # The access times of the hits not written yet, by key
+        self._accessed: Dict[str, float] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._evictor: Optional['asyncio.Task[None]'] = None
+
+    @property
+    def stats(self) -> DiskCacheStats:
+        return DiskCacheStats(self.hits, self.misses, self.revalidations, self.evictions, self._entries, self._bytes)
+
+    def ttl_for(self, route: 'Route') -> float:
+        return self.route_ttls.get(route.template, self.ttl)
+
+    async def get(self, route: 'Route') -> Optional[CachedResponse]:
+        """Returns the stored response of the route, fresh or not, or None if there is none"""
+        if self.ttl_for(route) <= 0:
+            return None
+
+        entry = await self._run(self._get, _key(route))
+        if entry is not None and entry.fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        return entry
+
+    async def set(self, route: 'Route', body: bytes, headers: Mapping[str, str]) -> None:
+        """Stores the raw response body of the route with the validators from its headers"""
+        ttl = self.ttl_for(route)
+        if ttl <= 0:
+            return
+
+        await self._run(self._set, route, body, headers.get('ETag'), headers.get('Last-Modified'), ttl)
+
+    async def refresh(self, route: 'Route', headers: Mapping[str, str]) -> None:
+        """Marks the stored response of the route as fresh again after a ``304 Not Modified``"""
+        self.revalidations += 1
+        await self._run(self._refresh, _key(route), headers.get('ETag'), headers.get('Last-Modified'), self.ttl_for(route))
+
+    async def invalidate(self, route: 'Route') -> int:
+        """Drops the entries a write through the given route makes stale, see :meth:`ResponseCache.invalidate`
+
+        Returns
+        --------
+        :class:`int`
+            The amount of dropped entries
+        """
+        return await self._run(self._invalidate, route.path, route.scope)
+
+    async def rescope(self, old: str, new: str) -> int:
+        """Moves the entries of a token scope to another, see :meth:`ResponseCache.rescope`
+
+        Returns
+        --------
+        :class:`int`
+            The amount of moved entries
+        """
+        return await self._run(self._rescope, old, new)
+
+    async def evict(self) -> int:
+        """Drops the entries expired for longer than ``stale_ttl``
+
+        Returns
+        --------
+        :class:`int`
+            The amount of dropped entries
+        """
+        return await self._run(self._evict)
+
+    async def clear(self) -> None:
+        await self._run(self._clear)
+
+    async def close(self) -> None:
+        """Stops the background eviction and closes the database
+
+        The cache can still be used afterwards, which reopens it.
+        """
+        if self._evictor is not None:
+            self._evictor.cancel()
+            self._evictor = None
+
+        if self._executor is not None:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._close)
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            # A single thread, sqlite connections can't be shared between threads
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix='aiomal-diskcache')
+
+        if self._evictor is None and self.eviction_interval:
+            self._evictor = loop.create_task(self._evict_periodically())
+
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _evict_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.eviction_interval)
+            try:
+                await self.evict()
+            except sqlite3.Error:
+                # The database may be locked by another process, try again next time
+                pass
+
+    # Everything below runs in the worker thread
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute(_SCHEMA)
+            db.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+            db.commit()
+            self._entries, self._bytes = db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+            self._db = db
+
+        return self._db
+
+    def _close(self) -> None:
+        if self._db is not None:
+            self._flush_accesses(self._db)
+            self._db.close()
+            self._db = None
+
+    def _get(self, key: str) -> Optional[CachedResponse]:
+        db = self._connect()
+        row = db.execute('SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        self._accessed[key] = time.time()
+        if len(self._accessed) >= self.ACCESS_BATCH:
+            self._flush_accesses(db)
+
+        body, etag, last_modified, expires_at = row
+        return CachedResponse(zlib.decompress(body), etag, last_modified, expires_at)
+
+    def _set(self, route: 'Route', body: bytes, etag: Optional[str], last_modified: Optional[str], ttl: float) -> None:
+        compressed = zlib.compress(body, self.compression_level)
+        if len(compressed) > self.max_bytes:
+            return
+
+        db = self._connect()
+        key = _key(route)
+        now = time.time()
+        old = db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+        self._accessed.pop(key, None)
+        db.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (key, route.path, route.scope, compressed, len(compressed), etag, last_modified, now + ttl, now)
+        )
+        db.commit()
+
+        if old is None:
+            self._entries += 1
+        else:
+            self._bytes -= old[0]
+
+        self._bytes += len(compressed)
+        if self._bytes > self.max_bytes:
+            self._evict_lru()
+
+    def _refresh(self, key: str, etag: Optional[str], last_modified: Optional[str], ttl: float) -> None:
+        db = self._connect()
+        now = time.time()
+        self._accessed.pop(key, None)
+        db.execute(
+            'UPDATE responses SET expires_at = ?, accessed_at = ?, etag = COALESCE(?, etag), '
+            'last_modified = COALESCE(?, last_modified) WHERE key = ?',
+            (now + ttl, now, etag, last_modified, key)
+        )
+        db.commit()
+
+    def _invalidate(self, path: str, scope: str) -> int:
+        media = path.strip('/').split('/', 1)[0]
+        db = self._connect()
+        rows = db.execute(
+            'SELECT key, size FROM responses WHERE scope = ? AND '
+            '(path = ? OR substr(path, 1, ?) = ? OR (substr(path, 1, 7) = ? AND substr(path, -?) = ?))',
+            (scope, f'/{media}', len(media) + 2, f'/{media}/', '/users/', len(media) + 5, f'/{media}list')
+        ).fetchall()
+        self._delete(db, rows)
+        return len(rows)
+
+    def _rescope(self, old: str, new: str) -> int:
+        db = self._connect()
+        moves = []
+        for (key,) in db.execute('SELECT key FROM responses WHERE scope = ?', (old,)).fetchall():
+            new_key = json.dumps(json.loads(key)[:-1] + [new])
+            moves.append((new_key, new, key))
+            if key in self._accessed:
+                self._accessed[new_key] = self._accessed.pop(key)
+
+        db.executemany('UPDATE OR IGNORE responses SET key = ?, scope = ? WHERE key = ?', moves)
+        db.commit()
+        # What is left conflicted with a response the new scope already has
+        left = db.execute('SELECT key, size FROM responses WHERE scope = ?', (old,)).fetchall()
+        self._delete(db, left)
+        return len(moves) - len(left)
+
+    def _evict(self) -> int:
+        db = self._connect()
+        self._flush_accesses(db)
+        rows = db.execute('SELECT key, size FROM responses WHERE expires_at < ?', (time.time() - self.stale_ttl,)).fetchall()
+        self._delete(db, rows)
+        self.evictions += len(rows)
+        return len(rows)
+
+    def _evict_lru(self) -> None:
+        db = self._connect()
+        # The least recently used entries are picked by their access times
+        self._flush_accesses(db)
+        excess = self._bytes - self.max_bytes
+        rows = []
+        for key, size in db.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+            if excess <= 0:
+                break
+
+            rows.append((key, size))
+            excess -= size
+
+        self._delete(db, rows)
+        self.evictions += len(rows)
+
+    def _clear(self) -> None:
+        db = self._connect()
+        db.execute('DELETE FROM responses')
+        db.commit()
+        self._accessed.clear()
+        self._entries = self._bytes = 0
+
+    def _flush_accesses(self, db: sqlite3.Connection) -> None:
+        if not self._accessed:
+            return
+
+        db.executemany('UPDATE responses SET accessed_at = ? WHERE key = ?', [(accessed_at, key) for key, accessed_at in self._accessed.items()])
+        db.commit()
+        self._accessed.clear()
+
+    def _delete(self, db: sqlite3.Connection, rows: List[Any]) -> None:
+        if not rows:
+            return
+
+        db.executemany('DELETE FROM responses WHERE key = ?', [(key,) for key, _ in rows])
+        db.commit()
+        self._entries -= len(rows)
+        self._bytes -= sum(size for _, size in rows)
+
+
+def _key(route: 'Route') -> str:
+    return json.dumps(route.key)
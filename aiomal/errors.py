@@ -26,3 +26,7 @@ class Forbidden(HTTPException):
 class NotFound(HTTPException):
     """Exception for status code 404"""
 
+
+
+class TooManyRequests(HTTPException):
+    """Exception for status code 429"""
@@ -0,0 +1,71 @@
+from typing import Dict, Iterable, Optional, Union
+
+
+__all__ = [
+    'ANIME_FIELD_PRESETS',
+    'MANGA_FIELD_PRESETS',
+    'USER_FIELD_PRESETS',
+    'FieldsType',
+    'resolve_fields',
+]
+
+
+FieldsType = Optional[Union[str, Iterable[str]]]
+
+
+_MEDIA_MINIMAL = 'id,title,main_picture'
+_MEDIA_LIST = 'id,title,main_picture,alternative_titles,start_date,end_date,synopsis,mean,rank,popularity,num_list_users,nsfw,created_at,updated_at,media_type,status,genres,my_list_status'
+
+
+ANIME_FIELD_PRESETS: Dict[str, str] = {
+    'minimal': _MEDIA_MINIMAL,
+    # Exactly the fields read by AnimeForList
+    'list': _MEDIA_LIST + ',num_episodes,start_season,broadcast,source,average_episode_duration,rating,studios',
+    'full': _MEDIA_LIST + ',num_scoring_users,num_episodes,start_season,broadcast,source,average_episode_duration,rating,pictures,background,related_anime,related_manga,recommendations,studios,statistics',
+}
+
+MANGA_FIELD_PRESETS: Dict[str, str] = {
+    'minimal': _MEDIA_MINIMAL,
+    # Exactly the fields read by MangaForList
+    'list': _MEDIA_LIST + ',num_volumes,num_chapters,authors{first_name,last_name}',
+    'full': _MEDIA_LIST + ',num_scoring_users,num_volumes,num_chapters,authors{first_name,last_name},pictures,background,related_anime,related_manga,recommendations,serialization{name}',
+}
+
+USER_FIELD_PRESETS: Dict[str, str] = {
+    'minimal': 'id,name,picture',
+    'list': 'id,name,picture,gender,birthday,location,joined_at,time_zone,is_supporter',
+    'full': 'id,name,picture,gender,birthday,location,joined_at,anime_statistics,time_zone,is_supporter',
+}
+
+
+def resolve_fields(presets: Dict[str, str], fields: FieldsType, default: Optional[str] = None) -> Optional[str]:
+    """Turns a field selection into the ``fields`` query parameter
+
+    Parameters
+    -----------
+    presets: Dict[:class:`str`, :class:`str`]
+        The presets to look preset names up in
+
+    fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+        Either the name of a preset (minimal, list, full), a raw comma separated
+        field string or an iterable of field names
+
+    default: Optional[:class:`str`]
+        The preset used when ``fields`` is None. If this is also None, no
+        ``fields`` parameter is sent and MAL returns its default fields
+
+    Returns
+    --------
+    Optional[:class:`str`]
+        The value for the ``fields`` query parameter
+    """
+    if fields is None:
+        if default is None:
+            return None
+
+        fields = default
+
+    if isinstance(fields, str):
+        return presets.get(fields, fields)
+
+    return ','.join(fields)
@@ -1,27 +1,96 @@
 import asyncio
-from re import sub
-
-from typing import Any, ClassVar, Dict, Optional, Tuple
-from urllib.parse import urljoin, urlencode
+import contextlib
+import functools
+import re
+import time
+from hashlib import sha256
+from string import Formatter
+from typing import Any, AsyncIterator, ClassVar, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit
 
 import aiohttp
 
-from .errors import HTTPException, BadRequest, Unauthorized, Forbidden, NotFound
+from . import jsonlib
+from .cache import ResponseCache
+from .diskcache import CachedResponse, DiskCache
+from .errors import HTTPException, BadRequest, Unauthorized, Forbidden, NotFound, TooManyRequests
+from .fields import ANIME_FIELD_PRESETS, MANGA_FIELD_PRESETS, USER_FIELD_PRESETS, FieldsType, resolve_fields
+from .instrumentation import Instrument, _RequestTrace, _current_trace, _last_route, _make_trace_config
+from .jsonlib import JSONLoads
+from .pool import ClientIdPool, PooledClientId
+from .ratelimit import RateLimiter, parse_retry_after
+from .retry import RetryPolicy
 from .secrets import get_new_code_verifier
+from .streaming import PageStream
+from .transport import Transport
 
 
 class Route:
     V1_BASE: ClassVar[str] = 'https://myanimelist.net/v1'
     V2_BASE: ClassVar[str] = 'https://api.myanimelist.net/v2'
     USER_AGENT: ClassVar[str] = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 11.0) AppleWebKit/602.1.50 (KHTML, like Gecko) Version/11.0 Safari/602.1.50'
+    # Every path template seen, to find the template of a route made from a URL
+    _templates: ClassVar[Dict[str, Pattern[str]]] = {}
+
+    #: Methods that have the same effect however many times they are sent
+    IDEMPOTENT_METHODS: ClassVar[FrozenSet[str]] = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'})
 
-    def __init__(self, method: str, path: str, version: int = 2, content_type='application/json', **parameters: Any) -> None:
+    def __init__(self, method: str, path: str, version: int = 2, content_type='application/json', idempotent: Optional[bool] = None, **parameters: Any) -> None:
         self.method = method
-        self.path = path
+        self.idempotent = method in self.IDEMPOTENT_METHODS if idempotent is None else idempotent
+        self.template = path
         self.version = version
         self.content_type = content_type
+        self.access_token: Optional[str] = parameters.pop('access_token', None)
+
+        # Parameters named in the path template are formatted into it, the rest go in the query
+        path_keys = [key for _, key, _, _ in Formatter().parse(path) if key]
+        if path not in self._templates:
+            pattern = ''.join(re.escape(literal) + (f'(?P<{key}>[^/]+)' if key else '') for literal, key, _, _ in Formatter().parse(path))
+            self._templates[path] = re.compile(pattern)
+
+        self.path = path.format_map({key: quote(str(parameters.pop(key)), safe='@') for key in path_keys})
         self.parameters = {k: v for k, v in parameters.items() if v is not None}
-        
+
+    @property
+    def scope(self) -> str:
+        """An opaque identifier of the token the route is requested with"""
+        return self.scope_of(self.access_token)
+
+    @staticmethod
+    def scope_of(access_token: Optional[str]) -> str:
+        if access_token is None:
+            return ''
+
+        return sha256(access_token.encode()).hexdigest()
+
+    @property
+    def key(self) -> Tuple[str, str, Tuple[Tuple[str, str], ...], str]:
+        """Identifies the response of this route, used for caching"""
+        parameters = tuple(sorted((k, str(v)) for k, v in self.parameters.items()))
+        return self.method, self.path, parameters, self.scope
+
+    @classmethod
+    def from_url(cls, method: str, url: str, **parameters: Any) -> 'Route':
+        """Makes a route from a full API URL, such as a ``paging.next`` link"""
+        split = urlsplit(url)
+        if url.startswith(cls.V1_BASE):
+            version, prefix = 1, urlsplit(cls.V1_BASE).path
+        else:
+            version, prefix = 2, urlsplit(cls.V2_BASE).path
+
+        path = split.path[len(prefix):] if split.path.startswith(prefix) else split.path
+        query = dict(parse_qsl(split.query))
+        if path not in cls._templates:
+            # Made from the template of the first page, so the route is labelled by it
+            for template, pattern in cls._templates.items():
+                match = pattern.fullmatch(path)
+                if match is not None:
+                    path_parameters = {key: unquote(value) for key, value in match.groupdict().items()}
+                    return cls(method, template, version=version, **path_parameters, **query, **parameters)
+
+        return cls(method, path, version=version, **query, **parameters)
+
     @property
     def url(self) -> str:
         if self.version == 1:
@@ -30,9 +99,20 @@ class Route:
             base = self.V2_BASE
             
         url = base + self.path
+        if self.form is not None:
+            return url
+
         parameters = urlencode(self.parameters)
         return '{}?{}'.format(url, parameters)
 
+    @property
+    def form(self) -> Optional[Dict[str, Any]]:
+        """The parameters of a form encoded route, sent as its body instead of its query"""
+        if self.content_type != 'application/x-www-form-urlencoded':
+            return None
+
+        return self.parameters
+
     @property
     def headers(self) -> Dict[str, str]:
         head = {
@@ -40,75 +120,621 @@ class Route:
             'User-Agent': self.USER_AGENT,
         }
         
-        try:
-            access_token = self.parameters.pop('access_token')
-            head['Authorization'] = f'Bearer {access_token}'
-        except KeyError:
-            pass
+        if self.access_token is not None:
+            head['Authorization'] = f'Bearer {self.access_token}'
 
         return head
 
 
+class PoolStats(NamedTuple):
+    limit: int
+    limit_per_host: int
+    in_use: int
+    idle: int
+    waiting: int
+
+
+class _Response(NamedTuple):
+    data: Any
+    body: bytes
+    status: int
+    headers: Mapping[str, str]
+
 
 class HTTPClient:
-    ANIME_FIELDS: ClassVar[str] = 'id,title,main_picture,alternative_titles,start_date,end_date,synopsis,mean,rank,popularity,num_list_users,num_scoring_users,nsfw,created_at,updated_at,media_type,status,genres,my_list_status,num_episodes,start_season,broadcast,source,average_episode_duration,rating,pictures,background,related_anime,related_manga,recommendations,studios,statistics'
-    MANGA_FIELDS: ClassVar[str] = 'id,title,main_picture,alternative_titles,start_date,end_date,synopsis,mean,rank,popularity,num_list_users,num_scoring_users,nsfw,created_at,updated_at,media_type,status,genres,my_list_status,num_volumes,num_chapters,authors{first_name,last_name},pictures,background,related_anime,related_manga,recommendations,serialization{name}'
-    USER_FIELDS: ClassVar[str] = 'id,name,picture,gender,birthday,location,joined_at,anime_statistics,time_zone,is_supporter'
+    ANIME_FIELDS: ClassVar[str] = ANIME_FIELD_PRESETS['full']
+    MANGA_FIELDS: ClassVar[str] = MANGA_FIELD_PRESETS['full']
+    USER_FIELDS: ClassVar[str] = USER_FIELD_PRESETS['full']
 
-    def __init__(self, client_id: str, client_secret: str) -> None:
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        global_rate_limiter: Optional[RateLimiter] = None,
+        connection_limit: int = 100,
+        connection_limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        dns_cache_ttl: Optional[int] = 10,
+        prewarm_connections: int = 0,
+        json_loads: Optional[JSONLoads] = None,
+        disk_cache: Optional[DiskCache] = None,
+        client_id_pool: Optional[ClientIdPool] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        instruments: Iterable[Instrument] = (),
+        transport: Optional[Transport] = None
+    ) -> None:
         self.client_id = client_id
         self.client_secret = client_secret
-        self.session = aiohttp.ClientSession()
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.global_rate_limiter = global_rate_limiter
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.prewarm_connections = prewarm_connections
+        self.json_loads: JSONLoads = json_loads or jsonlib.loads
+        self.disk_cache = disk_cache
+        self.client_id_pool = client_id_pool
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.instruments: Tuple[Instrument, ...] = tuple(instruments)
+        self.transport = transport
+        self.coalesced = 0
+        self._inflight: Dict[Hashable, asyncio.Future[Any]] = {}
+        # Bumped by every write of a token scope, GETs that overlap a write aren't cached
+        self._generations: Dict[str, int] = {}
+        self._refreshes: Dict[str, asyncio.Future[Any]] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._pending = 0
+        self._drained: Optional[asyncio.Event] = None
+        self._closing = False
+        self._closed = False
+
+    async def __aenter__(self) -> 'HTTPClient':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._closed or self._closing:
+            raise RuntimeError('HTTPClient is closed')
+
+        # The connector binds to the running loop, so the session can only be made inside of it
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=self.dns_cache_ttl is not None
+            )
+            # The timings of instrumented requests come from aiohttp's tracing
+            trace_configs = [_make_trace_config()] if self.instruments else None
+            self._session = aiohttp.ClientSession(connector=connector, trace_configs=trace_configs)
 
-    def __del__(self):
+        return self._session
+
+    @property
+    def _requester(self) -> Any:
+        # Requests go through the transport when there is one, the session otherwise
+        if self.transport is None:
+            return self.session
+
+        if self._closed or self._closing:
+            raise RuntimeError('HTTPClient is closed')
+
+        return self.transport
+
+    async def start(self) -> None:
+        """Opens the session on the running loop and pre-warms ``prewarm_connections`` connections
+
+        Calling this is optional, the session is otherwise opened by the first request.
+        """
+        self._closed = False
+        self.session  # Creates the session on the running loop
+        if self.prewarm_connections:
+            await self.prewarm()
+
+    async def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Stops accepting requests, waits for the in-flight ones and closes the session
+
+        Parameters
+        -----------
+        timeout: Optional[:class:`float`]
+            How long, in seconds, to wait for in-flight requests before closing the
+            session under them. None waits for as long as they take. Defaults to 10.
+        """
+        if self._closed:
+            return
+
+        self._closing = True
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(self.session.close())
-            else:
-                loop.run_until_complete(self.session.close())
-        except:
-            pass
+            if self._pending:
+                self._drained = asyncio.Event()
+                try:
+                    await asyncio.wait_for(self._drained.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+
+            if self.disk_cache is not None:
+                await self.disk_cache.close()
+
+            if self.transport is not None:
+                await self.transport.close()
+        finally:
+            self._drained = None
+            self._closing = False
+            self._closed = True
+
+    @contextlib.contextmanager
+    def _track(self) -> Iterator[None]:
+        # Counts in-flight requests so close() can wait for them
+        self._pending += 1
+        try:
+            yield
+        finally:
+            self._pending -= 1
+            if not self._pending and self._drained is not None:
+                self._drained.set()
+
+    @property
+    def pool_stats(self) -> PoolStats:
+        """The usage of the connection pool"""
+        connector = self._session.connector if self._session is not None else None
+        if connector is None or connector.closed:
+            return PoolStats(self.connection_limit, self.connection_limit_per_host, 0, 0, 0)
+
+        # aiohttp has no public API for these, fall back to zero if its internals change
+        acquired = getattr(connector, '_acquired', ())
+        idle = getattr(connector, '_conns', {})
+        waiters = getattr(connector, '_waiters', {})
+        return PoolStats(
+            connector.limit,
+            connector.limit_per_host,
+            len(acquired),
+            sum(len(conns) for conns in idle.values()),
+            sum(len(waiting) for waiting in waiters.values())
+        )
+
+    async def prewarm(self, connections: Optional[int] = None) -> int:
+        """Opens connections to the API ahead of time so the first requests skip the TCP and TLS handshakes
+
+        Parameters
+        -----------
+        connections: Optional[:class:`int`]
+            The amount of connections to open. Defaults to ``prewarm_connections``.
+
+        Returns
+        --------
+        :class:`int`
+            The amount of connections that were opened
+        """
+        if connections is None:
+            connections = self.prewarm_connections
+
+        if self.transport is not None:
+            # The transport manages its own connections, if it has any
+            return 0
+
+        session = self.session
+
+        async def open_connection() -> bool:
+            try:
+                async with session.get(Route.V2_BASE, headers={'User-Agent': Route.USER_AGENT}) as response:
+                    await response.read()
+                    return True
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return False
+
+        opened = await asyncio.gather(*(open_connection() for _ in range(connections)))
+        return sum(opened)
 
     def generate_auth_url(self) -> Tuple[str, str]:
         code_challenge = get_new_code_verifier()
         url = f'https://myanimelist.net/v1/oauth2/authorize?response_type=code&client_id={self.client_id}&code_challenge={code_challenge}'
         return code_challenge, url
 
-    async def request(self, route: Route):
+    async def request(self, route: Route, use_cache: bool = True):
+        if not self.instruments:
+            return await self._dispatch(route, use_cache)
+
+        method, template = route.method, route.template
+        for instrument in self.instruments:
+            instrument.request_started(method, template)
+
+        trace = _RequestTrace(method, template, 'miss' if method == 'GET' else None)
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+        try:
+            data = await self._dispatch(route, use_cache)
+        except BaseException as e:
+            event = trace.event(time.perf_counter() - start, e)
+            for instrument in self.instruments:
+                instrument.request_failed(event)
+
+            raise
+        finally:
+            _current_trace.reset(token)
+            _last_route.set((method, template))
+
+        event = trace.event(time.perf_counter() - start)
+        for instrument in self.instruments:
+            instrument.request_finished(event)
+
+        return data
+
+    @contextlib.contextmanager
+    def building(self, model: str, count: int = 1, route: Optional[Tuple[str, str]] = None) -> Iterator[None]:
+        """Reports the time spent making objects from the last response of this context to the instruments
+
+        Responses fetched in other tasks, like the windows of a bulk call, don't set the
+        last route of this context. Their method and route template are passed as ``route``.
+        """
+        if not self.instruments:
+            yield
+            return
+
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        method, template = route or _last_route.get()
+        for instrument in self.instruments:
+            instrument.model_built(method, template, model, count, seconds)
+
+    async def _dispatch(self, route: Route, use_cache: bool = True):
+        trace = _current_trace.get()
+        if route.method != 'GET':
+            response = await self._request(route)
+            scope = route.scope
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+            # Requests already in flight may have read the old state, new readers don't join them
+            for key in [key for key in self._inflight if key[-1] == scope]:
+                del self._inflight[key]
+
+            if self.cache is not None:
+                self.cache.invalidate(route)
+            if self.disk_cache is not None:
+                await self.disk_cache.invalidate(route)
+
+            return response.data
+
+        # Bypassing the caches still refreshes them with the response
+        if self.cache is not None and use_cache:
+            data = self.cache.get(route)
+            if data is not None:
+                if trace is not None:
+                    trace.cache = 'hit'
+
+                return data
+
+        # Identical GETs in flight at the same time share one request
+        key = route.key
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._get(route, use_cache))
+            task.add_done_callback(functools.partial(self._task_done, self._inflight, key))
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+            if trace is not None:
+                trace.cache = 'coalesced'
+
+        # Shielded so cancelling one waiter doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _get(self, route: Route, use_cache: bool = True):
+        scope = route.scope
+        generation = self._generations.get(scope, 0)
+        cached = None
+        if self.disk_cache is not None:
+            cached = await self.disk_cache.get(route)
+            if cached is not None and cached.fresh and use_cache:
+                trace = _current_trace.get()
+                if trace is not None:
+                    trace.cache = 'disk'
+
+                data = self.json_loads(cached.body)
+                if self.cache is not None and self._generations.get(scope, 0) == generation:
+                    self.cache.set(route, data, len(cached.body))
+
+                return data
+
+        response = await self._request(route, cached)
+        if self._generations.get(scope, 0) != generation:
+            # A write of the scope happened while the response was on its way, it may be stale
+            return response.data
+
+        if self.disk_cache is not None:
+            if response.status == 304:
+                trace = _current_trace.get()
+                if trace is not None:
+                    trace.cache = 'revalidated'
+
+                await self.disk_cache.refresh(route, response.headers)
+            else:
+                await self.disk_cache.set(route, response.body, response.headers)
+
+        # Checked again, a write may have come in while the disk cache was written
+        if self.cache is not None and self._generations.get(scope, 0) == generation:
+            self.cache.set(route, response.data, len(response.body))
+
+        return response.data
+
+    def _task_done(self, tasks: Dict[Hashable, 'asyncio.Future[Any]'], key: Hashable, task: 'asyncio.Future[Any]') -> None:
+        if tasks.get(key) is task:
+            del tasks[key]
+
+        # Every waiter may have been cancelled, in which case nobody retrieves the exception
+        if not task.cancelled():
+            task.exception()
+
+    async def _request(self, route: Route, cached: Optional[CachedResponse] = None) -> _Response:
+        session = self._requester
+        with self._track():
+            return await self._send(session, route, cached)
+
+    async def _send(self, session: Any, route: Route, cached: Optional[CachedResponse] = None) -> _Response:
         headers = route.headers
+        if cached is not None:
+            # Revalidates the stored response instead of downloading it again
+            headers.update(cached.validators)
+
         method = route.method
         url = route.url
-        
-        for tries in range(5):
+        policy = self.retry_policy
+        deadline = policy.start()
+        trace = _current_trace.get()
+        attempt = 0
+        # Whether an earlier attempt may have been carried out by MAL without us hearing of it
+        maybe_applied = False
+
+        while True:
+            attempt += 1
+            if trace is None:
+                credential, limiters = await self._acquire(route, headers)
+            else:
+                trace.attempts = attempt
+                start = time.perf_counter()
+                credential, limiters = await self._acquire(route, headers)
+                trace.queue += time.perf_counter() - start
+
+            timeout = policy.timeout(deadline)
             try:
-                async with self.session.request(method, url, headers=headers) as response:
-                    data = await response.json()
+                async with session.request(method, url, headers=headers, data=route.form, timeout=timeout, trace_request_ctx=trace) as response:
+                    if trace is not None:
+                        trace.status = response.status
 
-                    if 300 > response.status >= 200:
-                        return data
-                    
-                    # An error occurred
-                    error, message = data['error'], data['message']
-                    if response.status == 400:
-                        raise BadRequest(response, error, message)
-                    elif response.status == 401:
-                        raise Unauthorized(response, error, message)
-                    elif response.status == 403:
-                        raise Forbidden(response, error, message)
-                    elif response.status == 404:
-                        raise NotFound(response, error, message)
+                    if response.status == 304 and cached is not None:
+                        for limiter in limiters:
+                            limiter.succeeded()
+
+                        return _Response(self.json_loads(cached.body), cached.body, 304, response.headers)
+
+                    if trace is None:
+                        body = await response.read()
                     else:
-                        raise HTTPException(response, error, message)
-            except OSError as e:
-                # Connection reset by peer
-                if tries < 4 and e.errno in {54, 10054}:
-                    await asyncio.sleep(1 + tries * 2)
-                    continue
+                        start = time.perf_counter()
+                        body = await response.read()
+                        trace.bytes += len(body)
+                        trace.body += time.perf_counter() - start
+                        start = time.perf_counter()
+
+                    try:
+                        data = self.json_loads(body) if body else None
+                    except ValueError:
+                        # Throttling and gateway errors don't always come with a JSON body
+                        data = None
+
+                    if trace is not None:
+                        trace.decode += time.perf_counter() - start
+
+                    if 300 > response.status >= 200:
+                        for limiter in limiters:
+                            limiter.succeeded()
+
+                        return _Response(data, body, response.status, response.headers)
+
+                    if response.status == 404 and method == 'DELETE' and maybe_applied:
+                        # The item is gone, most likely deleted by the attempt that failed
+                        for limiter in limiters:
+                            limiter.succeeded()
+
+                        return _Response(data, body, response.status, response.headers)
 
-                raise
+                    if response.status >= 500:
+                        maybe_applied = True
+                        if credential is not None:
+                            credential.failed()
+
+                    delay = self._retry_delay(route, response, limiters, attempt, deadline)
+                    if delay is None:
+                        raise self._error(response, data)
+            except (OSError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if credential is not None:
+                    credential.failed()
+
+                delay = policy.delay(attempt)
+                if not (policy.retries_exception(e, route.idempotent) and policy.allows(attempt, delay, deadline)):
+                    raise
+
+                maybe_applied = maybe_applied or not isinstance(e, policy.UNSENT_EXCEPTIONS)
+
+            if trace is not None:
+                trace.backoff += delay
+
+            await asyncio.sleep(delay)
+
+    def _retry_delay(self, route: Route, response: aiohttp.ClientResponse, limiters: List[Any], attempt: int, deadline: Optional[float]) -> Optional[float]:
+        # Returns how long to wait before retrying a failed response, None if it isn't retried
+        policy = self.retry_policy
+        if response.status == 429 or (response.status == 403 and 'Retry-After' in response.headers):
+            # A throttled request was never processed, so it is retried whatever its method
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            for limiter in limiters:
+                limiter.throttled(retry_after)
+
+            if limiters:
+                # The limiters hold the next attempt back themselves
+                delay = 0.0
+            else:
+                delay = retry_after if retry_after is not None else policy.delay(attempt)
+        elif policy.retries_status(response.status, route.idempotent):
+            delay = policy.delay(attempt)
+        else:
+            return None
+
+        return delay if policy.allows(attempt, delay, deadline) else None
+
+    async def _acquire(self, route: Route, headers: Dict[str, str]) -> Tuple[Optional[PooledClientId], List[Any]]:
+        # Waits for the rate limiters, returning every one that must hear how the request went
+        limiters = [limiter for limiter in (self.rate_limiter, self.global_rate_limiter) if limiter is not None]
+        for limiter in limiters:
+            await limiter.acquire()
+
+        # Requests without a user's token are authenticated with a client ID, from the pool if there is one.
+        # The OAuth endpoints authenticate with the client ID and secret of the form instead
+        if route.access_token is not None or route.version == 1:
+            return None, limiters
+
+        if self.client_id_pool is None:
+            headers['X-MAL-CLIENT-ID'] = self.client_id
+            return None, limiters
+
+        credential = await self.client_id_pool.acquire()
+        headers['X-MAL-CLIENT-ID'] = credential.client_id
+        return credential, [credential, *limiters]
+
+    def _error(self, response: aiohttp.ClientResponse, data: Any) -> HTTPException:
+        data = data if isinstance(data, dict) else {}
+        error, message = data.get('error', response.reason), data.get('message', '')
+        if response.status == 400:
+            return BadRequest(response, error, message)
+        elif response.status == 401:
+            return Unauthorized(response, error, message)
+        elif response.status == 403:
+            return Forbidden(response, error, message)
+        elif response.status == 404:
+            return NotFound(response, error, message)
+        elif response.status == 429:
+            return TooManyRequests(response, error, message)
+        else:
+            return HTTPException(response, error, message)
+
+    def stream(self, route: Route) -> PageStream:
+        """Returns the items of the route's ``data`` array as they are downloaded
+
+        Streamed responses bypass the caches and aren't shared with identical requests.
+        Their events last until the page was read, as the body is read by the caller.
+        """
+        trace = _RequestTrace(route.method, route.template, 'miss') if self.instruments else None
+        return PageStream(functools.partial(self._open_stream, route, trace), self.json_loads, trace)
+
+    async def _open_stream(self, route: Route, trace: Optional[_RequestTrace] = None) -> AsyncIterator[aiohttp.ClientResponse]:
+        # Yields the successful response once, the body is read by the caller. The errors
+        # of the download are thrown back in at the yield, so they are reported
+        if trace is not None:
+            for instrument in self.instruments:
+                instrument.request_started(route.method, route.template)
+
+        session = self._requester
+        headers = route.headers
+        policy = self.retry_policy
+        deadline = policy.start()
+        attempt = 0
+        streaming = False
+        start = time.perf_counter()
+        try:
+            with self._track():
+                while True:
+                    attempt += 1
+                    queued_at = time.perf_counter()
+                    credential, limiters = await self._acquire(route, headers)
+                    if trace is not None:
+                        trace.attempts = attempt
+                        trace.queue += time.perf_counter() - queued_at
+
+                    # The deadline also bounds the download of the body
+                    timeout = policy.timeout(deadline)
+                    try:
+                        async with session.request(route.method, route.url, headers=headers, timeout=timeout, trace_request_ctx=trace) as response:
+                            if trace is not None:
+                                trace.status = response.status
+
+                            if 300 > response.status >= 200:
+                                for limiter in limiters:
+                                    limiter.succeeded()
+
+                                streaming = True
+                                yield response
+                                self._report_stream(trace, start)
+                                return
+
+                            body = await response.read()
+                            try:
+                                data = self.json_loads(body) if body else None
+                            except ValueError:
+                                data = None
+
+                            if credential is not None and response.status >= 500:
+                                credential.failed()
+
+                            delay = self._retry_delay(route, response, limiters, attempt, deadline)
+                            if delay is None:
+                                raise self._error(response, data)
+                    except (OSError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        # A page already handed to the caller can't be sent again
+                        if streaming:
+                            raise
+
+                        if credential is not None:
+                            credential.failed()
+
+                        delay = policy.delay(attempt)
+                        if not (policy.retries_exception(e, route.idempotent) and policy.allows(attempt, delay, deadline)):
+                            raise
+
+                    if trace is not None:
+                        trace.backoff += delay
+
+                    await asyncio.sleep(delay)
+        except GeneratorExit:
+            # The caller stopped reading the page early
+            self._report_stream(trace, start)
+            raise
+        except BaseException as e:
+            self._report_stream(trace, start, e)
+            raise
+
+    def _report_stream(self, trace: Optional[_RequestTrace], start: float, error: Optional[BaseException] = None) -> None:
+        if trace is None:
+            return
+
+        event = trace.event(time.perf_counter() - start, error)
+        for instrument in self.instruments:
+            if error is None:
+                instrument.request_finished(event)
+            else:
+                instrument.request_failed(event)
 
     async def generate_access_token(self, auth_code: str, code_verifier: str) -> Tuple[str, str]:
+        data = await self.exchange_code(auth_code, code_verifier)
+        return data['access_token'], data['refresh_token']
+
+    async def exchange_code(self, auth_code: str, code_verifier: str) -> Dict[str, Any]:
+        """Trades an auth code for a token pair, returning MAL's whole response with its ``expires_in``"""
         route = Route(
             'POST',
             '/oauth2/token',
@@ -121,69 +747,119 @@ class HTTPClient:
             grant_type='authorization_code'
         )
 
-        # TODO: Figure out why the self.request method isn't working with this
-        # Something about the grant_type not being right
-        # Do this after all features are sorted
-        async with self.session.post(route.url, data=route.parameters) as response:
-            data = await response.json()
-            return data['access_token'], data['refresh_token']
+        # An auth code can only be used once, it is only retried when it was never sent
+        response = await self._request(route)
+        return response.data
+
+    async def refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
+        """Trades a refresh token for a new token pair
+
+        Concurrent refreshes of the same token share one request, a refresh token can
+        only be used once.
+        """
+        task = self._refreshes.get(refresh_token)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh_access_token(refresh_token))
+            task.add_done_callback(functools.partial(self._task_done, self._refreshes, refresh_token))
+            self._refreshes[refresh_token] = task
+
+        return await asyncio.shield(task)
+
+    async def rescope(self, old_access_token: str, new_access_token: str) -> None:
+        """Moves the cached responses of an access token to the token that replaced it
+
+        Cached responses are scoped to the token they were requested with. Without this,
+        the responses of a refreshed token could no longer be reached nor invalidated.
+        """
+        old, new = Route.scope_of(old_access_token), Route.scope_of(new_access_token)
+        if self.cache is not None:
+            self.cache.rescope(old, new)
+        if self.disk_cache is not None:
+            await self.disk_cache.rescope(old, new)
+
+    async def _refresh_access_token(self, refresh_token: str) -> Dict[str, Any]:
+        route = Route(
+            'POST',
+            '/oauth2/token',
+            version=1,
+            content_type='application/x-www-form-urlencoded',
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+            grant_type='refresh_token',
+            refresh_token=refresh_token
+        )
+
+        # Waits for the rate limiters and is retried like other requests. A refresh token
+        # can only be used once, so being a POST it is only retried when it was never sent
+        response = await self._request(route)
+        return response.data
+
+    async def get_page(self, access_token: str, url: str, use_cache: bool = True, stream: bool = False):
+        route = Route.from_url('GET', url, access_token=access_token)
+        if stream:
+            return self.stream(route)
+
+        return await self.request(route, use_cache)
 
-    async def get_anime(self, access_token: str, query: str, limit: int = 100, offset: int = 0):
+    async def get_anime(self, access_token: str, query: str, limit: int = 100, offset: int = 0, fields: FieldsType = None):
         route = Route(
             'GET',
             '/anime',
             q=query,
             limit=min(limit, 100),
             offset=offset,
-            fields=self.ANIME_FIELDS,
+            fields=resolve_fields(ANIME_FIELD_PRESETS, fields, 'list'),
             access_token=access_token
         )
 
         return await self.request(route)
 
-    async def get_anime_details(self, access_token: str, anime_id: int):
+    async def get_anime_details(self, access_token: str, anime_id: int, fields: FieldsType = None):
         route = Route(
             'GET',
-            f'/anime/{anime_id}',
-            fields=self.ANIME_FIELDS,
+            '/anime/{anime_id}',
+            anime_id=anime_id,
+            fields=resolve_fields(ANIME_FIELD_PRESETS, fields, 'full'),
             access_token=access_token
         )
 
         return await self.request(route)
 
-    async def get_anime_ranking(self, access_token: str, ranking_type: str, limit: int = 100, offset: int = 0):
+    async def get_anime_ranking(self, access_token: str, ranking_type: str, limit: int = 100, offset: int = 0, fields: FieldsType = None):
         route = Route(
             'GET',
             '/anime/ranking',
             ranking_type=ranking_type,
             limit=min(limit, 500),
             offset=offset,
-            fields=self.ANIME_FIELDS,
+            fields=resolve_fields(ANIME_FIELD_PRESETS, fields, 'list'),
             access_token=access_token
         )
 
         return await self.request(route)
 
-    async def get_seasonal_anime(self, access_token: str, year: int, season: str, sort: str = 'anime_score', limit: int = 100, offset: int = 0):
+    async def get_seasonal_anime(self, access_token: str, year: int, season: str, sort: str = 'anime_score', limit: int = 100, offset: int = 0, fields: FieldsType = None):
         route = Route(
             'GET',
-            f'/anime/season/{year}/{season}',
+            '/anime/season/{year}/{season}',
+            year=year,
+            season=season,
             sort=sort,
             limit=min(limit, 500),
             offset=offset,
-            fields=self.ANIME_FIELDS,
+            fields=resolve_fields(ANIME_FIELD_PRESETS, fields, 'list'),
             access_token=access_token
         )
 
         return await self.request(route)
 
-    async def get_suggested_anime(self, access_token: str, limit: int = 100, offset: int = 0):
+    async def get_suggested_anime(self, access_token: str, limit: int = 100, offset: int = 0, fields: FieldsType = None):
         route = Route(
             'GET',
             '/anime/suggestions',
             limit=min(limit, 100),
             offset=offset,
-            fields=self.ANIME_FIELDS,
+            fields=resolve_fields(ANIME_FIELD_PRESETS, fields, 'list'),
             access_token=access_token
         )
 
@@ -192,7 +868,10 @@ class HTTPClient:
     async def update_anime_list_status(self, access_token: str, anime_id: int, **parameters):
         route = Route(
             'PATCH',
-            f'/anime/{anime_id}/my_list_status',
+            '/anime/{anime_id}/my_list_status',
+            # Every field is set to an absolute value, sending it twice changes nothing
+            idempotent=True,
+            anime_id=anime_id,
             access_token=access_token,
             **parameters
         )
@@ -202,13 +881,14 @@ class HTTPClient:
     async def delete_anime_list_item(self, access_token: str, anime_id: int):
         route = Route(
             'DELETE',
-            f'/anime/{anime_id}/my_list_status',
+            '/anime/{anime_id}/my_list_status',
+            anime_id=anime_id,
             access_token=access_token
         )
 
         return await self.request(route)
 
-    async def get_user_anime_list(self, access_token: str, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 100, offset: int = 0):
+    async def get_user_anime_list(self, access_token: str, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 100, offset: int = 0, fields: FieldsType = None, use_cache: bool = True, stream: bool = False):
         parameters = {
             'sort': sort,
             'limit': min(limit, 1000),
@@ -218,14 +898,21 @@ class HTTPClient:
         if status:
             parameters['status'] = status
 
+        if fields is not None:
+            parameters['fields'] = resolve_fields(ANIME_FIELD_PRESETS, fields)
+
         route = Route(
             'GET',
-            f'/users/{user_name}/animelist',
+            '/users/{user_name}/animelist',
+            user_name=user_name,
             access_token=access_token,
             **parameters
         )
 
-        return await self.request(route)
+        if stream:
+            return self.stream(route)
+
+        return await self.request(route, use_cache)
 
     async def get_forum_boards(self, access_token: str):
         route = Route(
@@ -239,7 +926,8 @@ class HTTPClient:
     async def get_forum_topic_detail(self, access_token: str, topic_id: int):
         route = Route(
             'GET',
-            f'/forum/topic/{topic_id}',
+            '/forum/topic/{topic_id}',
+            topic_id=topic_id,
             access_token=access_token
         )
 
@@ -262,29 +950,31 @@ class HTTPClient:
 
         return await self.request(route)
 
-    async def get_manga(self, access_token: str, query: str, limit: int = 100, offset: int = 0):
+    async def get_manga(self, access_token: str, query: str, limit: int = 100, offset: int = 0, fields: FieldsType = None):
         route = Route(
             'GET',
             '/manga',
             access_token=access_token,
             q=query,
             limit=min(100, limit),
-            fields=self.MANGA_FIELDS
+            offset=offset,
+            fields=resolve_fields(MANGA_FIELD_PRESETS, fields, 'list')
         )
 
         return await self.request(route)
 
-    async def get_manga_details(self, access_token: str, manga_id: int):
+    async def get_manga_details(self, access_token: str, manga_id: int, fields: FieldsType = None):
         route = Route(
             'GET',
-            f'/manga/{manga_id}',
+            '/manga/{manga_id}',
+            manga_id=manga_id,
             access_token=access_token,
-            fields=self.MANGA_FIELDS
+            fields=resolve_fields(MANGA_FIELD_PRESETS, fields, 'full')
         )
 
         return await self.request(route)
 
-    async def get_manga_ranking(self, access_token: str, ranking_type: str = 'all', limit: int = 100, offset: int = 0):
+    async def get_manga_ranking(self, access_token: str, ranking_type: str = 'all', limit: int = 100, offset: int = 0, fields: FieldsType = None):
         route = Route(
             'GET',
             '/manga/ranking',
@@ -292,7 +982,7 @@ class HTTPClient:
             ranking_type=ranking_type,
             limit=min(limit, 500),
             offset=offset,
-            fields=self.MANGA_FIELDS
+            fields=resolve_fields(MANGA_FIELD_PRESETS, fields, 'list')
         )
 
         return await self.request(route)
@@ -300,7 +990,10 @@ class HTTPClient:
     async def update_manga_list_status(self, access_token: str, manga_id: int, **parameters):
         route = Route(
             'PATCH',
-            f'/manga/{manga_id}/my_list_status',
+            '/manga/{manga_id}/my_list_status',
+            # Every field is set to an absolute value, sending it twice changes nothing
+            idempotent=True,
+            manga_id=manga_id,
             access_token=access_token,
             **parameters
         )
@@ -310,13 +1003,14 @@ class HTTPClient:
     async def delete_manga_list_item(self, access_token: str, manga_id: int):
         route = Route(
             'DELETE',
-            f'/manga/{manga_id}/my_list_status',
+            '/manga/{manga_id}/my_list_status',
+            manga_id=manga_id,
             access_token=access_token
         )
 
         return await self.request(route)
 
-    async def get_user_manga_list(self, access_token: str, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 100, offset: int = 0):
+    async def get_user_manga_list(self, access_token: str, user_name: str = '@me', status: Optional[str] = None, sort: str = 'list_score', limit: int = 100, offset: int = 0, fields: FieldsType = None, use_cache: bool = True, stream: bool = False):
         parameters = {
             'sort': sort,
             'limit': min(limit, 1000),
@@ -326,21 +1020,28 @@ class HTTPClient:
         if status:
             parameters['status'] = status
 
+        if fields is not None:
+            parameters['fields'] = resolve_fields(MANGA_FIELD_PRESETS, fields)
+
         route = Route(
             'GET',
-            f'/users/{user_name}/mangalist',
+            '/users/{user_name}/mangalist',
+            user_name=user_name,
             access_token=access_token,
             **parameters
         )
 
-        return await self.request(route)
+        if stream:
+            return self.stream(route)
+
+        return await self.request(route, use_cache)
 
-    async def get_user_information(self, access_token: str):
+    async def get_user_information(self, access_token: str, fields: FieldsType = None):
         route = Route(
             'GET',
             '/users/@me',
             access_token=access_token,
-            fields=self.USER_FIELDS
+            fields=resolve_fields(USER_FIELD_PRESETS, fields, 'full')
         )
 
         return await self.request(route)
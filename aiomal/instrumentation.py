@@ -0,0 +1,374 @@
+import contextvars
+import time
+from bisect import bisect_left
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import aiohttp
+
+
+__all__ = [
+    'RequestTimings',
+    'RequestEvent',
+    'Instrument',
+    'Histogram',
+    'HistogramCollector',
+]
+
+
+class RequestTimings(NamedTuple):
+    """Where the time of a request went, in seconds, summed over its attempts
+
+    ``queue`` is spent waiting for the rate limiters, the client ID pool and a free
+    connection. ``ttfb`` runs from sending the request to receiving the response
+    headers, without the DNS lookup and the connection setup.
+    """
+    queue: float = 0.0
+    dns: float = 0.0
+    connect: float = 0.0
+    ttfb: float = 0.0
+    body: float = 0.0
+    decode: float = 0.0
+    backoff: float = 0.0
+
+
+class RequestEvent(NamedTuple):
+    """A request finished by :class:`HTTPClient`, passed to every :class:`Instrument`
+
+    ``cache`` is hit, disk, revalidated, coalesced or miss for GETs and None for other
+    methods. A request answered by a cache was never sent and has 0 attempts.
+    """
+    method: str
+    route: str  # The route's template, e.g. /anime/{anime_id}
+    status: Optional[int]
+    error: Optional[BaseException]
+    attempts: int
+    bytes: int
+    cache: Optional[str]
+    timings: RequestTimings
+    duration: float
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - 1)
+
+
+class Instrument:
+    """The interface :class:`HTTPClient` reports to, every hook does nothing by default
+
+    Subclass it and pass instances to :class:`Client` with the ``instruments`` option.
+    Hooks are called on the event loop and must not block.
+    """
+    def request_started(self, method: str, route: str) -> None:
+        """Called before a request is looked up in the caches and sent"""
+
+    def request_finished(self, event: RequestEvent) -> None:
+        """Called once a request returned its data"""
+
+    def request_failed(self, event: RequestEvent) -> None:
+        """Called once a request raised ``event.error``"""
+
+    def model_built(self, method: str, route: str, model: str, count: int, seconds: float) -> None:
+        """Called once the objects of a response were made by :class:`ClientUser`"""
+
+
+class _RequestTrace:
+    # The mutable state of one instrumented request, shared with its aiohttp trace callbacks
+    __slots__ = [
+        'method', 'route', 'status', 'attempts', 'bytes', 'cache',
+        'queue', 'dns', 'connect', 'ttfb', 'body', 'decode', 'backoff',
+        '_sent_at', '_setup', '_queued_at', '_dns_at', '_connect_at', '_connect_dns'
+    ]
+
+    def __init__(self, method: str, route: str, cache: Optional[str]) -> None:
+        self.method = method
+        self.route = route
+        self.status: Optional[int] = None
+        self.attempts = 0
+        self.bytes = 0
+        self.cache = cache
+        self.queue = self.dns = self.connect = self.ttfb = self.body = self.decode = self.backoff = 0.0
+        self._sent_at = self._setup = self._queued_at = self._dns_at = self._connect_at = self._connect_dns = 0.0
+
+    def event(self, duration: float, error: Optional[BaseException] = None) -> RequestEvent:
+        status = self.status
+        response = getattr(error, 'response', None)
+        if response is not None:
+            status = response.status
+
+        timings = RequestTimings(self.queue, self.dns, self.connect, self.ttfb, self.body, self.decode, self.backoff)
+        return RequestEvent(self.method, self.route, status, error, self.attempts, self.bytes, self.cache, timings, duration)
+
+
+#: The trace of the request being made in the current context
+_current_trace: 'contextvars.ContextVar[Optional[_RequestTrace]]' = contextvars.ContextVar('aiomal_request_trace', default=None)
+#: The method and route of the last request made in the current context, labels model builds
+_last_route: 'contextvars.ContextVar[Tuple[str, str]]' = contextvars.ContextVar('aiomal_last_route', default=('', ''))
+
+
+async def _on_request_start(session: Any, context: SimpleNamespace, params: Any) -> None:
+    trace = context.trace_request_ctx
+    if isinstance(trace, _RequestTrace):
+        trace._sent_at = time.perf_counter()
+        trace._setup = 0.0
+
+
+async def _on_connection_queued_start(session: Any, context: SimpleNamespace, params: Any) -> None:
+    trace = context.trace_request_ctx
+    if isinstance(trace, _RequestTrace):
+        trace._queued_at = time.perf_counter()
+
+
+async def _on_connection_queued_end(session: Any, context: SimpleNamespace, params: Any) -> None:
+    trace = context.trace_request_ctx
+    if isinstance(trace, _RequestTrace):
+        elapsed = time.perf_counter() - trace._queued_at
+        trace.queue += elapsed
+        trace._setup += elapsed
+
+
+async def _on_dns_resolvehost_start(session: Any, context: SimpleNamespace, params: Any) -> None:
+    trace = context.trace_request_ctx
+    if isinstance(trace, _RequestTrace):
+        trace._dns_at = time.perf_counter()
+
+
+async def _on_dns_resolvehost_end(session: Any, context: SimpleNamespace, params: Any) -> None:
+    trace = context.trace_request_ctx
+    if isinstance(trace, _RequestTrace):
+        trace.dns += time.perf_counter() - trace._dns_at
+
+
+async def _on_connection_create_start(session: Any, context: SimpleNamespace, params: Any) -> None:
+    trace = context.trace_request_ctx
+    if isinstance(trace, _RequestTrace):
+        trace._connect_at = time.perf_counter()
+        trace._connect_dns = trace.dns
+
+
+async def _on_connection_create_end(session: Any, context: SimpleNamespace, params: Any) -> None:
+    trace = context.trace_request_ctx
+    if isinstance(trace, _RequestTrace):
+        elapsed = time.perf_counter() - trace._connect_at
+        # The DNS lookup happens while the connection is made, it is counted on its own
+        trace.connect += elapsed - (trace.dns - trace._connect_dns)
+        trace._setup += elapsed
+
+
+async def _on_request_end(session: Any, context: SimpleNamespace, params: Any) -> None:
+    # Sent once the response headers arrived
+    trace = context.trace_request_ctx
+    if isinstance(trace, _RequestTrace):
+        trace.ttfb += time.perf_counter() - trace._sent_at - trace._setup
+
+
+def _make_trace_config() -> aiohttp.TraceConfig:
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(_on_request_start)
+    config.on_connection_queued_start.append(_on_connection_queued_start)
+    config.on_connection_queued_end.append(_on_connection_queued_end)
+    config.on_dns_resolvehost_start.append(_on_dns_resolvehost_start)
+    config.on_dns_resolvehost_end.append(_on_dns_resolvehost_end)
+    config.on_connection_create_start.append(_on_connection_create_start)
+    config.on_connection_create_end.append(_on_connection_create_end)
+    config.on_request_end.append(_on_request_end)
+    return config
+
+
+class Histogram:
+    """Counts observed values into cumulative buckets, like a Prometheus histogram
+
+    Parameters
+    -----------
+    buckets: Sequence[:class:`float`]
+        The sorted upper bounds of the buckets, a last unbounded one is added
+    """
+    __slots__ = ['buckets', 'counts', 'count', 'sum']
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimates the q-quantile, interpolating inside its bucket, NaN without observations"""
+        if not self.count:
+            return float('nan')
+
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if index == len(self.buckets):
+                    # Nothing is known above the last bound
+                    return self.buckets[-1]
+
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+
+            seen += count
+
+        return self.buckets[-1]
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = tuple(256 * 4 ** power for power in range(10))  # 256 B to 64 MiB
+PHASES = RequestTimings._fields
+
+
+class HistogramCollector(Instrument):
+    """An :class:`Instrument` keeping in-process histograms and counters per route template
+
+    Requests are labelled by method and route template. Latencies are kept per phase of
+    :class:`RequestTimings`, plus ``total`` for the whole call and ``build`` for making
+    the objects. Phases are only observed for requests that were sent. Requests are
+    counted by status, by exception name when they failed without a response, or as ok
+    when a cache or a coalesced request answered them. Read it with
+    :meth:`snapshot`, or expose :meth:`render` on an endpoint for Prometheus to scrape.
+
+    Parameters
+    -----------
+    latency_buckets: Sequence[:class:`float`]
+        The upper bounds, in seconds, of the latency buckets
+
+    bytes_buckets: Sequence[:class:`float`]
+        The upper bounds of the response size buckets
+    """
+    def __init__(self, latency_buckets: Sequence[float] = LATENCY_BUCKETS, bytes_buckets: Sequence[float] = BYTES_BUCKETS) -> None:
+        self.latency_buckets = tuple(latency_buckets)
+        self.bytes_buckets = tuple(bytes_buckets)
+        self.reset()
+
+    def reset(self) -> None:
+        self.latency: Dict[Tuple[str, str, str], Histogram] = {}
+        self.response_bytes: Dict[Tuple[str, str], Histogram] = {}
+        self.requests: Counter[Tuple[str, str, str]] = Counter()
+        self.retries: Counter[Tuple[str, str]] = Counter()
+        self.cache: Counter[Tuple[str, str, str]] = Counter()
+        self.in_flight: Counter[Tuple[str, str]] = Counter()
+
+    def _observe(self, method: str, route: str, phase: str, value: float) -> None:
+        key = (method, route, phase)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram(self.latency_buckets)
+
+        histogram.observe(value)
+
+    def request_started(self, method: str, route: str) -> None:
+        self.in_flight[method, route] += 1
+
+    def request_finished(self, event: RequestEvent) -> None:
+        self._record(event, str(event.status) if event.status is not None else 'ok')
+
+    def request_failed(self, event: RequestEvent) -> None:
+        self._record(event, str(event.status) if event.status is not None else type(event.error).__name__)
+
+    def _record(self, event: RequestEvent, outcome: str) -> None:
+        method, route = event.method, event.route
+        self.in_flight[method, route] -= 1
+        self.requests[method, route, outcome] += 1
+        self._observe(method, route, 'total', event.duration)
+        if event.cache is not None:
+            self.cache[method, route, event.cache] += 1
+
+        if not event.attempts:
+            return
+
+        self.retries[method, route] += event.retries
+        for phase, value in zip(PHASES, event.timings):
+            self._observe(method, route, phase, value)
+
+        histogram = self.response_bytes.get((method, route))
+        if histogram is None:
+            histogram = self.response_bytes[method, route] = Histogram(self.bytes_buckets)
+
+        histogram.observe(event.bytes)
+
+    def model_built(self, method: str, route: str, model: str, count: int, seconds: float) -> None:
+        self._observe(method, route, 'build', seconds)
+
+    def snapshot(self, quantiles: Iterable[float] = (0.5, 0.95, 0.99)) -> Dict[str, Any]:
+        """Returns the collected metrics by route, with estimated latency quantiles per phase"""
+        quantiles = tuple(quantiles)
+        routes: Dict[str, Dict[str, Any]] = {}
+
+        def route_entry(method: str, route: str) -> Dict[str, Any]:
+            name = f'{method} {route}'
+            if name not in routes:
+                routes[name] = {'requests': {}, 'retries': 0, 'cache': {}, 'in_flight': 0, 'bytes': None, 'latency': {}}
+
+            return routes[name]
+
+        for (method, route, outcome), count in self.requests.items():
+            route_entry(method, route)['requests'][outcome] = count
+
+        for (method, route), count in self.retries.items():
+            route_entry(method, route)['retries'] = count
+
+        for (method, route, outcome), count in self.cache.items():
+            route_entry(method, route)['cache'][outcome] = count
+
+        for (method, route), count in self.in_flight.items():
+            route_entry(method, route)['in_flight'] = count
+
+        for (method, route), histogram in self.response_bytes.items():
+            route_entry(method, route)['bytes'] = {'count': histogram.count, 'sum': histogram.sum}
+
+        for (method, route, phase), histogram in self.latency.items():
+            summary = {'count': histogram.count, 'sum': histogram.sum}
+            summary.update((f'p{q * 100:g}', histogram.quantile(q)) for q in quantiles)
+            route_entry(method, route)['latency'][phase] = summary
+
+        return routes
+
+    def render(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def labels(**values: str) -> str:
+            escaped = (k + '="' + v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"' for k, v in values.items())
+            return '{' + ','.join(escaped) + '}'
+
+        def histogram_lines(name: str, histogram: Histogram, **values: str) -> None:
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{labels(**values, le=repr(float(bound)))} {cumulative}')
+
+            lines.append(f'{name}_bucket{labels(**values, le="+Inf")} {histogram.count}')
+            lines.append(f'{name}_sum{labels(**values)} {histogram.sum}')
+            lines.append(f'{name}_count{labels(**values)} {histogram.count}')
+
+        lines.append('# TYPE aiomal_requests_total counter')
+        for (method, route, outcome), count in sorted(self.requests.items()):
+            lines.append(f'aiomal_requests_total{labels(method=method, route=route, outcome=outcome)} {count}')
+
+        lines.append('# TYPE aiomal_retries_total counter')
+        for (method, route), count in sorted(self.retries.items()):
+            lines.append(f'aiomal_retries_total{labels(method=method, route=route)} {count}')
+
+        lines.append('# TYPE aiomal_cache_total counter')
+        for (method, route, outcome), count in sorted(self.cache.items()):
+            lines.append(f'aiomal_cache_total{labels(method=method, route=route, outcome=outcome)} {count}')
+
+        lines.append('# TYPE aiomal_requests_in_flight gauge')
+        for (method, route), count in sorted(self.in_flight.items()):
+            lines.append(f'aiomal_requests_in_flight{labels(method=method, route=route)} {count}')
+
+        lines.append('# TYPE aiomal_response_bytes histogram')
+        for (method, route), histogram in sorted(self.response_bytes.items()):
+            histogram_lines('aiomal_response_bytes', histogram, method=method, route=route)
+
+        lines.append('# TYPE aiomal_request_seconds histogram')
+        for (method, route, phase), histogram in sorted(self.latency.items()):
+            histogram_lines('aiomal_request_seconds', histogram, method=method, route=route, phase=phase)
+
+        return '\n'.join(lines) + '\n'
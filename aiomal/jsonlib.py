@@ -0,0 +1,25 @@
+import json
+from typing import Any, Callable, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+__all__ = [
+    'JSONLoads',
+    'stdlib_loads',
+    'loads',
+]
+
+
+JSONLoads = Callable[[Union[bytes, str]], Any]
+
+
+def stdlib_loads(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+
+#: The default decoder, orjson when it is installed and the standard library otherwise
+loads: JSONLoads = orjson.loads if orjson is not None else stdlib_loads
@@ -1,19 +1,126 @@
-from typing import Any, Dict
+import inspect
+import sys
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+class Nested:
+    """An attribute holding model objects built from the value of a key of the payload
+
+    In lazy mode the objects are only built on first access and then kept, so fields
+    that are never read cost nothing. In eager mode they are built by :class:`Object`
+    while the owner is constructed.
+
+    The objects are kept in ``_<name>``, which slotted owners must declare in their
+    ``__slots__`` together with ``_data``.
+
+    Parameters
+    -----------
+    model: Union[type, :class:`str`]
+        The model built from the value, or its name in the owner's module if it is defined later
+
+    many: :class:`bool`
+        Whether the value is a list, built into a list of ``model``
+
+    args: Tuple[Any, ...]
+        Extra arguments passed to ``model`` after the data
+
+    default: Any
+        Used in place of a missing or null value
+
+    key: Optional[:class:`str`]
+        The key of the payload, defaults to the attribute name
+    """
+    def __init__(self, model: Union[type, str], many: bool = False, args: Tuple[Any, ...] = (), default: Any = None, key: Optional[str] = None) -> None:
+        self._model = model
+        self.many = many
+        self.args = args
+        self.default = default
+        self.key = key
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.owner = owner
+        self.name = name
+        self.storage = '_' + name
+        if self.key is None:
+            self.key = name
+
+    @property
+    def model(self) -> type:
+        if isinstance(self._model, str):
+            self._model = getattr(sys.modules[self.owner.__module__], self._model)
+
+        return self._model
+
+    def __get__(self, instance: Optional['Object'], owner: type) -> Any:
+        if instance is None:
+            return self
+
+        try:
+            return getattr(instance, self.storage)
+        except AttributeError:
+            return self.load(instance, True)
+
+    def __set__(self, instance: 'Object', value: Any) -> None:
+        setattr(instance, self.storage, value)
+
+    def load(self, instance: 'Object', lazy: bool) -> Any:
+        data = instance._data or {}
+        value = data.get(self.key)
+        if value is None:
+            value = self.default
+
+        # Models with nested objects of their own inherit the laziness
+        model = self.model
+        kwargs = {'lazy': lazy} if model._accepts_lazy else {}
+        if self.many:
+            built = [model(item, *self.args, **kwargs) for item in value or []]
+        else:
+            built = model(value, *self.args, **kwargs)
+
+        setattr(instance, self.storage, built)
+        return built
 
 
 class Object:
-    def __init__(self, data: Dict[str, Any]) -> None:
-        pass
+    __slots__ = ()
+
+    _nested_fields: Tuple[str, ...] = ()
+    _accepts_lazy: bool = True
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._accepts_lazy = 'lazy' in inspect.signature(cls.__init__).parameters
+        names = []
+        for klass in reversed(cls.__mro__):
+            for name, attribute in vars(klass).items():
+                if isinstance(attribute, Nested) and name not in names:
+                    names.append(name)
+
+        cls._nested_fields = tuple(names)
+
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        if not self._nested_fields:
+            return
+
+        self._data: Optional[Dict[str, Any]] = data
+        if not lazy:
+            cls = type(self)
+            for name in self._nested_fields:
+                getattr(cls, name).load(self, False)
+
+            # Everything is built, the payload doesn't need to be kept alive
+            self._data = None
 
 
 class Nullable(Object):
-    def __new__(cls, data: Dict[str, Any]):
+    __slots__ = ()
+
+    def __new__(cls, data: Dict[str, Any], *args: Any, **kwargs: Any):
         if data is None:
             return None
 
         return super(Object, cls).__new__(cls)
 
 
-    def __init__(self, data: Dict[str, Any]) -> None:
-        super().__init__(data)
-
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        super().__init__(data, lazy)
@@ -1,8 +1,9 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from .generics import Object
+from .generics import Nested, Object
 from .subtypes import *
+from .timestamps import Timestamp, parse_date
 
 
 __all__ = [
@@ -38,13 +39,19 @@ class User(Object):
         '_birthday', 
         'location', 
         '_joined_at',
-        'anime_statistics', 
+        '_anime_statistics', 
         'time_zone', 
-        'is_supporter'
+        'is_supporter',
+        'gender',
+        '_data'
     ]
 
-    def __init__(self, data: Dict[str, Any]) -> None:
-        super().__init__(data)
+    joined_at: Optional[datetime] = Timestamp()
+    birthday: Optional[datetime] = Timestamp(parse_date)
+    anime_statistics: Optional[AnimeStatistics] = Nested(AnimeStatistics)
+
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        super().__init__(data, lazy)
         self.id: int = data.get('id')
         self.name: str = data.get('name')
         self.picture: str = data.get('picture')
@@ -52,117 +59,131 @@ class User(Object):
         self._birthday: Optional[str] = data.get('birthday')
         self.location: Optional[str] = data.get('location')
         self._joined_at: str = data.get('joined_at')
-        self.anime_statistics: Optional[AnimeStatistics] = AnimeStatistics(data.get('anime_statistics'))
         self.time_zone: Optional[str] = data.get('time_zone')
         self.is_supporter: Optional[bool] = data.get('is_supporter')
 
-    @property
-    def joined_at(self) -> datetime:
-        return datetime.fromisoformat(self._joined_at)
-
-    @property
-    def birthday(self) -> Optional[datetime]:
-        return date(self._birthday)
-
-
-class MediaDetails:
-    """__slots__ = [
-        'pictures',
-        'background',
-        'related_anime',
-        'related_manga',
-        'recommendations',
-    ]"""
-
-    def __init__(self, data: Dict[str, Any], media_type: Media) -> None:
-        self.pictures: List[Picture] = [Picture(picture) for picture in data.get('pictures')]
-        self.background: str = data.get('background')
-        self.related_anime: List[RelatedMediaEdge] = [RelatedMediaEdge(anime, AnimeForList) for anime in data.get('related_anime')]
-        self.related_manga: List[RelatedMediaEdge] = [RelatedMediaEdge(manga, MangaForList) for manga in data.get('related_manga')]
-        self.recommendations: List[MediaRecommendationAggregationEdgeBase] = [MediaRecommendationAggregationEdgeBase(item, media_type) for item in data.get('recommendations')]
-
 
 class AnimeForList(Media):
-    """__slots__ = [
+    __slots__ = [
         'num_episodes',
-        'start_season',
-        'broadcast',
+        '_start_season',
+        '_broadcast',
         'source',
         'average_episode_duration',
         'rating',
-        'studios'
-    ]"""
+        '_studios'
+    ]
 
-    def __init__(self, data: Dict[str, Any]) -> None:
-        super().__init__(data)
+    start_season: Optional[StartSeason] = Nested(StartSeason)
+    broadcast: Optional[Broadcast] = Nested(Broadcast)
+    studios: List[Studio] = Nested(Studio, many=True)
+
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        super().__init__(data, lazy)
         self.num_episodes: int = data.get('num_episodes')
-        self.start_season: StartSeason = StartSeason(data.get('start_season'))
-        self.broadcast: Broadcast = Broadcast(data.get('broadcast'))
         self.source: str = data.get('source')
         self.average_episode_duration: int = data.get('average_episode_duration')
         self.rating: int = data.get('rating')
-        self.studios: List[Studio] = [Studio(studio) for studio in data.get('studios', [])]
-
-
-class AnimeDetails(AnimeForList, MediaDetails):
-    """__slots__ = [
-        'statistics'
-    ]"""
-
-    def __init__(self, data: Dict[str, Any]) -> None:
-        MediaDetails.__init__(self, data, AnimeForList)
-        AnimeForList.__init__(self, data)
-        self.statistics: Statistics = Statistics(data.get('statistics'))
 
 
 class MangaForList(Media):
-    """__slots__ = [
+    __slots__ = [
         'num_volumes',
         'num_chapters',
-        'authors',
-    ]"""
+        '_authors',
+    ]
+
+    authors: List[Author] = Nested(Author, many=True)
     
-    def __init__(self, data: Dict[str, Any]) -> None:
-        super().__init__(data)
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        super().__init__(data, lazy)
         self.num_volumes: int = data.get('num_volumes')
         self.num_chapters: int = data.get('num_chapters')
-        self.authors: List[Author] = [Author(author) for author in data.get('authors', [])]
 
 
-class MangaDetails(MangaForList, MediaDetails):
-    """__slots__ = [
-        'serialization'
-    ]"""
+class MediaDetails:
+    """The fields shared by :class:`AnimeDetails` and :class:`MangaDetails`
+
+    Two bases with non-empty ``__slots__`` can't be combined, so the storage of these
+    fields is declared by the subclasses in :attr:`SLOTS`.
+    """
+    __slots__ = ()
+
+    SLOTS = ('background', '_pictures', '_related_anime', '_related_manga', '_recommendations')
+
+    pictures: List[Picture] = Nested(Picture, many=True)
+    related_anime: List[RelatedMediaEdge] = Nested(RelatedMediaEdge, many=True, args=(AnimeForList,))
+    related_manga: List[RelatedMediaEdge] = Nested(RelatedMediaEdge, many=True, args=(MangaForList,))
 
     def __init__(self, data: Dict[str, Any]) -> None:
-        MediaDetails.__init__(self, data, MangaForList)
-        MangaForList.__init__(self, data)
-        self.serialization: List[Serialization] = [Serialization(serialization) for serialization in data.get('serialization')]
+        self.background: str = data.get('background')
+
+
+class AnimeDetails(AnimeForList, MediaDetails):
+    __slots__ = MediaDetails.SLOTS + ('_statistics',)
+
+    recommendations: List[MediaRecommendationAggregationEdgeBase] = Nested(MediaRecommendationAggregationEdgeBase, many=True, args=(AnimeForList,))
+    statistics: Optional[Statistics] = Nested(Statistics)
+
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        MediaDetails.__init__(self, data)
+        AnimeForList.__init__(self, data, lazy)
+
+
+class MangaDetails(MangaForList, MediaDetails):
+    __slots__ = MediaDetails.SLOTS + ('_serialization',)
+
+    recommendations: List[MediaRecommendationAggregationEdgeBase] = Nested(MediaRecommendationAggregationEdgeBase, many=True, args=(MangaForList,))
+    serialization: List[Serialization] = Nested(Serialization, many=True)
+
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        MediaDetails.__init__(self, data)
+        MangaForList.__init__(self, data, lazy)
 
 
 class ForumCategory(Object):
-    def __init__(self, data: Dict[str, Any]) -> None:
-        super().__init__(data)
+    __slots__ = ['title', '_boards', '_data']
+
+    boards: List[ForumBoard] = Nested(ForumBoard, many=True)
+
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        super().__init__(data, lazy)
         self.title: str = data.get('title')
-        self.boards: List[ForumBoard] = [ForumBoard(fb) for fb in data.get('boards')]
 
 
 class ForumTopicData(Object):
-    def __init__(self, data: Dict[str, Any]) -> None:
-        super().__init__(data)
+    __slots__ = ['title', '_posts', '_poll', '_data']
+
+    posts: List[ForumTopicPost] = Nested(ForumTopicPost, many=True)
+    poll: List[ForumTopicPoll] = Nested(ForumTopicPoll, many=True)
+
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        super().__init__(data, lazy)
         self.title: str = data.get('title')
-        self.posts: List[ForumTopicPost] = [ForumTopicPost(ftp) for ftp in data.get('posts')]
-        self.poll: List[ForumTopicPoll] = [ForumTopicPoll(ftp) for ftp in data.get('poll', [])]
 
 
 class ForumTopicsData(Object):
+    __slots__ = [
+        'id',
+        'title',
+        '_created_at',
+        'created_by',
+        'number_of_posts',
+        '_last_post_created_at',
+        'last_post_created_by',
+        'is_locked'
+    ]
+
+    created_at: Optional[datetime] = Timestamp()
+    last_post_created_at: Optional[datetime] = Timestamp()
+
     def __init__(self, data: Dict[str, Any]) -> None:
         super().__init__(data)
         self.id: int = data.get('id')
         self.title: str = data.get('title')
-        self.created_at: datetime = datetime.fromisoformat(data.get('created_at'))
+        self._created_at: Optional[str] = data.get('created_at')
         self.created_by: ForumTopicsCreatedBy = ForumTopicPostCreatedBy(data.get('created_by'))
         self.number_of_posts: int = data.get('number_of_posts')
-        self.last_post_created_at: datetime = datetime.fromisoformat(data.get('last_post_created_at'))
+        self._last_post_created_at: Optional[str] = data.get('last_post_created_at')
         self.last_post_created_by: ForumTopicsCreatedBy = ForumTopicPostCreatedBy(data.get('last_post_created_by'))
         self.is_locked: bool = data.get('is_locked')
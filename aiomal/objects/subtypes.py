@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from .generics import Object, Nullable
+from .generics import Nested, Object, Nullable
+from .timestamps import Timestamp, parse_date
 
 
 __all__ = [
@@ -31,11 +32,8 @@ __all__ = [
 ]
 
 
-def date(string: Optional[str]) -> Optional[datetime]:
-    if string is None:
-        return None
-
-    return datetime.strptime('%Y-%m-%d', string)
+#: Kept for backwards compatibility, use :func:`parse_date`
+date = parse_date
 
 
 class AlternativeTitles(Nullable):
@@ -107,15 +105,20 @@ class Broadcast(Nullable):
 
 
 class ForumBoard(Object):
-    def __init__(self, data: Dict[str, Any]) -> None:
-        super().__init__(data)
+    __slots__ = ['id', 'title', 'description', '_subboards', '_data']
+
+    subboards: List['ForumSubboard'] = Nested('ForumSubboard', many=True)
+
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        super().__init__(data, lazy)
         self.id: int = data.get('id')
         self.title: str = data.get('title')
         self.description: str = data.get('description')
-        self.subboards: List[ForumSubboard] = [ForumSubboard(fs) for fs in data.get('subboards')]
 
 
 class ForumSubboard(Object):
+    __slots__ = ['id', 'title']
+
     def __init__(self, data: Dict[str, Any]) -> None:
         super().__init__(data)
         self.id: int = data.get('id')
@@ -123,6 +126,8 @@ class ForumSubboard(Object):
 
 
 class ForumTopicsCreatedBy(Object):
+    __slots__ = ['id', 'name']
+
     def __init__(self, data: Dict[str, Any]) -> None:
         super().__init__(data)
         self.id: int = data.get('id')
@@ -130,17 +135,23 @@ class ForumTopicsCreatedBy(Object):
 
 
 class ForumTopicPost(Object):
+    __slots__ = ['id', 'number', '_created_at', 'created_by', 'body', 'signature']
+
+    created_at: Optional[datetime] = Timestamp()
+
     def __init__(self, data: Dict[str, Any]) -> None:
         super().__init__(data)
         self.id: int = data.get('id')
         self.number: int = data.get('number')
-        self.created_at: datetime = datetime.fromisoformat(data.get('created_at'))
+        self._created_at: Optional[str] = data.get('created_at')
         self.created_by: ForumTopicPostCreatedBy = ForumTopicPostCreatedBy(data.get('created_by'))
         self.body: str = data.get('body')
         self.signature: str = data.get('signature')
 
 
 class ForumTopicPostCreatedBy(Object):
+    __slots__ = ['id', 'name', 'forum_avator']
+
     def __init__(self, data: Dict[str, Any]) -> None:
         super().__init__(data)
         self.id: int = data.get('id')
@@ -149,15 +160,20 @@ class ForumTopicPostCreatedBy(Object):
 
 
 class ForumTopicPoll(Nullable):
-    def __init__(self, data: Dict[str, Any]) -> None:
-        super().__init__(data)
+    __slots__ = ['id', 'question', 'close', '_options', '_data']
+
+    options: List['ForumTopicPollOption'] = Nested('ForumTopicPollOption', many=True)
+
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        super().__init__(data, lazy)
         self.id: int = data.get('id')
         self.question: str = data.get('question')
         self.close: bool = data.get('close')
-        self.options: ForumTopicPollOption = ForumTopicPollOption(data.get('options'))
 
 
 class ForumTopicPollOption(Object):
+    __slots__ = ['id', 'text', 'votes']
+
     def __init__(self, data: Dict[str, Any]) -> None:
         super().__init__(data)
         self.id: int = data.get('id')
@@ -178,8 +194,8 @@ class Media(Object):
     __slots__ = [
         'id',
         'title',
-        'main_picture',
-        'alternative_titles',
+        '_main_picture',
+        '_alternative_titles',
         'start_date',
         'end_date',
         'synopsis',
@@ -188,20 +204,25 @@ class Media(Object):
         'popularity',
         'num_list_users',
         'nsfw',
-        'genres',
+        '_genres',
         '_created_at',
         '_updated_at',
         'media_type',
         'status',
         'my_list_status',
+        '_data',
     ]
 
-    def __init__(self, data: Dict[str, Any]) -> None:
-        super().__init__(data)
+    created_at: Optional[datetime] = Timestamp()
+    updated_at: Optional[datetime] = Timestamp()
+    main_picture: Optional['Picture'] = Nested('Picture')
+    alternative_titles: AlternativeTitles = Nested(AlternativeTitles, default={})
+    genres: List[Genre] = Nested(Genre, many=True)
+
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        super().__init__(data, lazy)
         self.id: int = data.get('id')
         self.title: str = data.get('title')
-        self.main_picture: Picture = Picture(data.get('main_picture'))
-        self.alternative_titles: AlternativeTitles = AlternativeTitles(data.get('alternative_titles') or {})
         self.start_date: str = data.get('start_date')
         self.end_date: str = data.get('end_date')
         self.synopsis: str = data.get('synopsis')
@@ -210,21 +231,12 @@ class Media(Object):
         self.popularity: int = data.get('popularity')
         self.num_list_users: int = data.get('num_list_users')
         self.nsfw: str = data.get('nsfw')
-        self.genres: List[Genre] = [Genre(genre) for genre in data.get('genres', [])]
         self._created_at: str = data.get('created_at')
         self._updated_at: str = data.get('updated_at')
         self.media_type: str = data.get('media_type')
         self.status: str = data.get('status')
         self.my_list_status: Optional[MyListStatus] = data.get('my_list_status', None)
 
-    @property
-    def created_at(self) -> datetime:
-        return datetime.fromisoformat(self._created_at)
-
-    @property
-    def updated_at(self) -> datetime:
-        return datetime.fromisoformat(self._updated_at)
-
     def __repr__(self) -> str:
         return f'<{type(self).__name__} name={self.title}>'
 
@@ -233,10 +245,11 @@ class Media(Object):
 
 
 class MediaRecommendationAggregationEdgeBase(Object):
-    __slots__ = ['node', 'num_recommendations']
+    __slots__ = ['media', 'num_recommendations']
 
-    def __init__(self, data: Dict[str, Any], media_type) -> None:
-        self.media: media_type = media_type(data.get('node'))
+    def __init__(self, data: Dict[str, Any], media_type, lazy: bool = False) -> None:
+        super().__init__(data)
+        self.media: media_type = media_type(data.get('node'), lazy)
         self.num_recommendations = data.get('num_recommendations')
 
 
@@ -246,30 +259,34 @@ class MyListStatus(Nullable):
         'score',
         'num_watched_episodes',
         'is_rewatching',
-        'start_date',
-        'finish_date',
+        '_start_date',
+        '_finish_date',
         'priority',
         'num_times_rewatched',
         'rewatch_value',
         'tags',
         'comments',
-        'updated_at'
+        '_updated_at'
     ]
 
+    start_date: Optional[datetime] = Timestamp(parse_date)
+    finish_date: Optional[datetime] = Timestamp(parse_date)
+    updated_at: Optional[datetime] = Timestamp()
+
     def __init__(self, data: Dict[str, Any]) -> None:
         super().__init__(data)
         self.status: Optional[str] = data.get('status', None)
         self.score: int = data.get('score')
         self.num_watched_episodes: int = data.get('num_watched_episodes')
         self.is_rewatching: bool = data.get('is_rewatching')
-        self.start_date: Optional[datetime] = date(data.get('start_date', None))
-        self.finish_date: Optional[datetime] = date(data.get('finish_date', None))
+        self._start_date: Optional[str] = data.get('start_date', None)
+        self._finish_date: Optional[str] = data.get('finish_date', None)
         self.priority: int = data.get('priority')
         self.num_times_rewatched: int = data.get('num_times_rewatched')
         self.rewatch_value: int = data.get('rewatch_value')
         self.tags: List[str] = data.get('tags')
         self.comments: str = data.get('comments')
-        self.updated_at: datetime = datetime.fromisoformat(data.get('updated_at'))
+        self._updated_at: Optional[str] = data.get('updated_at')
 
 
 class Picture(Nullable):
@@ -282,11 +299,11 @@ class Picture(Nullable):
 
 
 class RelatedMediaEdge(Object):
-    __slots__ = ['node', 'relation_type', 'relation_type_formatted']
+    __slots__ = ['media', 'relation_type', 'relation_type_formatted']
 
-    def __init__(self, data: Dict[str, Any], media_type: Media) -> None:
+    def __init__(self, data: Dict[str, Any], media_type: Media, lazy: bool = False) -> None:
         super().__init__(data)
-        self.media: Media = media_type(data.get('node'))
+        self.media: Media = media_type(data.get('node'), lazy)
         self.relation_type: str = data.get('relation_type')
         self.relation_type_formatted: str = data.get('relation_type_formatted')
 
@@ -311,15 +328,16 @@ class StartSeason(Nullable):
 
 
 class Statistics(Nullable):
-    __slots__ = ['num_list_users', 'status']
+    __slots__ = ['num_list_users', '_status', '_data']
 
-    def __init__(self, data: Dict[str, Any]) -> None:
-        super().__init__(data)
+    status: Optional['Status'] = Nested('Status')
+
+    def __init__(self, data: Dict[str, Any], lazy: bool = False) -> None:
+        super().__init__(data, lazy)
         self.num_list_users: int = data.get('num_list_users')
-        self.status: Status = Status(data.get('status'))
 
 
-class Status(Object):
+class Status(Nullable):
     __slots__ = ['watching', 'completed', 'on_hold', 'dropped', 'plan_to_watch']
     
     def __init__(self, data: Dict[str, Any]) -> None:
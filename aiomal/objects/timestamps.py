@@ -0,0 +1,117 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+__all__ = [
+    'Timestamp',
+    'parse_date',
+    'parse_datetime',
+    'parse_datetimes',
+    'preparse',
+]
+
+
+@lru_cache(maxsize=4096)
+def _parse_datetime(string: str) -> datetime:
+    if string.endswith('Z'):
+        string = string[:-1] + '+00:00'
+
+    return datetime.fromisoformat(string)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(string: str) -> datetime:
+    # MAL leaves out the unknown parts of a date, e.g. 2012 or 2012-07
+    parts = string.split('-')
+    year = int(parts[0])
+    month = int(parts[1]) if len(parts) > 1 else 1
+    day = int(parts[2]) if len(parts) > 2 else 1
+    return datetime(year, month, day)
+
+
+def parse_datetime(string: Optional[str]) -> Optional[datetime]:
+    """Parses a MAL timestamp such as ``2012-07-08T00:00:00+00:00``"""
+    if not string:
+        return None
+
+    return _parse_datetime(string)
+
+
+def parse_date(string: Optional[str]) -> Optional[datetime]:
+    """Parses a MAL date such as ``2012-07-08``, ``2012-07`` or ``2012``
+
+    The missing parts of a partial date default to the first month or day.
+    """
+    if not string:
+        return None
+
+    return _parse_date(string)
+
+
+def parse_datetimes(strings: Iterable[Optional[str]]) -> List[Optional[datetime]]:
+    """Parses many timestamps at once, parsing every distinct value only once"""
+    parsed: Dict[Optional[str], Optional[datetime]] = {}
+    result = []
+    for string in strings:
+        try:
+            value = parsed[string]
+        except KeyError:
+            value = parsed[string] = parse_datetime(string)
+
+        result.append(value)
+
+    return result
+
+
+def preparse(objects: Iterable[Any], *names: str) -> None:
+    """Parses the given timestamp attributes of many objects in one pass
+
+    Timestamps are otherwise parsed on first access, one object at a time. Call this
+    before e.g. sorting thousands of list entries by ``updated_at``.
+
+    Parameters
+    -----------
+    objects: Iterable[Any]
+        Objects of the same type
+
+    names: :class:`str`
+        The timestamp attributes to parse, e.g. ``'updated_at'``
+    """
+    objects = list(objects)
+    for name in names:
+        storage = '_' + name
+        pending = [obj for obj in objects if isinstance(getattr(obj, storage, None), str)]
+        for obj, value in zip(pending, parse_datetimes(getattr(obj, storage) for obj in pending)):
+            setattr(obj, storage, value)
+
+
+class Timestamp:
+    """An attribute parsing the raw timestamp stored in ``_<name>`` on first access
+
+    The parsed value replaces the raw string, so every instance parses it at most once.
+
+    Parameters
+    -----------
+    parser: Callable[[Optional[:class:`str`]], Optional[:class:`datetime`]]
+        Parses the raw value, defaults to :func:`parse_datetime`
+    """
+    def __init__(self, parser: Callable[[Optional[str]], Optional[datetime]] = parse_datetime) -> None:
+        self.parser = parser
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.storage = '_' + name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+
+        value = getattr(instance, self.storage)
+        if isinstance(value, str):
+            value = self.parser(value)
+            setattr(instance, self.storage, value)
+
+        return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        setattr(instance, self.storage, value)
@@ -0,0 +1,128 @@
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Generic, List, Optional, TypeVar
+
+from .columnar import MediaColumns
+
+
+__all__ = [
+    'Paginator',
+]
+
+
+T = TypeVar('T')
+Page = Dict[str, Any]
+
+
+def _consume_exception(task: 'asyncio.Future[Page]') -> None:
+    # A prefetched page that is never awaited must not log "exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
+
+
+class Paginator(Generic[T]):
+    """An async iterator over every item of a paged MAL endpoint
+
+    The paginator follows the ``paging.next`` link of every page. As soon as a page
+    arrives the request for the next one is sent, so the following page downloads while
+    the current one is being consumed. At most one page is buffered ahead of the
+    caller, which keeps memory bounded when the consumer is slower than the network.
+
+    Do not make this directly, use the ``iter_*`` methods of :class:`ClientUser`
+
+    Parameters
+    -----------
+    first_page: Callable[[], Awaitable[Dict[:class:`str`, Any]]]
+        Fetches the first page
+
+    next_page: Callable[[:class:`str`], Awaitable[Dict[:class:`str`, Any]]]
+        Fetches the page behind a ``paging.next`` URL
+
+    transform: Callable[[Dict[:class:`str`, Any]], T]
+        Builds the yielded object from a raw item of a page's ``data``
+
+    prefetch: :class:`bool`
+        Whether to request the next page before the current one is consumed. Defaults to True.
+    """
+    def __init__(self, first_page: Callable[[], Awaitable[Page]], next_page: Callable[[str], Awaitable[Page]], transform: Callable[[Dict[str, Any]], T], prefetch: bool = True) -> None:
+        self._first_page = first_page
+        self._next_page = next_page
+        self._transform = transform
+        self._prefetch = prefetch
+        self._items: Deque[Dict[str, Any]] = deque()
+        self._pending: Optional[asyncio.Future[Page]] = None
+        self._next_url: Optional[str] = None
+        self._started = False
+        self._closed = False
+
+    def __aiter__(self) -> 'Paginator[T]':
+        return self
+
+    async def __anext__(self) -> T:
+        while not self._items:
+            page = await self._fetch()
+            if page is None:
+                raise StopAsyncIteration
+
+            self._items.extend(page.get('data', []))
+
+        return self._transform(self._items.popleft())
+
+    async def __aenter__(self) -> 'Paginator[T]':
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def _fetch(self) -> Optional[Page]:
+        if self._closed:
+            return None
+
+        if not self._started:
+            self._started = True
+            page = await self._first_page()
+        elif self._pending is not None:
+            pending, self._pending = self._pending, None
+            page = await pending
+        elif self._next_url is not None:
+            url, self._next_url = self._next_url, None
+            page = await self._next_page(url)
+        else:
+            return None
+
+        next_url = page.get('paging', {}).get('next')
+        if next_url is None:
+            self._closed = True
+        elif self._prefetch:
+            self._pending = asyncio.ensure_future(self._next_page(next_url))
+            self._pending.add_done_callback(_consume_exception)
+        else:
+            self._next_url = next_url
+
+        return page
+
+    async def aclose(self) -> None:
+        """Stops the iteration and cancels the prefetched page request, if any"""
+        self._closed = True
+        self._items.clear()
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+
+    async def flatten(self) -> List[T]:
+        """Consumes the remaining pages and returns every item in a list"""
+        return [item async for item in self]
+
+    async def to_columns(self) -> MediaColumns:
+        """Consumes the remaining pages into a :class:`MediaColumns`, without making an object per item
+
+        Only for anime and manga endpoints.
+        """
+        columns = MediaColumns.from_items(self._items)
+        self._items.clear()
+        while True:
+            page = await self._fetch()
+            if page is None:
+                return columns
+
+            columns.extend(page.get('data', []))
@@ -0,0 +1,166 @@
+import asyncio
+import time
+from typing import Iterable, List, NamedTuple, Optional
+
+from .ratelimit import RateLimiter
+
+
+__all__ = [
+    'ClientIdPool',
+    'PooledClientId',
+    'PooledClientIdStats',
+]
+
+
+class PooledClientIdStats(NamedTuple):
+    client_id: str
+    rate: float
+    requests: int
+    throttles: int
+    failures: int
+    evicted_for: float
+
+
+class PooledClientId:
+    """A client ID of a :class:`ClientIdPool` with its own rate limiter and health"""
+    __slots__ = ['client_id', 'limiter', 'eviction', 'max_eviction', 'failure_threshold', 'requests', 'throttles', 'failures', '_strikes', '_failure_streak', '_evicted_until', '_eviction', '_queued']
+
+    def __init__(self, client_id: str, limiter: RateLimiter, eviction: float, max_eviction: float, failure_threshold: int) -> None:
+        self.client_id = client_id
+        self.limiter = limiter
+        self.eviction = eviction
+        self.max_eviction = max_eviction
+        self.failure_threshold = failure_threshold
+        self.requests = 0
+        self.throttles = 0
+        self.failures = 0
+        self._strikes = 0
+        self._failure_streak = 0
+        self._evicted_until = 0.0
+        self._eviction: Optional['asyncio.Future[None]'] = None
+        self._queued = 0
+
+    @property
+    def evicted_for(self) -> float:
+        """How long, in seconds, the client ID is still kept out of the pool"""
+        return max(0.0, self._evicted_until - time.monotonic())
+
+    @property
+    def stats(self) -> PooledClientIdStats:
+        return PooledClientIdStats(self.client_id, self.limiter.rate, self.requests, self.throttles, self.failures, self.evicted_for)
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        """Evicts the client ID, for twice as long on every throttling response in a row"""
+        self.throttles += 1
+        # Requests sent before the eviction don't count as another strike
+        if not self.evicted_for:
+            self._strikes += 1
+
+        self._evict(max(retry_after or 0.0, self.eviction * 2 ** (self._strikes - 1)))
+        # Only throttling slows the client ID down, errors don't say anything about its rate
+        self.limiter.throttled(0.0)
+
+    def succeeded(self) -> None:
+        self.requests += 1
+        self._strikes = 0
+        self._failure_streak = 0
+        self.limiter.succeeded()
+
+    def failed(self) -> None:
+        """Records a server or connection error, evicting the client ID after ``failure_threshold`` in a row"""
+        self.failures += 1
+        self._failure_streak += 1
+        if self._failure_streak >= self.failure_threshold:
+            self._failure_streak = 0
+            self._evict(self.eviction)
+
+    def evicted(self) -> 'asyncio.Future[None]':
+        """Returns a future resolving on the next eviction"""
+        if self._eviction is None or self._eviction.done():
+            self._eviction = asyncio.get_running_loop().create_future()
+
+        return self._eviction
+
+    def _evict(self, duration: float) -> None:
+        self._evicted_until = max(self._evicted_until, time.monotonic() + min(duration, self.max_eviction))
+        if self._eviction is not None and not self._eviction.done():
+            self._eviction.set_result(None)
+
+
+class ClientIdPool:
+    """Spreads requests that aren't made for a user over the client IDs of several applications
+
+    Each client ID has its own :class:`RateLimiter`, so the throughput of public reads
+    (rankings, seasons, details...) grows with the amount of registered applications.
+    Every request goes to the healthy client ID that can send it the soonest. A client
+    ID that gets throttled is evicted for ``eviction`` seconds, or the ``Retry-After``
+    if longer, doubling on every throttle in a row up to ``max_eviction``. The same
+    goes after ``failure_threshold`` server or connection errors in a row. When every
+    client ID is evicted, requests wait for the first one to come back.
+
+    Requests made with a user's token are not affected, they keep using the token.
+
+    Parameters
+    -----------
+    client_ids: Iterable[:class:`str`]
+        The client IDs of the applications
+
+    rate: :class:`float`
+        The requests per second sent with each client ID. Defaults to 2.
+
+    burst: :class:`int`
+        The amount of requests each client ID may send at once after being idle. Defaults to 4.
+
+    eviction: :class:`float`
+        How long, in seconds, a throttled client ID is evicted at first. Defaults to 30.
+
+    max_eviction: :class:`float`
+        The longest, in seconds, a client ID is evicted. Defaults to 600.
+
+    failure_threshold: :class:`int`
+        The amount of errors in a row after which a client ID is evicted. Defaults to 5.
+    """
+    def __init__(self, client_ids: Iterable[str], rate: float = 2.0, burst: int = 4, eviction: float = 30.0, max_eviction: float = 600.0, failure_threshold: int = 5) -> None:
+        self.client_ids: List[PooledClientId] = [
+            PooledClientId(client_id, RateLimiter(rate, burst), eviction, max_eviction, failure_threshold)
+            for client_id in client_ids
+        ]
+
+        if not self.client_ids:
+            raise ValueError('at least one client ID is required')
+
+    def __len__(self) -> int:
+        return len(self.client_ids)
+
+    @property
+    def stats(self) -> List[PooledClientIdStats]:
+        return [client_id.stats for client_id in self.client_ids]
+
+    def pick(self) -> PooledClientId:
+        """Returns the client ID the next request should be sent with"""
+        healthy = [client_id for client_id in self.client_ids if not client_id.evicted_for]
+        if not healthy:
+            return min(self.client_ids, key=lambda client_id: client_id.evicted_for)
+
+        return min(healthy, key=lambda client_id: client_id.limiter.estimate_wait(client_id._queued))
+
+    async def acquire(self) -> PooledClientId:
+        """Waits until a healthy client ID may send a request and returns it"""
+        while True:
+            client_id = self.pick()
+            evicted_for = client_id.evicted_for
+            if evicted_for:
+                await asyncio.sleep(evicted_for)
+                continue
+
+            # If it is evicted while this request waits for its turn, another one is picked
+            acquire = asyncio.ensure_future(client_id.limiter.acquire())
+            client_id._queued += 1
+            try:
+                await asyncio.wait([acquire, client_id.evicted()], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                client_id._queued -= 1
+                acquire.cancel()
+
+            if acquire.done() and not acquire.cancelled() and not client_id.evicted_for:
+                return client_id
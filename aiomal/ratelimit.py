@@ -0,0 +1,171 @@
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import NamedTuple, Optional
+
+
+__all__ = [
+    'RateLimiter',
+    'RateLimiterStats',
+    'parse_retry_after',
+]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Returns the seconds to wait from a ``Retry-After`` header, given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiterStats(NamedTuple):
+    rate: float
+    waiting: int
+    acquired: int
+    throttled: int
+    total_wait: float
+    max_wait: float
+
+
+class RateLimiter:
+    """A token bucket limiting how fast requests are sent
+
+    Requests wait in FIFO order for a token. When MAL answers with a throttling
+    response the bucket is emptied, held closed for the ``Retry-After`` period and
+    the rate is cut by ``backoff``. Every successful request then adds back a
+    ``recovery`` fraction of the configured rate until it is reached again.
+
+    Share one instance between several :class:`HTTPClient`s to limit them together.
+
+    Parameters
+    -----------
+    rate: :class:`float`
+        The sustained amount of requests per second. Defaults to 2.
+
+    burst: :class:`int`
+        The amount of requests that may be sent at once after being idle. Defaults to 4.
+
+    min_rate: :class:`float`
+        The rate is never lowered below this when adapting. Defaults to 0.1.
+
+    backoff: :class:`float`
+        The factor the rate is multiplied with on a throttling response. Defaults to 0.5.
+
+    recovery: :class:`float`
+        The fraction of ``rate`` added back after each successful request. Defaults to 0.05.
+    """
+    def __init__(self, rate: float = 2.0, burst: int = 4, min_rate: float = 0.1, backoff: float = 0.5, recovery: float = 0.05) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError('rate must be positive and burst at least 1')
+
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.backoff = backoff
+        self.recovery = recovery
+
+        self.waiting = 0
+        self.acquired = 0
+        self.throttle_count = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        return RateLimiterStats(self.rate, self.waiting, self.acquired, self.throttle_count, self.total_wait, self.max_wait)
+
+    def estimate_wait(self, waiting: Optional[int] = None) -> float:
+        """Estimates how long, in seconds, a new request would wait for a token
+
+        Parameters
+        -----------
+        waiting: Optional[:class:`int`]
+            The amount of requests queued before it. Defaults to the ones waiting in :meth:`acquire`.
+        """
+        if waiting is None:
+            waiting = self.waiting
+
+        now = time.monotonic()
+        tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate) - waiting
+        return max(0.0, (1 - tokens) / self.rate, self._blocked_until - now)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> float:
+        """Waits for a token
+
+        Returns
+        --------
+        :class:`float`
+            How long the caller waited, in seconds
+        """
+        # Created lazily so the limiter can be made outside of a running loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self._blocked_until:
+                        await asyncio.sleep(self._blocked_until - now)
+                        continue
+
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def throttled(self, retry_after: Optional[float] = None) -> None:
+        """Slows the limiter down after a throttling response
+
+        Parameters
+        -----------
+        retry_after: Optional[:class:`float`]
+            The seconds MAL asked to wait. Defaults to the time between two requests at the lowered rate.
+        """
+        now = time.monotonic()
+        self.throttle_count += 1
+        self.rate = max(self.min_rate, self.rate * self.backoff)
+        self._refill(now)
+        self._tokens = 0.0
+
+        if retry_after is None:
+            retry_after = 1 / self.rate
+
+        self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def succeeded(self) -> None:
+        """Lets the rate recover towards its configured value after a successful request"""
+        if self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.recovery)
@@ -0,0 +1,123 @@
+import asyncio
+import random
+import time
+from typing import Iterable, Optional, Tuple, Type
+
+import aiohttp
+from aiohttp.client import DEFAULT_TIMEOUT
+
+
+__all__ = [
+    'RetryPolicy',
+]
+
+
+class RetryPolicy:
+    """Decides which failed requests :class:`HTTPClient` retries and how long it waits in between
+
+    Waits grow exponentially from ``backoff`` up to ``max_backoff``, with full jitter so
+    clients failing together don't retry together. Throttling responses are retried
+    as well, after their ``Retry-After`` when there is no rate limiter to wait on.
+
+    A request that isn't idempotent, like a POST, is only retried after errors that
+    prove it never reached MAL, such as a failed connection. List status PATCHes set
+    absolute values and are retried like GETs. A retried DELETE answered with a 404
+    after an attempt that may have reached MAL counts as done.
+
+    Parameters
+    -----------
+    max_attempts: :class:`int`
+        The max amount of times a request is sent, 1 disables retries. Defaults to 5.
+
+    statuses: Iterable[:class:`int`]
+        The response statuses retried. Defaults to 500, 502, 503 and 504.
+
+    exceptions: Tuple[Type[:class:`BaseException`], ...]
+        The exceptions retried. Defaults to connection errors, truncated responses and timeouts.
+
+    backoff: :class:`float`
+        The wait, in seconds, before the first retry. Defaults to 0.5.
+
+    max_backoff: :class:`float`
+        The longest wait, in seconds, between two attempts. Defaults to 10.
+
+    jitter: :class:`bool`
+        Whether waits are randomised between 0 and their exponential value. Defaults to True.
+
+    deadline: Optional[:class:`float`]
+        The total time, in seconds, a request may take with its retries and waits. Every
+        attempt's socket timeout is cut to the time left. None for no limit, the default.
+    """
+    #: Exceptions raised before the request could reach MAL, safe to retry for any method
+    UNSENT_EXCEPTIONS: Tuple[Type[BaseException], ...] = (aiohttp.ClientConnectorError,)
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        statuses: Iterable[int] = (500, 502, 503, 504),
+        exceptions: Tuple[Type[BaseException], ...] = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError),
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        jitter: bool = True,
+        deadline: Optional[float] = None
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+
+        self.max_attempts = max_attempts
+        self.statuses = frozenset(statuses)
+        self.exceptions = exceptions
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.deadline = deadline
+
+    def start(self) -> Optional[float]:
+        """Returns the monotonic time a request starting now must be done by, if any"""
+        if self.deadline is None:
+            return None
+
+        return time.monotonic() + self.deadline
+
+    def timeout(self, deadline: Optional[float]) -> aiohttp.ClientTimeout:
+        """Returns the timeout of the next attempt, aiohttp's default cut to the time left before the deadline
+
+        Raises
+        -------
+        asyncio.TimeoutError
+            The deadline passed, e.g. while waiting for a rate limiter
+        """
+        if deadline is None:
+            return DEFAULT_TIMEOUT
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            # A total of 0 would disable aiohttp's timeout instead
+            raise asyncio.TimeoutError
+
+        total = min(remaining, DEFAULT_TIMEOUT.total) if DEFAULT_TIMEOUT.total else remaining
+        return aiohttp.ClientTimeout(total=total, sock_connect=DEFAULT_TIMEOUT.sock_connect)
+
+    def delay(self, attempt: int) -> float:
+        """Returns the wait, in seconds, after the given failed attempt, counted from 1"""
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    def allows(self, attempt: int, delay: float, deadline: Optional[float]) -> bool:
+        """Whether another attempt fits after the given attempt and wait"""
+        if attempt >= self.max_attempts:
+            return False
+
+        return deadline is None or time.monotonic() + delay < deadline
+
+    def retries_status(self, status: int, idempotent: bool) -> bool:
+        return idempotent and status in self.statuses
+
+    def retries_exception(self, exc: BaseException, idempotent: bool) -> bool:
+        if not isinstance(exc, self.exceptions):
+            return False
+
+        return idempotent or isinstance(exc, self.UNSENT_EXCEPTIONS)
@@ -0,0 +1,184 @@
+import re
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional
+
+from .jsonlib import JSONLoads
+
+if TYPE_CHECKING:
+    import aiohttp
+
+    from .instrumentation import _RequestTrace
+
+
+__all__ = [
+    'ItemSplitter',
+    'PageStream',
+]
+
+
+_STRUCTURE = re.compile(rb'["{}\[\]]')
+_STRING_END = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Everything up to the next bracket outside of a string, or up to an unterminated string
+_SKIP = re.compile(rb'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+
+
+class ItemSplitter:
+    """Splits the objects of a JSON document's top level ``data`` array out of a byte stream
+
+    Every complete object of the array is returned as soon as its last byte is fed,
+    so only the object being received is buffered. Everything around the array is
+    kept, with the array emptied, and can be decoded with :meth:`rest` once the
+    whole document was fed.
+
+    Parameters
+    -----------
+    key: :class:`bytes`
+        The key of the array to split. Defaults to data.
+    """
+    def __init__(self, key: bytes = b'data') -> None:
+        self.key = key
+        self._buffer = b''
+        self._pos = 0
+        self._depth = 0
+        self._after_key = False
+        self._in_array = False
+        self._item_start: Optional[int] = None
+        self._rest: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Feeds the next chunk of the document and returns the raw objects it completed"""
+        buffer = self._buffer + chunk
+        pos = self._pos
+        keep = 0  # Everything before this was returned or moved to the rest
+        items = []
+
+        while True:
+            if self._in_array or self._depth != 1:
+                # Keys only matter at the top level, skip over everything else in one go
+                index = _SKIP.match(buffer, pos).end()
+                if index == len(buffer) or buffer[index] == 0x22:
+                    pos = index
+                    break
+            else:
+                match = _STRUCTURE.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+
+                index = match.start()
+
+            char = buffer[index]
+            if char == 0x22:  # "
+                end = _STRING_END.match(buffer, index + 1)
+                if end is None:
+                    # The string continues in the next chunk
+                    pos = index
+                    break
+
+                pos = end.end()
+                if self._depth == 1 and not self._in_array:
+                    self._after_key = buffer[index + 1:pos - 1] == self.key
+                continue
+
+            pos = index + 1
+            if char == 0x7b or char == 0x5b:  # { [
+                if self._depth == 1 and self._after_key and char == 0x5b:
+                    self._in_array = True
+                    self._rest.append(buffer[keep:pos])
+                    keep = pos
+                elif self._in_array and self._depth == 2 and char == 0x7b:
+                    self._item_start = index
+
+                self._after_key = False
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._in_array and self._depth == 2 and self._item_start is not None:
+                    items.append(buffer[self._item_start:pos])
+                    self._item_start = None
+                    keep = pos
+                elif self._in_array and self._depth == 1:
+                    # The end of the array, the separators between its items are dropped
+                    self._in_array = False
+                    keep = index
+
+        if not self._in_array:
+            self._rest.append(buffer[keep:pos])
+            keep = pos
+        elif self._item_start is None:
+            keep = pos
+        else:
+            keep = self._item_start
+            self._item_start = 0
+
+        self._buffer = buffer[keep:]
+        self._pos = pos - keep
+        return items
+
+    def rest(self, loads: JSONLoads) -> Any:
+        """Decodes the document without the items of the array"""
+        return loads(b''.join(self._rest) + self._buffer)
+
+
+class PageStream:
+    """An async iterator over the items of a list page, decoded while the page downloads
+
+    The first items reach the caller before the response is complete and only one raw
+    item is buffered at a time, instead of the whole page. Once the iteration finishes
+    :attr:`paging` holds the page's ``paging`` object.
+
+    Do not make this directly, use the ``stream_*`` methods of :class:`ClientUser`
+    """
+    def __init__(self, open_response: Callable[[], AsyncIterator['aiohttp.ClientResponse']], loads: JSONLoads, trace: Optional['_RequestTrace'] = None) -> None:
+        self._open_response = open_response
+        self._loads = loads
+        self._trace = trace
+        self.paging: Optional[Dict[str, Any]] = None
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        loads = self._loads
+        splitter = ItemSplitter()
+        responses = self._open_response()
+        opened = False
+        try:
+            async for response in responses:
+                opened = True
+                if self._trace is None:
+                    async for chunk in response.content.iter_any():
+                        for item in splitter.feed(chunk):
+                            yield loads(item)
+                else:
+                    async for item in self._traced_items(response, splitter):
+                        yield item
+        except GeneratorExit:
+            await responses.aclose()
+            raise
+        except BaseException as e:
+            if not opened:
+                raise
+
+            # Thrown back into the request, which reports it and re-raises it
+            await responses.athrow(e)
+            raise
+
+        self.paging = splitter.rest(loads).get('paging', {})
+
+    async def _traced_items(self, response: 'aiohttp.ClientResponse', splitter: ItemSplitter) -> AsyncIterator[Any]:
+        # Times the waits for the body and the decoding, not the caller's handling of the items
+        trace = self._trace
+        loads = self._loads
+        chunks = response.content.iter_any().__aiter__()
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                break
+
+            trace.body += time.perf_counter() - start
+            trace.bytes += len(chunk)
+            for raw in splitter.feed(chunk):
+                start = time.perf_counter()
+                item = loads(raw)
+                trace.decode += time.perf_counter() - start
+                yield item
@@ -0,0 +1,239 @@
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional
+
+from .fields import ANIME_FIELD_PRESETS, MANGA_FIELD_PRESETS, FieldsType, resolve_fields
+from .objects.timestamps import parse_datetime
+from .pagination import Paginator
+
+if TYPE_CHECKING:
+    from .client import ClientUser
+
+
+__all__ = [
+    'ListChange',
+    'ListSnapshot',
+    'ListSync',
+]
+
+
+Entry = Dict[str, Any]
+
+
+class ListChange(NamedTuple):
+    """A change of a list entry found by :meth:`ListSync.sync`
+
+    ``entry`` and ``previous`` are raw list items, a ``node`` and its ``list_status``.
+    """
+    kind: str  # added, changed or removed
+    id: int
+    entry: Optional[Entry]
+    previous: Optional[Entry]
+
+
+class ListSnapshot:
+    """The local copy of a user list kept by :class:`ListSync`
+
+    Use :meth:`to_dict` and :meth:`from_dict` to persist it between runs.
+
+    Attributes
+    -----------
+    entries: Dict[:class:`int`, Dict[:class:`str`, Any]]
+        The raw list items by media ID
+
+    updated_at: Optional[:class:`str`]
+        The high-water mark, the latest ``list_status.updated_at`` seen
+
+    reconciled_at: :class:`float`
+        When the whole list was last fetched, as a UNIX timestamp
+    """
+    __slots__ = ['entries', 'updated_at', 'reconciled_at']
+
+    def __init__(self, entries: Optional[Dict[int, Entry]] = None, updated_at: Optional[str] = None, reconciled_at: float = 0.0) -> None:
+        self.entries: Dict[int, Entry] = entries or {}
+        self.updated_at = updated_at
+        self.reconciled_at = reconciled_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'entries': list(self.entries.values()),
+            'updated_at': self.updated_at,
+            'reconciled_at': self.reconciled_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ListSnapshot':
+        entries = {entry['node']['id']: entry for entry in data.get('entries', [])}
+        return cls(entries, data.get('updated_at'), data.get('reconciled_at', 0.0))
+
+
+def _updated_at(entry: Entry) -> Optional[str]:
+    return (entry.get('list_status') or {}).get('updated_at')
+
+
+def _latest(entries: Iterable[Entry], mark: Optional[str]) -> Optional[str]:
+    for entry in entries:
+        updated_at = _updated_at(entry)
+        if updated_at is not None and (mark is None or parse_datetime(updated_at) > parse_datetime(mark)):
+            mark = updated_at
+
+    return mark
+
+
+class ListSync:
+    """Keeps a local snapshot of a user's anime or manga list up to date
+
+    A sync pages through the list sorted by ``list_updated_at``, newest first, and stops
+    at the first entry older than the snapshot's high-water mark. In the steady state
+    that is a single small request. Entries removed from the list can't be seen that
+    way, so every ``reconcile_interval`` seconds the whole list is fetched in pages of
+    1000 and compared with the snapshot, which also catches removals. Keep ``fields``
+    small to keep that cheap.
+
+    Responses are never served from the caches, but a :class:`DiskCache` still lets the
+    requests be revalidated.
+
+    Parameters
+    -----------
+    user: :class:`ClientUser`
+        The user whose token the list is fetched with
+
+    user_name: :class:`str`
+        The user name of the list's owner, default @me
+
+    media_type: :class:`str`
+        Either anime or manga. Defaults to anime.
+
+    snapshot: Optional[:class:`ListSnapshot`]
+        A snapshot from an earlier run. A new one is fully fetched on the first sync.
+
+    fields: Optional[Union[:class:`str`, Iterable[:class:`str`]]]
+        Extra fields kept for every entry, ``list_status`` is always requested.
+
+    page_size: :class:`int`
+        The amount of entries requested per page of an incremental sync. Defaults to 100.
+
+    reconcile_interval: Optional[:class:`float`]
+        How often, in seconds, the whole list is fetched, None to only do it when asked.
+        Defaults to a day.
+    """
+    def __init__(
+        self,
+        user: 'ClientUser',
+        user_name: str = '@me',
+        media_type: str = 'anime',
+        snapshot: Optional[ListSnapshot] = None,
+        fields: FieldsType = None,
+        page_size: int = 100,
+        reconcile_interval: Optional[float] = 24 * 3600.0
+    ) -> None:
+        if media_type not in ('anime', 'manga'):
+            raise ValueError('media_type must be anime or manga')
+
+        presets = ANIME_FIELD_PRESETS if media_type == 'anime' else MANGA_FIELD_PRESETS
+        resolved = resolve_fields(presets, fields)
+
+        self.user = user
+        self.user_name = user_name
+        self.media_type = media_type
+        self.snapshot = snapshot or ListSnapshot()
+        self.fields = 'list_status' if resolved is None else f'{resolved},list_status'
+        self.page_size = page_size
+        self.reconcile_interval = reconcile_interval
+        self.requests = 0
+
+    @property
+    def reconcile_due(self) -> bool:
+        if not self.snapshot.reconciled_at:
+            return True
+
+        if self.reconcile_interval is None:
+            return False
+
+        return time.time() - self.snapshot.reconciled_at >= self.reconcile_interval
+
+    def _pages(self, limit: int) -> Paginator[Entry]:
+        user = self.user
+        http = user._http
+        get_list = http.get_user_anime_list if self.media_type == 'anime' else http.get_user_manga_list
+
+        async def first_page():
+            self.requests += 1
+            return await user._call(get_list, self.user_name, None, 'list_updated_at', limit, 0, fields=self.fields, use_cache=False)
+
+        async def next_page(url: str):
+            self.requests += 1
+            return await user._call(http.get_page, url, use_cache=False)
+
+        # Pages are only requested once needed, the sync usually stops within the first one
+        return Paginator(first_page, next_page, lambda entry: entry, prefetch=False)
+
+    async def sync(self, reconcile: Optional[bool] = None) -> List[ListChange]:
+        """Brings the snapshot up to date and returns what changed since the last sync
+
+        Parameters
+        -----------
+        reconcile: Optional[:class:`bool`]
+            Whether to fetch the whole list, catching removed entries. Defaults to doing
+            so when :attr:`reconcile_due`.
+
+        Returns
+        --------
+        List[:class:`ListChange`]
+            The added, changed and removed entries
+        """
+        if reconcile is None:
+            reconcile = self.reconcile_due
+
+        if reconcile:
+            return await self._reconcile()
+
+        return await self._sync_incremental()
+
+    async def _sync_incremental(self) -> List[ListChange]:
+        snapshot = self.snapshot
+        mark = parse_datetime(snapshot.updated_at)
+        changes = []
+        seen = []
+        async with self._pages(self.page_size) as pages:
+            async for entry in pages:
+                updated_at = parse_datetime(_updated_at(entry))
+                if mark is not None and updated_at is not None and updated_at < mark:
+                    break
+
+                seen.append(entry)
+                change = self._apply(entry)
+                if change is not None:
+                    changes.append(change)
+
+        snapshot.updated_at = _latest(seen, snapshot.updated_at)
+        return changes
+
+    async def _reconcile(self) -> List[ListChange]:
+        snapshot = self.snapshot
+        async with self._pages(1000) as pages:
+            entries = {entry['node']['id']: entry async for entry in pages}
+
+        changes = []
+        for entry in entries.values():
+            change = self._apply(entry)
+            if change is not None:
+                changes.append(change)
+
+        for media_id in [media_id for media_id in snapshot.entries if media_id not in entries]:
+            changes.append(ListChange('removed', media_id, None, snapshot.entries.pop(media_id)))
+
+        snapshot.updated_at = _latest(entries.values(), None)
+        snapshot.reconciled_at = time.time()
+        return changes
+
+    def _apply(self, entry: Entry) -> Optional[ListChange]:
+        media_id = entry['node']['id']
+        previous = self.snapshot.entries.get(media_id)
+        self.snapshot.entries[media_id] = entry
+        if previous is None:
+            return ListChange('added', media_id, entry, None)
+
+        if previous.get('list_status') != entry.get('list_status'):
+            return ListChange('changed', media_id, entry, previous)
+
+        return None
@@ -0,0 +1,318 @@
+import abc
+import asyncio
+import base64
+import json
+import os
+import random
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+
+
+__all__ = [
+    'CassetteMiss',
+    'Interaction',
+    'Cassette',
+    'Transport',
+    'RecordingTransport',
+    'ReplayTransport',
+]
+
+
+class CassetteMiss(LookupError):
+    """A replayed request was never recorded"""
+
+
+#: Query parameters that carry secrets, left out of recorded URLs
+SENSITIVE_PARAMETERS = frozenset({'client_id', 'client_secret', 'code', 'code_verifier', 'refresh_token'})
+
+
+def _normalize_url(url: str) -> str:
+    # Recorded and replayed requests are matched on this, the order of parameters doesn't matter
+    split = urlsplit(str(url))
+    query = sorted((k, v) for k, v in parse_qsl(split.query, keep_blank_values=True) if k not in SENSITIVE_PARAMETERS)
+    return urlunsplit((split.scheme, split.netloc, split.path, urlencode(query), ''))
+
+
+class Interaction:
+    """A recorded request and the response it got
+
+    Parameters
+    -----------
+    method: :class:`str`
+        The request's method
+
+    url: :class:`str`
+        The request's URL, normalized and without secrets
+
+    status: :class:`int`
+        The response's status
+
+    reason: :class:`str`
+        The response's reason phrase
+
+    headers: List[Tuple[:class:`str`, :class:`str`]]
+        The response's headers
+
+    body: :class:`bytes`
+        The response's body
+    """
+    __slots__ = ['method', 'url', 'status', 'reason', 'headers', 'body']
+
+    def __init__(self, method: str, url: str, status: int, reason: str, headers: List[Tuple[str, str]], body: bytes) -> None:
+        self.method = method
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.method, self.url
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            'method': self.method,
+            'url': self.url,
+            'status': self.status,
+            'reason': self.reason,
+            'headers': self.headers,
+        }
+
+        try:
+            data['body'] = self.body.decode('utf-8')
+        except UnicodeDecodeError:
+            data['body_base64'] = base64.b64encode(self.body).decode('ascii')
+
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Interaction':
+        if 'body_base64' in data:
+            body = base64.b64decode(data['body_base64'])
+        else:
+            body = data.get('body', '').encode('utf-8')
+
+        headers = [(name, value) for name, value in data.get('headers', [])]
+        return cls(data['method'], data['url'], data['status'], data.get('reason', ''), headers, body)
+
+
+class Cassette:
+    """Recorded interactions, stored in a JSON file
+
+    Authorization and client ID headers are never recorded, nor are the secrets in
+    OAuth URLs, but the token responses themselves are. Don't share cassettes recorded
+    with a real user.
+
+    Parameters
+    -----------
+    path: Optional[Union[:class:`str`, :class:`os.PathLike`]]
+        The file the cassette is loaded from and saved to, None to keep it in memory
+
+    interactions: Iterable[:class:`Interaction`]
+        The interactions already recorded
+    """
+    def __init__(self, path: Optional['os.PathLike[str]'] = None, interactions: Iterable[Interaction] = ()) -> None:
+        self.path = path
+        self.interactions: List[Interaction] = list(interactions)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    @classmethod
+    def load(cls, path: 'os.PathLike[str]') -> 'Cassette':
+        """Loads the cassette saved at path"""
+        with open(path, encoding='utf-8') as fp:
+            data = json.load(fp)
+
+        return cls(path, (Interaction.from_dict(interaction) for interaction in data['interactions']))
+
+    def save(self, path: Optional['os.PathLike[str]'] = None) -> None:
+        """Writes the cassette to path, its own path by default"""
+        path = path or self.path
+        if path is None:
+            raise ValueError('the cassette has no path to be saved to')
+
+        # Written next to the target and renamed, a crash never leaves half a cassette
+        temp = f'{os.fspath(path)}.tmp'
+        with open(temp, 'w', encoding='utf-8') as fp:
+            json.dump({'version': 1, 'interactions': [interaction.to_dict() for interaction in self.interactions]}, fp, ensure_ascii=False, indent=1)
+
+        os.replace(temp, path)
+
+    def append(self, interaction: Interaction) -> None:
+        self.interactions.append(interaction)
+
+
+class _ReplayContent:
+    # Stands in for aiohttp's StreamReader
+    def __init__(self, body: bytes, chunk_size: int) -> None:
+        self._body = body
+        self._chunk_size = chunk_size
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def iter_any(self) -> AsyncIterator[bytes]:
+        for start in range(0, len(self._body), self._chunk_size):
+            yield self._body[start:start + self._chunk_size]
+            # Lets other tasks run between chunks, like a real download would
+            await asyncio.sleep(0)
+
+
+class _ReplayResponse:
+    # Stands in for an aiohttp.ClientResponse made from an interaction
+    def __init__(self, interaction: Interaction, chunk_size: int) -> None:
+        self.method = interaction.method
+        self.url = interaction.url
+        self.status = interaction.status
+        self.reason = interaction.reason
+        self.headers = CIMultiDictProxy(CIMultiDict(interaction.headers))
+        self.content = _ReplayContent(interaction.body, chunk_size)
+        self._body = interaction.body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    def release(self) -> None:
+        pass
+
+    def __repr__(self) -> str:
+        return f'<ReplayResponse({self.url}) [{self.status} {self.reason}]>'
+
+
+class _ResponseContext:
+    # Lets transports be used like ClientSession.request, in an async with
+    def __init__(self, coro: Any) -> None:
+        self._coro = coro
+
+    async def __aenter__(self) -> _ReplayResponse:
+        return await self._coro
+
+    async def __aexit__(self, *exc: Any) -> None:
+        pass
+
+
+class Transport(abc.ABC):
+    """What :class:`HTTPClient` sends its requests through instead of its own session
+
+    A transport has the ``request`` method of :class:`aiohttp.ClientSession`, returning
+    an async context manager around a response with ``status``, ``reason``, ``headers``,
+    ``read()`` and ``content.iter_any()``. Subclasses must implement it.
+    """
+    @abc.abstractmethod
+    def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        """Sends a request, see :meth:`aiohttp.ClientSession.request`"""
+
+    async def close(self) -> None:
+        pass
+
+
+class RecordingTransport(Transport):
+    """Sends requests over the network and records every response into a cassette
+
+    The cassette is saved when the transport is closed, which :class:`HTTPClient` does
+    when it is closed.
+
+    Parameters
+    -----------
+    cassette: :class:`Cassette`
+        The cassette recorded into
+
+    chunk_size: :class:`int`
+        The size of the chunks streamed responses are handed out in. Defaults to 64 KiB.
+    """
+    def __init__(self, cassette: Cassette, chunk_size: int = 65536) -> None:
+        self.cassette = cassette
+        self.chunk_size = chunk_size
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def request(self, method: str, url: str, **kwargs: Any) -> _ResponseContext:
+        # The aiohttp trace of the request isn't carried over to the recording session
+        kwargs.pop('trace_request_ctx', None)
+        return _ResponseContext(self._record(method, url, kwargs))
+
+    async def _record(self, method: str, url: str, kwargs: Dict[str, Any]) -> _ReplayResponse:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+
+        async with self._session.request(method, url, **kwargs) as response:
+            body = await response.read()
+            interaction = Interaction(method, _normalize_url(url), response.status, response.reason or '', list(response.headers.items()), body)
+
+        self.cassette.append(interaction)
+        return _ReplayResponse(interaction, self.chunk_size)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+        if self.cassette.path is not None:
+            self.cassette.save()
+
+
+class ReplayTransport(Transport):
+    """Answers requests with the responses of a cassette, without a network
+
+    Requests are matched on their method and URL. A request recorded several times gets
+    its responses in the recorded order, then the last one again, so a short cassette
+    can answer a long load test. Every response is delayed by ``latency`` seconds,
+    plus or minus up to ``jitter``, and honours the request's timeout.
+
+    Parameters
+    -----------
+    cassette: :class:`Cassette`
+        The recorded responses
+
+    latency: :class:`float`
+        The delay, in seconds, before every response. Defaults to 0.
+
+    jitter: :class:`float`
+        The most, in seconds, the delay is randomly shortened or lengthened by. Defaults to 0.
+
+    chunk_size: :class:`int`
+        The size of the chunks streamed responses are handed out in. Defaults to 64 KiB.
+
+    seed: Optional[:class:`int`]
+        Seeds the jitter, to replay the same delays on every run
+    """
+    def __init__(self, cassette: Cassette, latency: float = 0.0, jitter: float = 0.0, chunk_size: int = 65536, seed: Optional[int] = None) -> None:
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.chunk_size = chunk_size
+        self.replayed = 0
+        self._random = random.Random(seed)
+        self._responses: Dict[Tuple[str, str], Deque[Interaction]] = defaultdict(deque)
+        for interaction in cassette.interactions:
+            self._responses[interaction.key].append(interaction)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> _ResponseContext:
+        return _ResponseContext(self._replay(method, url, kwargs.get('timeout')))
+
+    async def _replay(self, method: str, url: str, timeout: Optional[aiohttp.ClientTimeout]) -> _ReplayResponse:
+        key = (method, _normalize_url(url))
+        responses = self._responses.get(key)
+        if not responses:
+            raise CassetteMiss(f'{method} {key[1]} was not recorded')
+
+        interaction = responses.popleft() if len(responses) > 1 else responses[0]
+        delay = self.latency
+        if self.jitter:
+            delay = max(0.0, delay + self._random.uniform(-self.jitter, self.jitter))
+
+        total = timeout.total if timeout is not None else None
+        if total is not None and delay > total:
+            await asyncio.sleep(total)
+            raise asyncio.TimeoutError
+
+        if delay:
+            await asyncio.sleep(delay)
+
+        self.replayed += 1
+        return _ReplayResponse(interaction, self.chunk_size)
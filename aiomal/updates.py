@@ -0,0 +1,149 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from .objects.subtypes import MyListStatus
+
+
+__all__ = [
+    'UpdateQueue',
+]
+
+
+Send = Callable[[Dict[str, Any]], Awaitable[MyListStatus]]
+
+
+class _PendingUpdate:
+    __slots__ = ['send', 'fields', 'futures', 'deadline', 'handle']
+
+    def __init__(self, send: Send, deadline: float) -> None:
+        self.send = send
+        self.fields: Dict[str, Any] = {}
+        self.futures: List['asyncio.Future[MyListStatus]'] = []
+        self.deadline = deadline
+        self.handle: Optional[asyncio.TimerHandle] = None
+
+
+class UpdateQueue:
+    """Delays list status updates to merge the ones made to the same entry
+
+    An update waits ``delay`` seconds. Updates submitted for the same user and media in
+    that time are merged into it field by field, the last value of a field winning, and
+    restart the wait up to ``max_delay`` after the first one. The merged update is then
+    sent as a single request, at most ``concurrency`` at a time, and every caller's
+    future resolves with its result. Updates to the same entry are never sent
+    concurrently, so they land in order.
+
+    Pass it to :class:`Client` and use the ``queue_*_list_status`` methods of
+    :class:`ClientUser`.
+
+    Parameters
+    -----------
+    delay: :class:`float`
+        How long, in seconds, an update waits for more updates to the same entry. Defaults to 2.
+
+    max_delay: :class:`float`
+        The longest, in seconds, an update is held back by newer ones. Defaults to 10.
+
+    concurrency: :class:`int`
+        The max amount of updates sent at the same time. Defaults to 4.
+    """
+    def __init__(self, delay: float = 2.0, max_delay: float = 10.0, concurrency: int = 4) -> None:
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+
+        self.delay = delay
+        self.max_delay = max_delay
+        self.concurrency = concurrency
+        self.submitted = 0
+        self.sent = 0
+        self._pending: Dict[Hashable, _PendingUpdate] = {}
+        self._sending: Dict[Hashable, 'asyncio.Task[None]'] = {}
+        self._tasks: Set['asyncio.Task[None]'] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def __len__(self) -> int:
+        """The amount of entries with an update waiting to be sent"""
+        return len(self._pending)
+
+    def submit(self, key: Hashable, send: Send, fields: Dict[str, Any]) -> 'asyncio.Future[MyListStatus]':
+        """Queues an update, merging it with the pending one of the same key
+
+        Parameters
+        -----------
+        key: Hashable
+            Identifies the entry, e.g. the user, the media type and the media ID
+
+        send: Callable[[Dict[:class:`str`, Any]], Awaitable[:class:`MyListStatus`]]
+            Sends the merged fields
+
+        fields: Dict[:class:`str`, Any]
+            The fields to update
+
+        Returns
+        --------
+        :class:`asyncio.Future`[:class:`MyListStatus`]
+            Resolves with the status returned for the merged update
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingUpdate(send, now + self.max_delay)
+        else:
+            pending.handle.cancel()
+
+        pending.send = send
+        pending.fields.update(fields)
+        future = loop.create_future()
+        pending.futures.append(future)
+        pending.handle = loop.call_at(min(now + self.delay, pending.deadline), self._flush_key, key)
+        self.submitted += 1
+        return future
+
+    async def flush(self) -> None:
+        """Sends every pending update now and waits until all updates are sent"""
+        for key in list(self._pending):
+            self._pending[key].handle.cancel()
+            self._flush_key(key)
+
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush_key(self, key: Hashable) -> None:
+        pending = self._pending.pop(key)
+        previous = self._sending.get(key)
+        task = asyncio.ensure_future(self._send(key, pending, previous))
+        self._sending[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, key: Hashable, pending: _PendingUpdate, previous: Optional['asyncio.Task[None]']) -> None:
+        try:
+            if previous is not None:
+                # The earlier update of this entry must land first
+                await asyncio.wait([previous])
+
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.concurrency)
+
+            async with self._semaphore:
+                try:
+                    status = await pending.send(pending.fields)
+                except asyncio.CancelledError:
+                    for future in pending.futures:
+                        future.cancel()
+
+                    raise
+                except Exception as exc:
+                    for future in pending.futures:
+                        if not future.done():
+                            future.set_exception(exc)
+                else:
+                    for future in pending.futures:
+                        if not future.done():
+                            future.set_result(status)
+                finally:
+                    self.sent += 1
+        finally:
+            if self._sending.get(key) is asyncio.current_task():
+                del self._sending[key]
@@ -0,0 +1,60 @@
+"""Compares the JSON decoders HTTPClient can use on realistic MAL payloads
+
+    python benchmarks/bench_json.py [--repeat N] [--json]
+"""
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiomal import jsonlib
+from payloads import encode, list_page, load_fixture
+
+
+def decoders():
+    yield 'json', jsonlib.stdlib_loads
+    if jsonlib.orjson is not None:
+        yield 'orjson', jsonlib.orjson.loads
+
+
+def payloads():
+    details = load_fixture('anime_details')
+    yield 'anime_details', encode(details)
+    # A user list page of the largest size MAL serves, with every field requested
+    yield 'list_page_1000_full', encode(list_page(details, 1000))
+    yield 'ranking_page_500_full', encode(list_page(details, 500, ranking={'rank': 1}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='print machine readable results')
+    args = parser.parse_args()
+
+    results = []
+    for payload_name, body in payloads():
+        number = max(1, 2_000_000 // len(body))
+        for decoder_name, loads in decoders():
+            best = min(timeit.repeat(lambda: loads(body), number=number, repeat=args.repeat)) / number
+            results.append({
+                'payload': payload_name,
+                'bytes': len(body),
+                'decoder': decoder_name,
+                'seconds': best,
+                'mb_per_second': len(body) / best / 1e6,
+            })
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        return
+
+    print(f'{"payload":<24}{"bytes":>10}  {"decoder":<8}{"ms":>10}{"MB/s":>10}')
+    for r in results:
+        print(f'{r["payload"]:<24}{r["bytes"]:>10}  {r["decoder"]:<8}{r["seconds"] * 1e3:>10.3f}{r["mb_per_second"]:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Reports the memory used per instance of each model type
+
+    python benchmarks/bench_memory.py [--count N] [--json]
+
+``shallow`` is the size of the instance itself, ``deep`` everything it keeps alive,
+measured with tracemalloc over ``count`` instances. Every instance is built from its
+own freshly decoded payload, so the part of the payload a model holds on to, like the
+whole payload of a lazy model, is counted while the rest is freed.
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiomal import jsonlib
+from aiomal.objects.maintypes import *
+from aiomal.objects.subtypes import *
+from payloads import encode, load_fixture
+
+
+def models():
+    anime = encode(load_fixture('anime_details'))
+    manga = encode(load_fixture('manga_details'))
+    topic = encode(load_fixture('forum_topic_detail'))
+
+    yield 'AnimeForList', anime, lambda data: AnimeForList(data)
+    yield 'AnimeForList (lazy)', anime, lambda data: AnimeForList(data, lazy=True)
+    yield 'AnimeDetails', anime, lambda data: AnimeDetails(data)
+    yield 'AnimeDetails (lazy)', anime, lambda data: AnimeDetails(data, lazy=True)
+    yield 'MangaForList', manga, lambda data: MangaForList(data)
+    yield 'MangaDetails', manga, lambda data: MangaDetails(data)
+    yield 'MangaDetails (lazy)', manga, lambda data: MangaDetails(data, lazy=True)
+    yield 'User', encode(load_fixture('user')), lambda data: User(data)
+    yield 'ForumCategory', encode(load_fixture('forum_boards')), lambda data: ForumCategory(data['categories'][1])
+    yield 'ForumTopicData', topic, lambda data: ForumTopicData(data['data'])
+    yield 'ForumTopicsData', encode(load_fixture('forum_topics')), lambda data: ForumTopicsData(data['data'][0])
+    yield 'ForumTopicPost', topic, lambda data: ForumTopicPost(data['data']['posts'][0])
+    yield 'MyListStatus', anime, lambda data: MyListStatus(data['my_list_status'])
+    yield 'Genre', anime, lambda data: Genre(data['genres'][0])
+    yield 'Picture', anime, lambda data: Picture(data['main_picture'])
+
+
+def measure(body: bytes, build, count: int):
+    loads = jsonlib.loads
+    build(loads(body))  # warm up caches and lazily resolved model names
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # The payload of each instance is only referenced by the instance from here on
+    instances = [build(loads(body)) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    list_overhead = sys.getsizeof(instances)
+    return {
+        'shallow': sys.getsizeof(instances[0]),
+        'deep': (after - before - list_overhead) / count,
+        'has_dict': hasattr(instances[0], '__dict__'),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--json', action='store_true', help='print machine readable results')
+    args = parser.parse_args()
+
+    results = [{'model': name, **measure(body, build, args.count)} for name, body, build in models()]
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        return
+
+    print(f'{"model":<24}{"shallow":>10}{"deep":>12}  __dict__')
+    for r in results:
+        print(f'{r["model"]:<24}{r["shallow"]:>10}{r["deep"]:>12.0f}  {"yes" if r["has_dict"] else "no"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""Measures how fast each model type is decoded and built from recorded MAL payloads
+
+    python benchmarks/bench_models.py [--repeat N] [--json] [--compare RESULTS.json] [--threshold 0.1]
+
+Every case decodes a response body the way HTTPClient does and builds the objects
+the way ClientUser does. ``objects/s`` counts the objects made per second over decoding
+and building, ``allocs`` the memory blocks the built objects hold on to besides the
+decoded payload, and ``peak`` the highest traced memory while decoding and building.
+Runs offline.
+
+Save a run with ``--json > before.json`` and pass it to ``--compare`` on another
+version. Cases that got slower by more than ``--threshold`` are listed and the exit
+status is 1.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiomal import MediaColumns, jsonlib
+from aiomal.objects.maintypes import *
+from aiomal.objects.subtypes import *
+from payloads import encode, list_page, load_fixture
+
+
+def cases():
+    anime = load_fixture('anime_details')
+    manga = load_fixture('manga_details')
+    # A user list page of the largest size MAL serves, with every field requested
+    anime_page = encode(list_page(anime, 1000, list_status=anime['my_list_status']))
+    manga_page = encode(list_page(manga, 1000, list_status=manga['my_list_status']))
+    ranking_page = encode(list_page(anime, 500, ranking={'rank': 1}))
+
+    yield 'AnimeDetails', encode(anime), lambda data: AnimeDetails(data), 1
+    yield 'AnimeDetails (lazy)', encode(anime), lambda data: AnimeDetails(data, lazy=True), 1
+    yield 'MangaDetails', encode(manga), lambda data: MangaDetails(data), 1
+    yield 'MangaDetails (lazy)', encode(manga), lambda data: MangaDetails(data, lazy=True), 1
+    yield 'User', encode(load_fixture('user')), lambda data: User(data), 1
+    yield 'ForumTopicData', encode(load_fixture('forum_topic_detail')), lambda data: ForumTopicData(data['data']), 1
+    topics = load_fixture('forum_topics')
+    yield 'ForumTopicsData page', encode(topics), lambda data: [ForumTopicsData(topic) for topic in data['data']], len(topics['data'])
+    yield 'AnimeForList page 1000', anime_page, lambda data: [AnimeForList(a['node']) for a in data['data']], 1000
+    yield 'AnimeForList page 1000 (lazy)', anime_page, lambda data: [AnimeForList(a['node'], True) for a in data['data']], 1000
+    yield 'MangaForList page 1000', manga_page, lambda data: [MangaForList(m['node']) for m in data['data']], 1000
+    yield 'AnimeForList ranking 500', ranking_page, lambda data: [AnimeForList(a['node']) for a in data['data']], 500
+    yield 'MediaColumns page 1000', anime_page, lambda data: MediaColumns.from_items(data['data']), 1000
+
+
+def best_of(function, repeat: int) -> float:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(number=number, repeat=repeat)) / number
+
+
+def measure_speed(body: bytes, build, objects: int, repeat: int):
+    loads = jsonlib.loads
+    data = loads(body)
+    build(data)  # warm up caches and lazily resolved model names
+
+    decode = best_of(lambda: loads(body), repeat)
+    build_seconds = best_of(lambda: build(data), repeat)
+    return {
+        'decode_seconds': decode,
+        'build_seconds': build_seconds,
+        'objects_per_second': objects / (decode + build_seconds),
+    }
+
+
+def measure_memory(body: bytes, build):
+    loads = jsonlib.loads
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        data = loads(body)
+        before = tracemalloc.take_snapshot()
+        result = build(data)
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1] - start
+    finally:
+        tracemalloc.stop()
+
+    # The decoded payload is left out, only the blocks the models hold on to are counted
+    stats = after.compare_to(before, 'filename')
+    del result
+    return {
+        'allocations': sum(stat.count_diff for stat in stats),
+        'retained_bytes': sum(stat.size_diff for stat in stats),
+        'peak_bytes': peak,
+    }
+
+
+def compare(results, baseline, threshold: float):
+    previous = {r['case']: r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        before = previous.get(r['case'])
+        if before is None:
+            continue
+
+        change = r['objects_per_second'] / before['objects_per_second'] - 1
+        r['change'] = change
+        if change < -threshold:
+            regressions.append(r['case'])
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='print machine readable results')
+    parser.add_argument('--compare', type=Path, help='results of an earlier run, saved with --json')
+    parser.add_argument('--threshold', type=float, default=0.1, help='the slowdown reported as a regression')
+    args = parser.parse_args()
+
+    results = []
+    for name, body, build, objects in cases():
+        results.append({
+            'case': name,
+            'bytes': len(body),
+            'objects': objects,
+            **measure_speed(body, build, objects, args.repeat),
+            **measure_memory(body, build),
+        })
+
+    regressions = []
+    if args.compare is not None:
+        with open(args.compare, encoding='utf-8') as fp:
+            regressions = compare(results, json.load(fp), args.threshold)
+
+    if args.json:
+        output = {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'decoder': 'orjson' if jsonlib.orjson is not None else 'json',
+            'results': results,
+            'regressions': regressions,
+        }
+        json.dump(output, sys.stdout, indent=2)
+    else:
+        print(f'{"case":<32}{"objects/s":>12}{"decode ms":>11}{"build ms":>10}{"allocs":>9}{"peak KiB":>10}{"change":>9}')
+        for r in results:
+            change = f'{r["change"]:+.1%}' if 'change' in r else ''
+            print(
+                f'{r["case"]:<32}{r["objects_per_second"]:>12,.0f}{r["decode_seconds"] * 1e3:>11.3f}'
+                f'{r["build_seconds"] * 1e3:>10.3f}{r["allocations"]:>9}{r["peak_bytes"] / 1024:>10.0f}{change:>9}'
+            )
+
+        for case in regressions:
+            print(f'regression: {case} is more than {args.threshold:.0%} slower', file=sys.stderr)
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+"""Drives many concurrent users through the client against a local mock of the MAL API
+
+    python benchmarks/loadtest.py [--users 50] [--duration 30] [--mix details=40,search=15,...]
+                                  [--latency 0.05] [--jitter 0.02] [--error-rate 0.01] [--json]
+
+The mock server of ``mock_mal.py`` is started in its own process, with the latency,
+error and throttling knobs it accepts, so it doesn't compete with the client for the
+event loop. ``--in-process`` runs it on the same loop instead, which also reports the
+server's counters.
+
+Every user repeatedly makes a call picked from ``--mix`` by weight, waiting ``--think``
+seconds in between, for ``--duration`` seconds. The report has the throughput, the
+p50/p95/p99 latency of every call type, the errors, the retries, the event loop lag
+and the memory used. Use it to size worker counts: raise ``--users`` until the loop
+lag or the p99 grows.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aiohttp import web
+
+from aiomal import HistogramCollector, RetryPolicy
+from aiomal.client import Client, ClientUser
+from aiomal.http import Route
+import mock_mal
+
+
+Call = Callable[[ClientUser, random.Random], Awaitable[Any]]
+
+SEARCHES = ('naruto', 'one piece', 'bleach', 'monogatari', 'gintama', 'steins gate')
+
+
+async def _list(user: ClientUser, rng: random.Random) -> Any:
+    return await user.get_user_anime_list(f'user{rng.randrange(1000)}', limit=100, offset=rng.randrange(0, 3000, 100))
+
+
+async def _full_list(user: ClientUser, rng: random.Random) -> Any:
+    return await user.iter_user_anime_list(f'user{rng.randrange(1000)}', limit=1000).flatten()
+
+
+#: The calls a mix can be made of
+CALLS: Dict[str, Call] = {
+    'details': lambda user, rng: user.get_anime_details(rng.randrange(1, 20000)),
+    'manga_details': lambda user, rng: user.get_manga_details(rng.randrange(1, 20000)),
+    'search': lambda user, rng: user.get_anime(rng.choice(SEARCHES), limit=100),
+    'ranking': lambda user, rng: user.get_anime_ranking(limit=500, offset=rng.randrange(0, 5000, 500)),
+    'season': lambda user, rng: user.get_seasonal_anime(2024, rng.choice(('winter', 'spring', 'summer', 'fall')), limit=500),
+    'list': _list,
+    'full_list': _full_list,
+    'forum': lambda user, rng: user.get_forum_topics(board_id=1, limit=25),
+    'topic': lambda user, rng: user.get_forum_topic_detail(rng.randrange(1, 20000)),
+    'update': lambda user, rng: user.update_anime_list_status(rng.randrange(1, 20000), score=rng.randint(1, 10)),
+    'user': lambda user, rng: user.get_user_information(),
+}
+
+DEFAULT_MIX = 'details=40,search=15,ranking=10,list=10,forum=5,topic=5,update=10,user=5'
+
+
+def parse_mix(mix: str) -> Tuple[List[str], List[float]]:
+    names, weights = [], []
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in CALLS:
+            raise SystemExit(f'unknown call {name!r}, pick from {", ".join(CALLS)}')
+
+        names.append(name)
+        weights.append(float(weight or 1))
+
+    return names, weights
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {'p50': float('nan'), 'p95': float('nan'), 'p99': float('nan'), 'max': float('nan')}
+
+    values = sorted(values)
+
+    def at(q: float) -> float:
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    return {'p50': at(0.5), 'p95': at(0.95), 'p99': at(0.99), 'max': values[-1]}
+
+
+def rss_bytes() -> Optional[int]:
+    # The current resident set size, only known on Linux
+    try:
+        with open('/proc/self/statm') as fp:
+            return int(fp.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+async def monitor_lag(interval: float, lags: List[float], stop: asyncio.Event) -> None:
+    # How late the loop wakes this task up is how long every other callback waited
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - start - interval))
+
+
+async def run_user(
+    user: ClientUser,
+    names: List[str],
+    weights: List[float],
+    rng: random.Random,
+    until: float,
+    think: float,
+    latencies: Dict[str, List[float]],
+    errors: Counter
+) -> None:
+    while time.perf_counter() < until:
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        try:
+            await CALLS[name](user, rng)
+        except Exception as e:
+            response = getattr(e, 'response', None)
+            errors[name, type(e).__name__ if response is None else f'{type(e).__name__} {response.status}'] += 1
+        else:
+            latencies[name].append(time.perf_counter() - start)
+
+        if think:
+            await asyncio.sleep(think)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError('the mock server did not start')
+
+            await asyncio.sleep(0.05)
+        else:
+            writer.close()
+            return
+
+
+def server_arguments(args: argparse.Namespace) -> List[str]:
+    argv = ['--latency', str(args.latency), '--jitter', str(args.jitter), '--error-rate', str(args.error_rate),
+            '--throttle-rate', str(args.throttle_rate), '--list-size', str(args.list_size)]
+    if args.rate_limit is not None:
+        argv += ['--rate-limit', str(args.rate_limit)]
+    if args.seed is not None:
+        argv += ['--seed', str(args.seed)]
+
+    return argv
+
+
+async def load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    names, weights = parse_mix(args.mix)
+    port = free_port()
+    server: Any = None
+    mock: Optional[mock_mal.MockMAL] = None
+    if args.in_process:
+        mock = mock_mal.from_arguments(args)
+        server = web.AppRunner(mock.make_app(), access_log=None)
+        await server.setup()
+        await web.TCPSite(server, '127.0.0.1', port).start()
+    else:
+        script = Path(__file__).resolve().parent / 'mock_mal.py'
+        server = subprocess.Popen([sys.executable, str(script), '--port', str(port), *server_arguments(args)], cwd=script.parent, stdout=subprocess.DEVNULL)
+        await wait_for_port(port)
+
+    Route.V1_BASE = f'http://127.0.0.1:{port}/v1'
+    Route.V2_BASE = f'http://127.0.0.1:{port}/v2'
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    metrics = HistogramCollector()
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Counter = Counter()
+    lags: List[float] = []
+    stop = asyncio.Event()
+    rss_before = rss_bytes()
+    try:
+        client = Client(
+            'load-test', 'secret',
+            instruments=[metrics],
+            retry_policy=RetryPolicy(backoff=args.backoff),
+            connection_limit=args.connections
+        )
+        async with client:
+            now = time.time()
+            users = []
+            for i in range(args.users):
+                # A short token lifetime makes the users refresh their tokens during the run
+                expires_at = now + args.token_lifetime * (i + 1) / args.users if args.token_lifetime else None
+                users.append(client.make_user(f'access-{i}', f'refresh-{i}', expires_at=expires_at))
+
+            monitor = asyncio.ensure_future(monitor_lag(args.lag_interval, lags, stop))
+            start = time.perf_counter()
+            until = start + args.duration
+            await asyncio.gather(*(
+                run_user(user, names, weights, random.Random(None if args.seed is None else args.seed + i), until, args.think, latencies, errors)
+                for i, user in enumerate(users)
+            ))
+            elapsed = time.perf_counter() - start
+            stop.set()
+            await monitor
+            rss_after = rss_bytes()
+            traced = tracemalloc.get_traced_memory() if args.tracemalloc else None
+    finally:
+        if args.tracemalloc:
+            tracemalloc.stop()
+
+        if args.in_process:
+            await server.cleanup()
+        else:
+            server.terminate()
+            server.wait()
+
+    completed = sum(len(values) for values in latencies.values())
+    failed = sum(errors.values())
+    report: Dict[str, Any] = {
+        'users': args.users,
+        'duration': elapsed,
+        'calls': completed + failed,
+        'failed': failed,
+        'throughput': (completed + failed) / elapsed,
+        'latency': percentiles([value for values in latencies.values() for value in values]),
+        'calls_by_type': {
+            name: {'calls': len(latencies[name]) + sum(count for (call, _), count in errors.items() if call == name), **percentiles(latencies[name])}
+            for name in names
+        },
+        'errors': {f'{call}: {error}': count for (call, error), count in errors.most_common()},
+        'requests': sum(metrics.requests.values()),
+        'retries': sum(metrics.retries.values()),
+        'loop_lag': percentiles(lags),
+        'memory': {
+            'rss_before': rss_before,
+            'rss_after': rss_after,
+            'peak_rss': peak_rss_bytes(),
+            'traced_current': traced[0] if traced else None,
+            'traced_peak': traced[1] if traced else None,
+        },
+    }
+
+    if mock is not None:
+        report['server'] = {'requests': mock.requests, 'errors': mock.errors, 'throttled': mock.throttled}
+
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    def ms(value: float) -> str:
+        return f'{value * 1e3:9.1f}'
+
+    print(f'{report["users"]} users for {report["duration"]:.1f}s: {report["calls"]} calls, {report["throughput"]:.1f} calls/s, '
+          f'{report["failed"]} failed, {report["requests"]} requests, {report["retries"]} retries')
+    print()
+    print(f'{"call":<16}{"calls":>8}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"max ms":>9}')
+    for name, stats in [*report['calls_by_type'].items(), ('all', {'calls': report['calls'], **report['latency']})]:
+        print(f'{name:<16}{stats["calls"]:>8}{ms(stats["p50"])}{ms(stats["p95"])}{ms(stats["p99"])}{ms(stats["max"])}')
+
+    lag = report['loop_lag']
+    print()
+    print(f'event loop lag: p50 {lag["p50"] * 1e3:.1f} ms, p99 {lag["p99"] * 1e3:.1f} ms, max {lag["max"] * 1e3:.1f} ms')
+
+    memory = report['memory']
+    mib = 1024 * 1024
+    if memory['rss_after'] is not None:
+        print(f'memory: rss {memory["rss_before"] / mib:.0f} -> {memory["rss_after"] / mib:.0f} MiB, peak {memory["peak_rss"] / mib:.0f} MiB')
+    else:
+        print(f'memory: peak rss {memory["peak_rss"] / mib:.0f} MiB')
+
+    if memory['traced_peak'] is not None:
+        print(f'python heap: {memory["traced_current"] / mib:.1f} MiB, peak {memory["traced_peak"] / mib:.1f} MiB')
+
+    for error, count in report['errors'].items():
+        print(f'error: {error} x{count}')
+
+    if 'server' in report:
+        server = report['server']
+        print(f'server: {server["requests"]} requests, {server["errors"]} errors injected, {server["throttled"]} throttled')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=50, help='concurrent users')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds to run for')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'weighted calls, from {", ".join(CALLS)}')
+    parser.add_argument('--think', type=float, default=0.0, help='seconds every user waits between calls')
+    parser.add_argument('--connections', type=int, default=100, help='the connection limit of the client')
+    parser.add_argument('--backoff', type=float, default=0.5, help='the first retry wait of the client')
+    parser.add_argument('--token-lifetime', type=float, default=0.0, help='seconds until the users refresh their tokens, 0 for never')
+    parser.add_argument('--lag-interval', type=float, default=0.01, help='how often the event loop lag is sampled')
+    parser.add_argument('--in-process', action='store_true', help='run the mock server on the same event loop')
+    parser.add_argument('--tracemalloc', action='store_true', help='also trace the Python heap, slows the client down')
+    parser.add_argument('--json', action='store_true', help='print machine readable results')
+    mock_mal.add_arguments(parser)
+    args = parser.parse_args()
+
+    report = asyncio.run(load_test(args))
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
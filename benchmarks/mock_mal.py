@@ -0,0 +1,241 @@
+"""A local stand-in for the MAL API, serving the recorded payloads in ``fixtures``
+
+    python benchmarks/mock_mal.py [--port 8642] [--latency 0.05] [--jitter 0.02]
+                                  [--error-rate 0.01] [--throttle-rate 0.01] [--rate-limit 500]
+
+Serves the shapes HTTPClient requests: anime and manga searches, details and rankings,
+seasons, suggestions, user lists with paging, list status updates, the forum, the
+user and the OAuth token endpoint. Point the client at it by setting
+``Route.V2_BASE`` to ``http://host:port/v2`` and ``Route.V1_BASE`` to ``http://host:port/v1``.
+
+Every response is delayed by ``latency`` plus or minus up to ``jitter`` seconds. A
+share of ``error-rate`` requests fail with a 500, 502 or 503, a share of
+``throttle-rate`` are throttled with a 429, and requests over ``rate-limit`` per second
+are throttled too, like MAL does.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+from payloads import load_fixture
+
+
+# The top level names of a fields parameter, e.g. my_list_status of my_list_status{score}
+_FIELD = re.compile(r'(\w+)(?:\{[^}]*\})?')
+
+class MockMAL:
+    """The mock API's knobs and counters, and its request handlers"""
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+        list_size: int = 3000,
+        seed: Optional[int] = None
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit
+        self.list_size = list_size
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self._tokens = rate_limit or 0.0
+        self._updated_at = time.monotonic()
+
+        self.anime = load_fixture('anime_details')
+        self.manga = load_fixture('manga_details')
+        self.user = load_fixture('user')
+        self.boards = load_fixture('forum_boards')
+        self.topic = load_fixture('forum_topic_detail')
+        self.topics = load_fixture('forum_topics')
+        self._details = {'anime': self.anime, 'manga': self.manga}
+        # Encoded once, the mock must not be the bottleneck of the load test
+        self._bodies: Dict[Any, bytes] = {}
+
+    def _throttle(self) -> bool:
+        if self.throttle_rate and self.random.random() < self.throttle_rate:
+            return True
+
+        if not self.rate_limit:
+            return False
+
+        now = time.monotonic()
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._updated_at) * self.rate_limit)
+        self._updated_at = now
+        if self._tokens < 1:
+            return True
+
+        self._tokens -= 1
+        return False
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        self.requests += 1
+        delay = self.latency
+        if self.jitter:
+            delay = max(0.0, delay + self.random.uniform(-self.jitter, self.jitter))
+
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._throttle():
+            self.throttled += 1
+            return web.json_response({'error': 'too_many_requests', 'message': ''}, status=429, headers={'Retry-After': '1'})
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response({'error': 'internal_error', 'message': ''}, status=self.random.choice((500, 502, 503)))
+
+        return await handler(request)
+
+    def _json(self, key: Any, make: Any) -> web.Response:
+        body = self._bodies.get(key)
+        if body is None:
+            body = self._bodies[key] = json.dumps(make(), ensure_ascii=False).encode('utf-8')
+
+        return web.Response(body=body, content_type='application/json')
+
+    def _page(self, request: web.Request, media: str, total: int, max_limit: int, **extra: Any) -> web.Response:
+        limit = min(int(request.query.get('limit', 100)), max_limit)
+        offset = int(request.query.get('offset', 0))
+
+        # Like MAL, list nodes only have the requested fields besides the id, title and picture
+        fields = request.query.get('fields')
+        if fields is not None:
+            fields = frozenset(_FIELD.findall(fields)) | {'id', 'title', 'main_picture'}
+
+        def make() -> Dict[str, Any]:
+            node = self._details[media]
+            if fields is not None:
+                node = {k: v for k, v in node.items() if k in fields}
+
+            data = []
+            for i in range(offset, min(offset + limit, total)):
+                # Shallow, the nested objects are only encoded
+                data.append({'node': dict(node, id=i + 1), **extra})
+
+            paging = {}
+            if offset + limit < total:
+                query = dict(request.query, offset=str(offset + limit), limit=str(limit))
+                paging['next'] = str(request.url.with_query(query))
+
+            return {'data': data, 'paging': paging}
+
+        # Every user's list is the same, the name is left out of the key
+        return self._json((media, total, offset, limit, tuple(extra), fields), make)
+
+    async def search(self, request: web.Request) -> web.Response:
+        return self._page(request, request.match_info['media'], 500, 100)
+
+    async def details(self, request: web.Request) -> web.Response:
+        media, media_id = request.match_info['media'], int(request.match_info['id'])
+        rest = self._bodies.get(media)
+        if rest is None:
+            # Everything but the id is the same for every media, it is encoded once
+            details = {k: v for k, v in self._details[media].items() if k != 'id'}
+            rest = self._bodies[media] = json.dumps(details, ensure_ascii=False).encode('utf-8')[1:]
+
+        return web.Response(body=b'{"id": %d, ' % media_id + rest, content_type='application/json')
+
+    async def ranking(self, request: web.Request) -> web.Response:
+        return self._page(request, request.path.split('/')[2], 5000, 500, ranking={'rank': 1})
+
+    async def season(self, request: web.Request) -> web.Response:
+        return self._page(request, 'anime', 300, 500)
+
+    async def suggestions(self, request: web.Request) -> web.Response:
+        return self._page(request, 'anime', 100, 100)
+
+    async def user_list(self, request: web.Request) -> web.Response:
+        media = request.match_info['media'][:-len('list')]
+        list_status = self._details[media]['my_list_status']
+        return self._page(request, media, self.list_size, 1000, list_status=list_status)
+
+    async def update_list_status(self, request: web.Request) -> web.Response:
+        status = dict(self._details[request.match_info['media']]['my_list_status'])
+        # The updated fields are sent in the query string
+        status.update(request.query)
+        return web.json_response(status)
+
+    async def delete_list_item(self, request: web.Request) -> web.Response:
+        return web.json_response([])
+
+    async def forum_boards(self, request: web.Request) -> web.Response:
+        return self._json('boards', lambda: self.boards)
+
+    async def forum_topic(self, request: web.Request) -> web.Response:
+        return self._json('topic', lambda: self.topic)
+
+    async def forum_topics(self, request: web.Request) -> web.Response:
+        return self._json('topics', lambda: {'data': self.topics['data'], 'paging': {}})
+
+    async def me(self, request: web.Request) -> web.Response:
+        return self._json('user', lambda: self.user)
+
+    async def token(self, request: web.Request) -> web.Response:
+        number = self.random.getrandbits(64)
+        return web.json_response({
+            'token_type': 'Bearer',
+            'expires_in': 3600,
+            'access_token': f'access-{number:x}',
+            'refresh_token': f'refresh-{number:x}',
+        })
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self.middleware])
+        media = '{media:anime|manga}'
+        app.router.add_post('/v1/oauth2/token', self.token)
+        app.router.add_get('/v2/anime/ranking', self.ranking)
+        app.router.add_get('/v2/manga/ranking', self.ranking)
+        app.router.add_get('/v2/anime/suggestions', self.suggestions)
+        app.router.add_get('/v2/anime/season/{year}/{season}', self.season)
+        app.router.add_get(f'/v2/{media}', self.search)
+        app.router.add_get(f'/v2/{media}/{{id:\\d+}}', self.details)
+        app.router.add_patch(f'/v2/{media}/{{id:\\d+}}/my_list_status', self.update_list_status)
+        app.router.add_delete(f'/v2/{media}/{{id:\\d+}}/my_list_status', self.delete_list_item)
+        app.router.add_get('/v2/users/@me', self.me)
+        app.router.add_get(f'/v2/users/{{user_name}}/{{media:animelist|mangalist}}', self.user_list)
+        app.router.add_get('/v2/forum/boards', self.forum_boards)
+        app.router.add_get('/v2/forum/topic/{topic_id}', self.forum_topic)
+        app.router.add_get('/v2/forum/topics', self.forum_topics)
+        return app
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds every response is delayed by')
+    parser.add_argument('--jitter', type=float, default=0.0, help='the most the latency randomly varies by')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests failing with a 5xx')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='share of requests throttled with a 429')
+    parser.add_argument('--rate-limit', type=float, default=None, help='requests per second served before throttling')
+    parser.add_argument('--list-size', type=int, default=3000, help='entries in every user list')
+    parser.add_argument('--seed', type=int, default=None)
+
+
+def from_arguments(args: argparse.Namespace) -> MockMAL:
+    return MockMAL(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.rate_limit, args.list_size, args.seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8642)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    web.run_app(from_arguments(args).make_app(), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Loads the recorded MAL payloads in ``fixtures`` and builds larger pages out of them"""
+import copy
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def load_fixture(name: str) -> Dict[str, Any]:
+    with open(FIXTURES / f'{name}.json', encoding='utf-8') as fp:
+        return json.load(fp)
+
+
+def list_page(node: Dict[str, Any], count: int, **extra: Any) -> Dict[str, Any]:
+    """Repeats ``node`` into a list page of ``count`` entries with distinct ids and ranks"""
+    data = []
+    for i in range(count):
+        entry = copy.deepcopy(node)
+        entry['id'] = node['id'] + i
+        if 'rank' in entry:
+            entry['rank'] = i + 1
+
+        data.append({'node': entry, **extra})
+
+    return {
+        'data': data,
+        'paging': {'next': f'https://api.myanimelist.net/v2/anime/ranking?offset={count}&limit={count}'}
+    }
+
+
+def encode(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
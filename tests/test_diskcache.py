@@ -0,0 +1,197 @@
+import asyncio
+import json
+
+import pytest
+
+from aiomal import Cassette, DiskCache, Interaction, ReplayTransport
+from aiomal.http import HTTPClient, Route
+
+
+def anime(anime_id: int, token: str = 'token') -> Route:
+    return Route('GET', '/anime/{anime_id}', anime_id=anime_id, access_token=token, fields='id,title')
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'cache.sqlite')
+
+
+def test_set_and_get(path):
+    async def main():
+        cache = DiskCache(path, eviction_interval=None)
+        try:
+            await cache.set(anime(1), b'{"id": 1}', {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+            entry = await cache.get(anime(1))
+            assert entry.body == b'{"id": 1}'
+            assert entry.fresh
+            assert entry.validators == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+            assert await cache.get(anime(2)) is None
+            # Scoped to the token
+            assert await cache.get(anime(1, 'other')) is None
+            assert cache.stats.hits == 1 and cache.stats.misses == 2 and cache.stats.entries == 1
+        finally:
+            await cache.close()
+
+    run(main())
+
+
+def test_entries_survive_a_restart(path):
+    async def main():
+        cache = DiskCache(path, eviction_interval=None)
+        await cache.set(anime(1), b'{"id": 1}', {})
+        await cache.close()
+
+        cache = DiskCache(path, eviction_interval=None)
+        try:
+            assert (await cache.get(anime(1))).body == b'{"id": 1}'
+            assert cache.stats.entries == 1
+        finally:
+            await cache.close()
+
+    run(main())
+
+
+def test_route_ttl_of_zero_disables_caching(path):
+    async def main():
+        cache = DiskCache(path, route_ttls={'/anime/{anime_id}': 0}, eviction_interval=None)
+        try:
+            await cache.set(anime(1), b'{}', {})
+            assert await cache.get(anime(1)) is None
+        finally:
+            await cache.close()
+
+    run(main())
+
+
+def test_refresh_makes_an_expired_entry_fresh(path):
+    async def main():
+        cache = DiskCache(path, ttl=0.05, eviction_interval=None)
+        try:
+            await cache.set(anime(1), b'{"id": 1}', {'ETag': '"v1"'})
+            await asyncio.sleep(0.1)
+            entry = await cache.get(anime(1))
+            assert entry is not None and not entry.fresh
+
+            await cache.refresh(anime(1), {'ETag': '"v2"'})
+            entry = await cache.get(anime(1))
+            assert entry.fresh
+            assert entry.etag == '"v2"'
+            assert cache.stats.revalidations == 1
+        finally:
+            await cache.close()
+
+    run(main())
+
+
+def test_revalidation_with_a_304(path):
+    url = 'https://api.myanimelist.net/v2/anime/1?fields=id%2Ctitle'
+    cassette = Cassette(interactions=[
+        Interaction('GET', url, 200, 'OK', [('ETag', '"v1"')], b'{"id": 1, "title": "Steins;Gate"}'),
+        Interaction('GET', url, 304, 'Not Modified', [('ETag', '"v1"')], b''),
+    ])
+
+    async def main():
+        cache = DiskCache(path, ttl=0.05, eviction_interval=None)
+        transport = ReplayTransport(cassette)
+        http = HTTPClient('client', 'secret', disk_cache=cache, transport=transport)
+        try:
+            assert await http.request(anime(1)) == {'id': 1, 'title': 'Steins;Gate'}
+            await asyncio.sleep(0.1)
+            # Answered 304, the stored body is served and fresh again
+            assert await http.request(anime(1)) == {'id': 1, 'title': 'Steins;Gate'}
+            assert transport.replayed == 2
+            assert cache.stats.revalidations == 1
+            assert (await cache.get(anime(1))).fresh
+        finally:
+            await http.close()
+
+    run(main())
+
+
+def test_evict_drops_entries_stale_for_too_long(path):
+    async def main():
+        cache = DiskCache(path, ttl=0.05, stale_ttl=0.0, eviction_interval=None)
+        try:
+            await cache.set(anime(1), b'{}', {})
+            assert await cache.evict() == 0
+            await asyncio.sleep(0.1)
+            assert await cache.evict() == 1
+            assert await cache.get(anime(1)) is None
+            assert cache.stats.entries == 0 and cache.stats.bytes == 0
+        finally:
+            await cache.close()
+
+    run(main())
+
+
+def test_least_recently_used_entries_are_evicted_first(path):
+    async def main():
+        body = json.dumps({'synopsis': ''.join(chr(33 + (i * 7919) % 90) for i in range(400))}).encode()
+        cache = DiskCache(path, eviction_interval=None, compression_level=0)
+        try:
+            for anime_id in (1, 2, 3):
+                await cache.set(anime(anime_id), body, {})
+                # Distinct access times even on coarse clocks
+                await asyncio.sleep(0.01)
+
+            cache.max_bytes = cache.stats.bytes
+            # Only buffered, the eviction must still see this access
+            await cache.get(anime(1))
+            await cache.set(anime(4), body, {})
+
+            assert await cache.get(anime(2)) is None
+            for anime_id in (1, 3, 4):
+                assert await cache.get(anime(anime_id)) is not None
+
+            assert cache.stats.evictions == 1
+        finally:
+            await cache.close()
+
+    run(main())
+
+
+def test_invalidate_drops_the_scope_of_the_write(path):
+    async def main():
+        cache = DiskCache(path, eviction_interval=None)
+        try:
+            user_list = Route('GET', '/users/{user_name}/animelist', user_name='@me', access_token='token')
+            manga = Route('GET', '/manga/{manga_id}', manga_id=1, access_token='token')
+            for route in (anime(1), anime(2), anime(1, 'other'), user_list, manga):
+                await cache.set(route, b'{}', {})
+
+            write = Route('PATCH', '/anime/{anime_id}/my_list_status', anime_id=1, access_token='token')
+            assert await cache.invalidate(write) == 3
+            assert await cache.get(anime(1, 'other')) is not None
+            assert await cache.get(manga) is not None
+            assert cache.stats.entries == 2
+        finally:
+            await cache.close()
+
+    run(main())
+
+
+def test_rescope_moves_entries_to_the_new_token(path):
+    async def main():
+        cache = DiskCache(path, eviction_interval=None)
+        try:
+            await cache.set(anime(1, 'old'), b'{"id": 1}', {})
+            await cache.set(anime(2, 'old'), b'{"id": 2, "old": true}', {})
+            await cache.set(anime(2, 'new'), b'{"id": 2}', {})
+            await cache.get(anime(1, 'old'))
+            before = cache.stats.bytes
+
+            assert await cache.rescope(Route.scope_of('old'), Route.scope_of('new')) == 1
+            assert await cache.get(anime(1, 'old')) is None
+            assert (await cache.get(anime(1, 'new'))).body == b'{"id": 1}'
+            # The new token's own entry wins over the moved one
+            assert (await cache.get(anime(2, 'new'))).body == b'{"id": 2}'
+            assert cache.stats.entries == 2
+            assert cache.stats.bytes < before
+        finally:
+            await cache.close()
+
+    run(main())
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from aiomal.streaming import ItemSplitter
+
+
+ITEMS = [
+    {'node': {'id': 1, 'title': 'Quotes "inside" and a \\ backslash'}},
+    {'node': {'id': 2, 'title': 'Brackets ] } [ { and a comma, in a string'}},
+    {'node': {'id': 3, 'title': 'Escaped \\"quote\\" then \\\\'}, 'list_status': {'tags': ['a', '"b"']}},
+    {'node': {'id': 4, 'title': 'Unicode ソードアート・オンライン ☃'}},
+    {'node': {'id': 5, 'data': [{'id': 6}, {'id': 7}], 'related': {'data': []}}},
+]
+
+
+def split(document: bytes, sizes):
+    splitter = ItemSplitter()
+    items = []
+    pos = 0
+    for size in sizes:
+        items += splitter.feed(document[pos:pos + size])
+        pos += size
+
+    items += splitter.feed(document[pos:])
+    return [json.loads(item) for item in items], splitter.rest(json.loads)
+
+
+def every_split(document: bytes):
+    # One chunk, single bytes, and every way of cutting the document in two
+    yield []
+    yield [1] * len(document)
+    for cut in range(1, len(document)):
+        yield [cut]
+
+
+def encode(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode('utf-8')
+
+
+@pytest.mark.parametrize('payload', [
+    {'data': ITEMS, 'paging': {'next': 'https://api.myanimelist.net/v2/users/@me/animelist?offset=5'}},
+    {'paging': {'previous': 'https://api.myanimelist.net/v2/users/@me/animelist?offset=0'}, 'data': ITEMS},
+    {'paging': {}, 'data': ITEMS, 'season': {'year': 2024, 'season': 'winter'}},
+])
+def test_items_and_rest_for_every_chunking(payload):
+    document = encode(payload)
+    expected_rest = {**payload, 'data': []}
+    for sizes in every_split(document):
+        items, rest = split(document, sizes)
+        assert items == ITEMS, sizes
+        assert rest == expected_rest, sizes
+
+
+def test_chunk_boundary_inside_escapes():
+    document = encode({'data': [{'node': {'title': 'a\\"b\\\\"'}}]})
+    escape = document.index(b'\\')
+    for cut in range(escape - 1, escape + 6):
+        items, _ = split(document, [cut])
+        assert items == [{'node': {'title': 'a\\"b\\\\"'}}]
+
+
+def test_whitespace_between_tokens():
+    document = b'{ "paging" : { } ,\n "data" :\n [ { "id" : 1 } ,\n { "id" : "2" } ] }'
+    items, rest = split(document, [1] * len(document))
+    assert items == [{'id': 1}, {'id': '2'}]
+    assert rest == {'paging': {}, 'data': []}
+
+
+def test_only_the_top_level_key_is_split():
+    payload = {'paging': {'data': [{'id': 0}]}, 'data': [{'data': [{'id': 1}]}]}
+    items, rest = split(encode(payload), [])
+    assert items == [{'data': [{'id': 1}]}]
+    assert rest == {'paging': {'data': [{'id': 0}]}, 'data': []}
+
+
+def test_a_value_equal_to_the_key_is_not_a_key():
+    payload = {'kind': 'data', 'other': [{'id': 0}], 'data': [{'id': 1}]}
+    items, rest = split(encode(payload), [])
+    assert items == [{'id': 1}]
+    assert rest == {'kind': 'data', 'other': [{'id': 0}], 'data': []}
+
+
+def test_empty_array():
+    items, rest = split(b'{"data": [], "paging": {}}', [])
+    assert items == []
+    assert rest == {'data': [], 'paging': {}}
+
+
+def test_items_are_returned_as_soon_as_complete():
+    splitter = ItemSplitter()
+    assert splitter.feed(b'{"data": [{"id": 1}, {"id"') == [b'{"id": 1}']
+    assert splitter.feed(b': 2}') == [b'{"id": 2}']
+    assert splitter.feed(b']}') == []